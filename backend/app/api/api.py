@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import login, users, events, spaces, sessions
+from app.api.v1.endpoints import login, users, events, spaces, sessions, schedule, calendar
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
@@ -7,3 +7,5 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(events.router, prefix="/events", tags=["events"])
 api_router.include_router(spaces.router, prefix="/spaces", tags=["spaces"])
 api_router.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
+api_router.include_router(schedule.router, prefix="/schedule", tags=["schedule"])
+api_router.include_router(calendar.router, prefix="/calendar", tags=["calendar"])
@@ -1,11 +1,14 @@
-from typing import Generator, Optional
+from typing import Callable, Generator, Optional, Tuple
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.models.users import User
 from app.core import security
+from app.core.permissions import Permission
+from app.core.principal import Principal, resolve_principal
 from app.core.config import settings
 from app.core.database import get_db
 
@@ -13,39 +16,69 @@ reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
 )
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> User:
+def _decode_token(token: str) -> Tuple[str, str, float, int]:
+    """
+    Returns the subject, jti, expiry (unix time) and session generation of a valid access token.
+    """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        token_data = payload.get("sub")
-        jti = payload.get("jti")
-        if token_data is None or jti is None:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Could not validate credentials",
-            )
-        
-        # Validate session in Redis
-        from app.core.redis import is_token_valid
-        if not is_token_valid(jti):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Session expired or logged out",
-            )
-            
     except (JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
+    token_data = payload.get("sub")
+    jti = payload.get("jti")
+    if token_data is None or jti is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+    return token_data, jti, payload.get("exp", 0), payload.get("gen", 0)
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> User:
+    token_data, jti, _, generation = _decode_token(token)
+
+    # Validate session in Redis
+    from app.core.redis import is_token_valid
+    if not is_token_valid(jti, token_data, generation):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session expired or logged out",
+        )
     user = db.query(User).filter(User.id == token_data).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
+def get_current_principal(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> Principal:
+    """
+    Like get_current_user, but returns a cached Principal snapshot. The session is
+    checked against the local token mirror when it is trusted (no Redis call), and
+    the users/roles tables are only queried on a cache miss.
+    """
+    token_data, jti, expires_at, generation = _decode_token(token)
+
+    def load() -> Principal:
+        user = db.query(User).options(selectinload(User.roles)).filter(User.id == token_data).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return Principal.from_user(user)
+
+    principal = resolve_principal(jti, token_data, generation, expires_at, load)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session expired or logged out",
+        )
+    return principal
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -54,16 +87,31 @@ def get_current_active_user(
     return current_user
 
 def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    is_admin = False
-    for role in current_user.roles:
-        if role.name == 'admin':
-            is_admin = True
-            break
-            
-    if not is_admin:
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
+    if not current_user.can(Permission.MANAGE_USERS):
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+def require(permission: Permission) -> Callable[..., Principal]:
+    """
+    Dependency factory: the current principal, if it holds `permission`.
+    Usage: `current_user: Principal = Depends(deps.require(Permission.MANAGE_EVENTS))`
+    """
+    def dependency(current_user: Principal = Depends(get_current_principal)) -> Principal:
+        if not current_user.can(permission):
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        return current_user
+    return dependency
+
+def owner_or_admin(
+    current_user: Principal, owner_id: Optional[UUID], detail: str = "Not enough permissions"
+) -> None:
+    """
+    Raises 403 unless the principal owns the resource or may manage any event.
+    Called from handlers once the resource is loaded.
+    """
+    if owner_id != current_user.id and not current_user.can(Permission.MANAGE_ANY_EVENT):
+        raise HTTPException(status_code=403, detail=detail)
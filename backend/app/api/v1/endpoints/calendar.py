@@ -0,0 +1,108 @@
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.core.cache import (
+    CALENDAR_KEY, CALENDAR_VERSION_KEY, acquire_refresh_lock, read_response, read_version, store_response,
+)
+from app.core.database import SessionLocal
+from app.core.permissions import Permission
+from app.core.principal import Principal
+from app.models.events import EventStatus
+from app.schemas.calendar import CalendarFeed
+from app.services.calendar import MAX_WINDOW, as_utc, find_calendar_items, month_window
+
+router = APIRouter()
+
+def _audience(current_user: Principal) -> Tuple[str, str]:
+    """
+    Visibility audience of the caller and the cache key of what it sees: admins and
+    customers share one view each, an organizer only sees their own events.
+    """
+    if current_user.can(Permission.MANAGE_ANY_EVENT):
+        return "admin", "admin"
+    if current_user.can(Permission.MANAGE_EVENTS):
+        return "organizer", f"organizer:{current_user.id}"
+    return "customer", "customer"
+
+def _render_calendar(
+    db: Session, window_start: datetime, window_end: datetime, audience: str,
+    user_id: UUID, space_id: Optional[UUID], mine: bool, status: Optional[str], q: Optional[str]
+) -> str:
+    items = find_calendar_items(db, window_start, window_end, audience, user_id, space_id, mine, status, q)
+    # Compact items: sessions carry their parent event, events leave it out
+    feed = {
+        "start": window_start,
+        "end": window_end,
+        "items": [
+            {name: value for name, value in item._asdict().items() if value is not None}
+            for item in items
+        ],
+    }
+    return json.dumps(jsonable_encoder(feed))
+
+@router.get("/", response_model=CalendarFeed, response_model_exclude_none=True)
+def read_calendar(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(deps.get_db),
+    window_start: datetime = Query(..., alias="from"),
+    window_end: datetime = Query(..., alias="to"),
+    space_id: Optional[UUID] = None,
+    mine: bool = False,
+    status: Optional[EventStatus] = None,
+    q: Optional[str] = None,
+    current_user: Principal = Depends(deps.get_current_principal),
+) -> Any:
+    """
+    Events and sessions overlapping `from`-`to` that the caller may see, as one flat
+    list ordered by start: what a calendar view needs, in one query. `space_id` keeps
+    one space; `mine=true` keeps what the caller organizes or is registered for;
+    `status` and `q` filter like GET /events/ does.
+    The window is widened to whole months (`start`/`end` of the reply) so that every
+    view of a month shares one cached reply per audience; `mine` and `q` replies are
+    not cached.
+    """
+    # A naive bound is UTC, as in month_window; mixing it with an aware one cannot be compared
+    window_start, window_end = as_utc(window_start), as_utc(window_end)
+    if window_end <= window_start:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if window_end - window_start > MAX_WINDOW:
+        raise HTTPException(status_code=400, detail=f"The window cannot exceed {MAX_WINDOW.days} days")
+    window_start, window_end = month_window(window_start, window_end)
+    audience, role_key = _audience(current_user)
+    status_value = status.value if status else None
+    args = (window_start, window_end, audience, current_user.id, space_id, mine, status_value, q)
+
+    if mine or q:
+        return Response(_render_calendar(db, *args), media_type="application/json")
+
+    field = (
+        f"{role_key}|{window_start.isoformat()}|{window_end.isoformat()}|{space_id or '*'}|{status_value or '*'}"
+    )
+    cached = read_response(CALENDAR_VERSION_KEY, CALENDAR_KEY, field)
+    if cached.body is not None:
+        if not cached.fresh and acquire_refresh_lock(CALENDAR_KEY, field):
+            background_tasks.add_task(_refresh_calendar, field, args)
+        body = cached.body
+    else:
+        body = _render_calendar(db, *args)
+        store_response(CALENDAR_KEY, cached.version, body, field)
+    return Response(body, media_type="application/json")
+
+def _refresh_calendar(field: str, args: tuple) -> None:
+    """
+    Re-render a stale calendar window after the response was sent.
+    """
+    version = read_version(CALENDAR_VERSION_KEY)
+    db = SessionLocal()
+    try:
+        body = _render_calendar(db, *args)
+    finally:
+        db.close()
+    store_response(CALENDAR_KEY, version, body, field)
@@ -1,83 +1,412 @@
-from typing import Any, List, Optional
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from uuid import UUID
+import hashlib
+import json
+from typing import Any, List, Optional, Tuple
+from datetime import datetime, timezone
+import anyio
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Float, cast, func, tuple_, literal_column
+from sqlalchemy.orm import Query, Session, selectinload
+from uuid import UUID, uuid4
 
 from app.api import deps
-from app.models.users import User
-from app.models.events import Event as EventModel
-from app.models.events import EventStatus, Registration as RegistrationModel, RegistrationStatus
-from app.schemas.event import Event, EventCreate, EventUpdate, EventPagination, Registration, RegistrationCreate
+from app.core.cache import get_cached_count, set_cached_count, invalidate_event_counts
+from app.core.cache import (
+    EVENT_PAGES_KEY, EVENT_PAGES_VERSION_KEY, acquire_refresh_lock, event_detail_keys,
+    invalidate_calendar, invalidate_event_responses, read_response, read_version,
+    store_response,
+)
+from app.core.conditional import (
+    Validators, collection_validators, resource_validators, is_not_modified, not_modified_response,
+    set_validators,
+)
+from app.core.database import SessionLocal
+from app.core.pagination import encode_cursor, decode_cursor, TotalMode
+from app.core.permissions import Permission
+from app.core.principal import Principal
+from app.models.events import Event as EventModel, Session as SessionModel, event_start_key, SEARCH_CONFIG
+from app.models.events import EventStatus, Registration as RegistrationModel, RegistrationStatus, SEAT_HOLDING_STATUSES
+from app.services.calendar import as_utc
+from app.services.registration_worker import get_claim_queue
+from app.services.registrations import reserve_event_seat, release_event_seat
+from app.services.seats import ClaimResult, get_seat_store
+from app.services.waitlist import request_promotion
+from app.schemas.event import PYDANTIC_V2, Event, EventCreate, EventUpdate, EventPagination, Registration, RegistrationCreate
 
 router = APIRouter()
 
-@router.get("/", response_model=EventPagination)
+# The Event schema embeds sessions and registrations: load both collections with one
+# extra SELECT each (WHERE event_id IN ...) instead of two lazy loads per event.
+EVENT_LOAD_OPTIONS = (
+    selectinload(EventModel.sessions),
+    selectinload(EventModel.registrations),
+)
+
+def _get_event(db: Session, id: UUID) -> Optional[EventModel]:
+    """
+    Fetch an event with its serialized collections eagerly loaded.
+    """
+    return db.query(EventModel).options(*EVENT_LOAD_OPTIONS).filter(EventModel.id == id).first()
+
+# Fields selectable with ?fields= on the listing; `id` is always returned
+SUMMARY_FIELDS = (
+    "id", "title", "description", "status", "space_id", "time_range", "capacity",
+    "high_demand", "organizer_id", "created_at", "updated_at", "registration_count",
+)
+# Heavy collections returned only when requested with ?include=
+INCLUDABLE_RELATIONS = {
+    "sessions": EventModel.sessions,
+    "registrations": EventModel.registrations,
+}
+
+# Embedded collections folded into conditional GET validators: (updated_at, foreign key)
+RELATION_VALIDATORS = {
+    "sessions": (SessionModel.updated_at, SessionModel.event_id),
+    "registrations": (RegistrationModel.updated_at, RegistrationModel.event_id),
+}
+
+def _parse_list_param(value: Optional[str], allowed, name: str) -> Optional[List[str]]:
+    """
+    Split a comma-separated query parameter and validate its items.
+    """
+    if value is None:
+        return None
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in items if item not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {name}: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return items
+
+def _event_cursor(event: EventModel, rank: Optional[float] = None) -> str:
+    """
+    Build the cursor pointing right after the given event in listing order.
+    """
+    start = event.time_range.lower if event.time_range else None
+    values = {
+        "start": start.isoformat() if start else None,
+        "id": str(event.id)
+    }
+    if rank is not None:
+        values["rank"] = rank
+    return encode_cursor(values)
+
+def _cursor_key(cursor: str, ranked: bool = False) -> tuple:
+    """
+    Decode a listing cursor into values comparable with the listing sort keys:
+    (event_start_key(), Event.id), prefixed with the negated rank when searching.
+    """
+    values = decode_cursor(cursor)
+    try:
+        start = values.get("start")
+        start = datetime.fromisoformat(start) if start else literal_column("'infinity'::timestamptz")
+        key = (start, UUID(values["id"]))
+        if ranked:
+            key = (-float(values["rank"]),) + key
+        return key
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+@router.get("/", response_model=EventPagination, response_model_exclude_unset=True)
 def read_events(
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
     page: int = 1,
     size: int = 10,
+    cursor: Optional[str] = None,
     q: Optional[str] = None,
+    fuzzy: bool = False,
     status: Optional[EventStatus] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    current_user: User = Depends(deps.get_current_user),
+    total_mode: TotalMode = TotalMode.EXACT,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Retrieve events with filters, search and pagination.
+    Events are ordered by start time then id. Pass the returned `next_cursor`
+    as `cursor` to fetch the following page with a keyset seek instead of an offset.
+    `total_mode` selects how `total` is computed: `exact` (cached COUNT),
+    `estimated` (planner row estimate) or `none` (only `has_more`).
+    `q` is a web-search style full-text query; results are ranked by relevance.
+    With `fuzzy=true`, titles similar to `q` (trigram match) are included to tolerate typos.
+    Items are slim summaries with a `registration_count`; `fields=title,time_range,...`
+    restricts the returned fields and `include=sessions,registrations` embeds those collections.
+    Customer pages are served from the response cache.
     """
-    query = db.query(EventModel)
-    
+    params = {
+        "page": page,
+        "size": size,
+        "cursor": cursor,
+        "q": q,
+        "fuzzy": fuzzy,
+        "status": status,
+        "start_date": start_date,
+        "end_date": end_date,
+        "total_mode": total_mode,
+        "fields": _parse_list_param(fields, SUMMARY_FIELDS, "fields") or list(SUMMARY_FIELDS),
+        "include": _parse_list_param(include, list(INCLUDABLE_RELATIONS), "include") or [],
+    }
+
     # Role-based access control
-    is_admin = any(role.name == "admin" for role in current_user.roles)
-    is_organizer = any(role.name == "organizer" for role in current_user.roles)
-    
-    if is_admin:
-        pass # Can see all
-    elif is_organizer:
-        query = query.filter(EventModel.organizer_id == current_user.id)
+    if current_user.can(Permission.MANAGE_ANY_EVENT):
+        role_key, organizer_id = "admin", None
+    elif current_user.can(Permission.MANAGE_EVENTS):
+        role_key, organizer_id = f"organizer:{current_user.id}", current_user.id
+    else:
+        role_key, organizer_id = "customer", None
+
+    if role_key != "customer":
+        validators = _listing_validators(db, role_key, organizer_id, params)
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+        set_validators(response, validators)
+        return _list_events(db, role_key, organizer_id, **params)
+
+    # Every customer sees the same published events: share one cached page per query.
+    # Its validators are cached with it, so a hit (or a 304) makes no database query.
+    field = _page_cache_field(params)
+    cached = read_response(EVENT_PAGES_VERSION_KEY, EVENT_PAGES_KEY, field)
+    if cached.body is not None and cached.validators is not None:
+        validators = cached.validators
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+        if not cached.fresh and acquire_refresh_lock(EVENT_PAGES_KEY, field):
+            background_tasks.add_task(_refresh_events_page, field, params)
+        body = cached.body
     else:
+        validators = _listing_validators(db, role_key, None, params)
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+        body = _render(EventPagination, _list_events(db, role_key, **params), exclude_unset=True)
+        store_response(EVENT_PAGES_KEY, cached.version, body, field, validators)
+    page_response = Response(body, media_type="application/json")
+    set_validators(page_response, validators)
+    return page_response
+
+def _listing_validators(db: Session, role_key: str, organizer_id: Optional[UUID], params: dict) -> Validators:
+    """
+    Conditional GET validators of the whole filtered listing, from one aggregate.
+    """
+    query, _ = _filter_events(
+        db, role_key, organizer_id,
+        q=params["q"], fuzzy=params["fuzzy"], status=params["status"],
+        start_date=params["start_date"], end_date=params["end_date"]
+    )
+    return collection_validators(db, query, *(RELATION_VALIDATORS[name] for name in params["include"]))
+
+def _filter_events(
+    db: Session,
+    role_key: str,
+    organizer_id: Optional[UUID] = None,
+    *,
+    q: Optional[str],
+    fuzzy: bool,
+    status: Optional[EventStatus],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+) -> Tuple[Query, Any]:
+    """
+    Build the filtered listing query visible to `role_key`: everything for admins,
+    the organizer's own events for organizers, published events for customers.
+    Returns the query and the relevance expression when searching.
+    """
+    query = db.query(EventModel)
+    if role_key == "customer":
         query = query.filter(EventModel.status == EventStatus.PUBLISHED.value)
+    elif organizer_id is not None:
+        query = query.filter(EventModel.organizer_id == organizer_id)
 
-    # Search filter
+    # Full-text search filter (GIN on search_vector, GIN trigram on title for fuzzy)
+    rank = None
     if q:
-        query = query.filter(
-            (EventModel.title.ilike(f"%{q}%")) | 
-            (EventModel.description.ilike(f"%{q}%"))
-        )
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        match = EventModel.search_vector.op("@@")(ts_query)
+        rank = func.ts_rank_cd(EventModel.search_vector, ts_query)
+        if fuzzy:
+            match = match | EventModel.title.op("%")(q)
+            rank = rank + func.similarity(EventModel.title, q)
+        # ts_rank_cd and similarity are real (float4); the cursor carries the rank as a
+        # Python float, so sort and seek on its double precision value to compare exactly
+        rank = cast(rank, Float(53))
+        query = query.filter(match)
     
     # Status filter
     if status:
         query = query.filter(EventModel.status == status)
 
-    # Date range filter (using overalps or specific bounds)
-    # Note: time_range is TSTZRANGE in Postgres
-    if start_date and end_date:
-        # Simple overlap logic for the purpose of this implementation
-        # In a real scenario with TSTZRANGE, we'd use && operator
-        from sqlalchemy import cast, String
-        # For simplicity in this demo environment, we check if created_at or some other date is within range 
-        # normally we would use time_range.overlap
-        pass
+    # Date window filter: events whose time_range overlaps [start_date, end_date).
+    # A missing bound leaves that side of the window open. Served by idx_events_time_range (GiST).
+    # A bound without a timezone is UTC, so naive and aware bounds can be compared.
+    if start_date or end_date:
+        start_date = as_utc(start_date) if start_date else None
+        end_date = as_utc(end_date) if end_date else None
+        if start_date and end_date and end_date <= start_date:
+            raise HTTPException(status_code=400, detail="end_date must be after start_date")
+        window = func.tstzrange(start_date, end_date, "[)")
+        query = query.filter(EventModel.time_range.op("&&")(window))
+    return query, rank
+
+def _list_events(
+    db: Session,
+    role_key: str,
+    organizer_id: Optional[UUID] = None,
+    *,
+    page: int,
+    size: int,
+    cursor: Optional[str],
+    q: Optional[str],
+    fuzzy: bool,
+    status: Optional[EventStatus],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    total_mode: TotalMode,
+    fields: List[str],
+    include: List[str],
+) -> dict:
+    """
+    Build one listing page visible to `role_key`.
+    """
+    query, rank = _filter_events(
+        db, role_key, organizer_id,
+        q=q, fuzzy=fuzzy, status=status, start_date=start_date, end_date=end_date
+    )
 
     # Pagination
-    total = query.count()
-    skip = (page - 1) * size
-    events = query.offset(skip).limit(size).all()
+    total = None
+    if total_mode == TotalMode.EXACT:
+        count_key = json.dumps([
+            role_key, q, fuzzy, status.value if status else None,
+            start_date.isoformat() if start_date else None,
+            end_date.isoformat() if end_date else None
+        ])
+        total = get_cached_count(count_key)
+        if total is None:
+            total = query.count()
+            set_cached_count(count_key, total)
+    elif total_mode == TotalMode.ESTIMATED:
+        total = estimate_row_count(db, query)
+
+    # Deterministic order backed by the (start, id) composite indexes.
+    # Searches sort by relevance first; the rank is negated so every key ascends
+    # and a single row comparison still expresses "after the cursor".
+    sort_keys = [event_start_key(), EventModel.id]
+    if rank is not None:
+        sort_keys.insert(0, -rank)
+        query = query.add_columns(rank)
+    query = query.order_by(*sort_keys)
+    if cursor:
+        query = query.filter(tuple_(*sort_keys) > tuple_(*_cursor_key(cursor, ranked=rank is not None)))
+    else:
+        query = query.offset((page - 1) * size)
+
+    # Fetch one extra row to know whether another page follows
+    loaders = [selectinload(INCLUDABLE_RELATIONS[name]) for name in include]
+    rows = query.options(*loaders).limit(size + 1).all()
+    has_more = len(rows) > size
+    rows = rows[:size]
+    if rank is not None:
+        events = [row[0] for row in rows]
+        next_cursor = _event_cursor(rows[-1][0], rows[-1][1]) if has_more else None
+    else:
+        events = rows
+        next_cursor = _event_cursor(events[-1]) if has_more else None
     
-    pages = (total + size - 1) // size if size > 0 else 1
+    items = []
+    for event in events:
+        item = {"id": event.id}
+        for name in fields:
+            if name == "registration_count":
+                item[name] = event.registered_count
+            elif name != "id":
+                item[name] = getattr(event, name)
+        for name in include:
+            item[name] = getattr(event, name)
+        items.append(item)
+
+    pages = None
+    if total is not None:
+        pages = (total + size - 1) // size if size > 0 else 1
     
     return {
-        "items": events,
+        "items": items,
         "total": total,
         "page": page,
         "size": size,
-        "pages": pages
+        "pages": pages,
+        "has_more": has_more,
+        "next_cursor": next_cursor
     }
 
-from app.core.utils import validate_event_dates, check_schedule_overlap
+def _render(schema, data: Any, exclude_unset: bool = False) -> str:
+    """
+    Serialize a response the way FastAPI would for `response_model=schema`.
+    """
+    if PYDANTIC_V2:
+        model = schema.model_validate(data)
+    elif isinstance(data, dict):
+        model = schema.parse_obj(data)
+    else:
+        model = schema.from_orm(data)
+    return json.dumps(jsonable_encoder(model, exclude_unset=exclude_unset))
+
+def _page_cache_field(params: dict) -> str:
+    """
+    Cache field of a customer listing page: a digest of the normalized query.
+    """
+    normalized = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def _refresh_events_page(field: str, params: dict) -> None:
+    """
+    Re-render a stale customer page after the response was sent.
+    """
+    version = read_version(EVENT_PAGES_VERSION_KEY)
+    db = SessionLocal()
+    try:
+        validators = _listing_validators(db, "customer", None, params)
+        body = _render(EventPagination, _list_events(db, "customer", **params), exclude_unset=True)
+    finally:
+        db.close()
+    store_response(EVENT_PAGES_KEY, version, body, field, validators)
+
+# Customer pages rendered at startup: the default listing (the calendar reads /calendar/)
+WARM_PAGE_QUERIES = (
+    {},
+)
+
+def warm_event_cache() -> None:
+    """
+    Pre-render the most requested customer pages so the first visitors hit a warm cache.
+    Called from the app lifespan.
+    """
+    for overrides in WARM_PAGE_QUERIES:
+        params = {
+            "page": 1,
+            "size": 10,
+            "cursor": None,
+            "q": None,
+            "fuzzy": False,
+            "status": None,
+            "start_date": None,
+            "end_date": None,
+            "total_mode": TotalMode.EXACT,
+            "fields": list(SUMMARY_FIELDS),
+            "include": [],
+            **overrides,
+        }
+        _refresh_events_page(_page_cache_field(params), params)
+
+from app.core.utils import validate_event_dates, overlap_as_bad_request, estimate_row_count
+from app.services import space_index
 
 from datetime import datetime
 from dateutil import parser as date_parser
@@ -89,22 +418,17 @@ def create_event(
     *,
     db: Session = Depends(deps.get_db),
     event_in: EventCreate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.require(Permission.MANAGE_EVENTS)),
 ) -> Any:
     """
     Create new event.
     Only organizers and admins can create events.
     """
-    is_admin = any(role.name == "admin" for role in current_user.roles)
-    is_organizer = any(role.name == "organizer" for role in current_user.roles)
-    
-    if not (is_admin or is_organizer):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-        
     start_time = None
     end_time = None
     
-    # Validate dates and overlap if time_range and space_id are present
+    # Validate dates if time_range and space_id are present. Overlaps are left to the
+    # exclusion constraints (see overlap_as_bad_request).
     if event_in.time_range and event_in.space_id:
         start_time = event_in.time_range[0]
         end_time = event_in.time_range[1]
@@ -115,7 +439,6 @@ def create_event(
             end_time = date_parser.parse(end_time)
             
         validate_event_dates(start_time, end_time)
-        check_schedule_overlap(db, event_in.space_id, start_time, end_time)
 
     data = event_in.dict()
     if start_time and end_time:
@@ -131,26 +454,74 @@ def create_event(
         organizer_id=current_user.id
     )
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
-    return db_obj
+    with overlap_as_bad_request(db, event_in.space_id, start_time, end_time):
+        db.flush()
+        event_id = db_obj.id
+        db.commit()
+    space_index.invalidate(event_in.space_id)
+    invalidate_event_counts()
+    invalidate_calendar()
+    invalidate_event_responses(event_id)
+    event = _get_event(db, event_id)
+    if event.high_demand:
+        _preload_seats(db, event)
+    return event
 
 @router.get("/{id}", response_model=Event)
 def read_event(
     *,
     db: Session = Depends(deps.get_db),
     id: UUID,
-    current_user: User = Depends(deps.get_current_user),
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get event by ID.
+    Served from the response cache, invalidated on every write to the event.
+    Supports conditional GET with `If-None-Match`; the ETag is cached with the body,
+    so a hit (or a 304) makes no database query.
     """
-    event = db.query(EventModel).filter(EventModel.id == id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Permission check could be added here if needed
-    return event
+    version_key, entry_key = event_detail_keys(id)
+    cached = read_response(version_key, entry_key)
+    if cached.body is not None and cached.validators is not None:
+        validators = cached.validators
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+        if not cached.fresh and acquire_refresh_lock(entry_key):
+            background_tasks.add_task(_refresh_event_detail, id)
+        body = cached.body
+    else:
+        validators = resource_validators(db, EventModel, id, *RELATION_VALIDATORS.values())
+        if validators is None:
+            raise HTTPException(status_code=404, detail="Event not found")
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+        event = _get_event(db, id)
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        # Permission check could be added here if needed
+        body = _render(Event, event)
+        store_response(entry_key, cached.version, body, validators=validators)
+    event_response = Response(body, media_type="application/json")
+    set_validators(event_response, validators)
+    return event_response
+
+def _refresh_event_detail(id: UUID) -> None:
+    """
+    Re-render a stale cached event after the response was sent.
+    """
+    version_key, entry_key = event_detail_keys(id)
+    version = read_version(version_key)
+    db = SessionLocal()
+    try:
+        validators = resource_validators(db, EventModel, id, *RELATION_VALIDATORS.values())
+        event = _get_event(db, id)
+        body = _render(Event, event) if event and validators else None
+    finally:
+        db.close()
+    if body is not None:
+        store_response(entry_key, version, body, validators=validators)
 
 @router.put("/{id}", response_model=Event)
 def update_event(
@@ -158,7 +529,7 @@ def update_event(
     db: Session = Depends(deps.get_db),
     id: UUID,
     event_in: EventUpdate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Update an event.
@@ -167,9 +538,7 @@ def update_event(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
         
-    is_admin = any(role.name == "admin" for role in current_user.roles)
-    if not is_admin and event.organizer_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    deps.owner_or_admin(current_user, event.organizer_id)
         
     update_data = event_in.dict(exclude_unset=True)
 
@@ -185,10 +554,8 @@ def update_event(
     
     new_start = current_start
     new_end = current_end
-    new_space_id = event.space_id
+    old_space_id = new_space_id = event.space_id
 
-    checking_overlap = False
-    
     if "time_range" in update_data and update_data["time_range"]:
         new_start = update_data["time_range"][0]
         new_end = update_data["time_range"][1]
@@ -198,64 +565,155 @@ def update_event(
         if isinstance(new_end, str):
             new_end = date_parser.parse(new_end)
             
-        checking_overlap = True
         validate_event_dates(new_start, new_end)
         update_data["time_range"] = DateTimeTZRange(new_start, new_end, '[]')
         
     if "space_id" in update_data:
         new_space_id = update_data["space_id"]
-        checking_overlap = True
-        
-    if checking_overlap and new_space_id and new_start and new_end:
-        check_schedule_overlap(
-            db, 
-            new_space_id, 
-            new_start, 
-            new_end, 
-            exclude_event_id=id
-        )
 
     if "status" in update_data and update_data["status"]:
         update_data["status"] = update_data["status"].value if hasattr(update_data["status"], "value") else update_data["status"]
+
+    was_high_demand = event.high_demand
+    old_capacity = event.capacity
         
     for field, value in update_data.items():
         setattr(event, field, value)
         
     db.add(event)
-    db.commit()
-    db.refresh(event)
-    return event
+    # Overlaps (new slot, new space, or an event brought back from cancelled) are
+    # rejected by the exclusion constraints
+    with overlap_as_bad_request(db, new_space_id, new_start, new_end, exclude_event_id=id):
+        db.commit()
+    if update_data.keys() & {"space_id", "time_range", "status"}:
+        space_index.invalidate(old_space_id, new_space_id)
+    invalidate_event_counts()
+    invalidate_calendar()
+    invalidate_event_responses(id)
+
+    # Keep the seat store in line with the new capacity / mode
+    if was_high_demand and (not event.high_demand or "capacity" in update_data):
+        if event.high_demand and old_capacity is not None and event.capacity is not None:
+            get_seat_store().adjust(id, event.capacity - old_capacity)
+        else:
+            get_seat_store().drop(id)
+    if event.high_demand:
+        _preload_seats(db, event)
+    elif "capacity" in update_data and (
+        event.capacity is None or (old_capacity is not None and event.capacity > old_capacity)
+    ):
+        request_promotion(id)
+    return _get_event(db, id)
 
 @router.delete("/{id}", response_model=Event)
 def delete_event(
     *,
     db: Session = Depends(deps.get_db),
     id: UUID,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Delete an event.
     """
-    event = db.query(EventModel).filter(EventModel.id == id).first()
+    event = _get_event(db, id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
         
-    is_admin = any(role.name == "admin" for role in current_user.roles)
-    if not is_admin and event.organizer_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    deps.owner_or_admin(current_user, event.organizer_id)
         
+    high_demand = event.high_demand
+    # Its sessions are deleted along with it
+    space_ids = [event.space_id] + [session.space_id for session in event.sessions]
     db.delete(event)
     db.commit()
+    space_index.invalidate(*space_ids)
+    invalidate_event_counts()
+    invalidate_calendar()
+    invalidate_event_responses(id)
+    if high_demand:
+        get_seat_store().drop(id)
     return event
+
+def _preload_seats(db: Session, event: EventModel) -> None:
+    """
+    Loads the remaining seats and current registrants of a high-demand event into the seat store.
+    No-op if they are already loaded.
+    """
+    user_ids = [
+        row[0] for row in db.query(RegistrationModel.user_id).filter(
+            RegistrationModel.event_id == event.id,
+            RegistrationModel.status.in_(SEAT_HOLDING_STATUSES)
+        )
+    ]
+    seats = None if event.capacity is None else event.capacity - event.registered_count
+    get_seat_store().preload(event.id, seats, user_ids)
+
+def _check_registration_overlap(db: Session, event: EventModel, user_id: UUID) -> None:
+    """
+    Rejects a registration overlapping another event the user is registered for.
+    One query on the user's registrations joined to the GiST-indexed event ranges.
+    """
+    if not event.time_range:
+        return
+    overlap_query = db.query(RegistrationModel.id).join(EventModel, RegistrationModel.event_id == EventModel.id).filter(
+        RegistrationModel.user_id == user_id,
+        RegistrationModel.event_id != event.id,
+        EventModel.time_range.op("&&")(event.time_range)
+    )
+    if overlap_query.first():
+        raise HTTPException(status_code=400, detail="Schedule overlap with another registered event")
+
+def _claim_high_demand_seat(db: Session, event: EventModel, user_id: UUID) -> dict:
+    """
+    Flash-sale registration: the seat is claimed atomically in the seat store and the
+    claim is queued; the registration worker persists it in a batch.
+    The user gets a definitive answer immediately, with the registration still pending.
+    """
+    seat_store = get_seat_store()
+    result = seat_store.claim(event.id, user_id)
+    if result == ClaimResult.NOT_LOADED:
+        _preload_seats(db, event)
+        result = seat_store.claim(event.id, user_id)
+
+    if result == ClaimResult.DUPLICATE:
+        raise HTTPException(status_code=400, detail="Already registered for this event")
+    if result == ClaimResult.SOLD_OUT:
+        raise HTTPException(status_code=400, detail="Event is at full capacity")
+
+    now = datetime.now(timezone.utc)
+    claim = {
+        "registration_id": str(uuid4()),
+        "event_id": str(event.id),
+        "user_id": str(user_id),
+        "claimed_at": now.isoformat()
+    }
+    try:
+        anyio.from_thread.run(get_claim_queue().publish, claim)
+    except Exception:
+        seat_store.release(event.id, user_id)
+        raise HTTPException(status_code=503, detail="Registration is temporarily unavailable, please retry")
+
+    return {
+        "id": claim["registration_id"],
+        "user_id": user_id,
+        "event_id": event.id,
+        "session_id": None,
+        "status": RegistrationStatus.PENDING,
+        "created_at": now,
+        "updated_at": now
+    }
+
 @router.post("/{id}/register", response_model=Registration)
 def register_for_event(
     *,
     db: Session = Depends(deps.get_db),
     id: UUID,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Register current user for an event.
+    If the event is full the registration is created with status `waitlist`
+    and confirmed automatically, in arrival order, when seats free up.
     """
     event = db.query(EventModel).filter(EventModel.id == id).first()
     if not event:
@@ -264,6 +722,10 @@ def register_for_event(
     if event.status != EventStatus.PUBLISHED.value:
         raise HTTPException(status_code=400, detail="Can only register for published events")
 
+    if event.high_demand:
+        _check_registration_overlap(db, event, current_user.id)
+        return _claim_high_demand_seat(db, event, current_user.id)
+
     # 1. Check if already registered
     existing_reg = db.query(RegistrationModel).filter(
         RegistrationModel.event_id == id,
@@ -272,31 +734,24 @@ def register_for_event(
     if existing_reg:
         raise HTTPException(status_code=400, detail="Already registered for this event")
 
-    # 2. Check capacity
-    if event.capacity is not None:
-        count = db.query(RegistrationModel).filter(RegistrationModel.event_id == id).count()
-        if count >= event.capacity:
-            raise HTTPException(status_code=400, detail="Event is at full capacity")
+    # 2. Check for schedule overlaps
+    _check_registration_overlap(db, event, current_user.id)
 
-    # 3. Check for schedule overlaps
-    if event.time_range:
-        # Check if user has any other registrations that overlap with this event's time_range
-        from sqlalchemy import and_
-        overlap_query = db.query(RegistrationModel).join(EventModel, RegistrationModel.event_id == EventModel.id).filter(
-            RegistrationModel.user_id == current_user.id,
-            EventModel.time_range.op("&&")(event.time_range)
-        )
-        if overlap_query.first():
-            raise HTTPException(status_code=400, detail="Schedule overlap with another registered event")
+    # 3. Take a seat: conditional increment of the event counter, safe under concurrency.
+    # When the event is full the user joins the waitlist instead.
+    registration_status = RegistrationStatus.CONFIRMED.value
+    if not reserve_event_seat(db, id):
+        registration_status = RegistrationStatus.WAITLIST.value
 
     db_obj = RegistrationModel(
         user_id=current_user.id,
         event_id=id,
-        status=RegistrationStatus.CONFIRMED.value
+        status=registration_status
     )
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    invalidate_event_responses(id)
     return db_obj
 
 @router.delete("/{id}/unregister", response_model=Registration)
@@ -304,7 +759,7 @@ def unregister_from_event(
     *,
     db: Session = Depends(deps.get_db),
     id: UUID,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Unregister from an event.
@@ -316,14 +771,23 @@ def unregister_from_event(
     if not registration:
         raise HTTPException(status_code=404, detail="Registration not found")
     
+    frees_seat = registration.status in SEAT_HOLDING_STATUSES
+    if frees_seat:
+        release_event_seat(db, id)
     db.delete(registration)
     db.commit()
+    invalidate_event_responses(id)
+    if frees_seat:
+        request_promotion(id)
+
+    if db.query(EventModel.high_demand).filter(EventModel.id == id).scalar():
+        get_seat_store().release(id, current_user.id)
     return registration
 
 @router.get("/registrations/me", response_model=List[Registration])
 def read_my_registrations(
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get current user's registrations.
@@ -1,3 +1,4 @@
+import uuid
 from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException
@@ -7,7 +8,9 @@ from sqlalchemy.orm import Session
 from app.api import deps
 from app.core import security
 from app.core.config import settings
+from app.core.hashing import verify_and_update
 from app.models.users import User
+from app.schemas.user import RefreshTokenRequest
 
 router = APIRouter()
 
@@ -19,35 +22,87 @@ def login_access_token(
     OAuth2 compatible token login, get an access token for future requests
     """
     user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not security.verify_password(form_data.password, user.password_hash):
+    if not user:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+    valid, new_hash = verify_and_update(form_data.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+
+    if new_hash:
+        # Stored hash uses outdated parameters: replace it while we know the password
+        user.password_hash = new_hash
+        db.commit()
         
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    # Every login starts a refresh token family, named in the access tokens it issues.
+    # Tokens also carry the user's session generation ("log out everywhere" bumps it).
+    from app.core.redis import session_generation, start_token_family
+    family_id = uuid.uuid4().hex
+    generation = session_generation(user.id)
     token, jti = security.create_access_token(
-        user.id, expires_delta=access_token_expires
+        user.id, expires_delta=access_token_expires, claims={"fid": family_id, "gen": generation}
     )
     
-    # Store session in Redis
-    from app.core.redis import set_token_session
-    set_token_session(jti, str(user.id), settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+    # Store session and refresh token in Redis
+    refresh_token = start_token_family(
+        family_id, jti, str(user.id), generation, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
     
     return {
         "access_token": token,
         "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+@router.post("/login/refresh-token")
+async def refresh_access_token(body: RefreshTokenRequest) -> Any:
+    """
+    Exchange a refresh token for a new access token and the next refresh token.
+    Runs on Redis only (no database lookup, no password check). Each refresh token
+    can be used once: using it again revokes every token issued since its login.
+    """
+    from app.core.redis import claim_refresh_token_async, extend_token_family_async, revoke_token_family_async
+
+    claimed = await claim_refresh_token_async(body.refresh_token)
+    if claimed is None:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    if claimed[0] == "reused":
+        await revoke_token_family_async(claimed[1], claimed[2])
+        raise HTTPException(status_code=401, detail="Refresh token reuse detected, please log in again")
+
+    _, family_id, user_id, generation = claimed
+    token, jti = security.create_access_token(
+        user_id,
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        claims={"fid": family_id, "gen": generation},
+    )
+    refresh_token = await extend_token_family_async(
+        family_id, jti, user_id, generation, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
+    if refresh_token is None:
+        # Revoked concurrently (reuse detected, logout or "log out everywhere")
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
     }
 
 @router.post("/logout")
-def logout(
+async def logout(
     token: str = Depends(deps.reusable_oauth2),
 ) -> Any:
     """
-    Logout: Invalidate token in Redis
+    Logout: Invalidate token in Redis, along with the refresh tokens of its login
     """
     from jose import jwt
+    from starlette.concurrency import run_in_threadpool
     from app.core.config import settings
-    from app.core.redis import remove_token_session
+    from app.core.redis import remove_token_session_async, revoke_token_family_async
+    from app.core.principal import invalidate_principal
     
     try:
         payload = jwt.decode(
@@ -55,7 +110,10 @@ def logout(
         )
         jti = payload.get("jti")
         if jti:
-            remove_token_session(jti)
+            if payload.get("fid"):
+                await revoke_token_family_async(payload["fid"], payload["sub"])
+            await remove_token_session_async(jti)
+            await run_in_threadpool(invalidate_principal, jti)
     except Exception:
         pass
         
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.core.permissions import Permission
+from app.core.principal import Principal
+from app.core.utils import validate_event_dates, find_schedule_conflicts
+from app.schemas.schedule import ScheduleValidateRequest, ScheduleValidation
+from app.services import space_index
+
+router = APIRouter()
+
+# Free slots returned with a conflicting fast validation
+MAX_SUGGESTIONS = 3
+
+@router.post("/validate", response_model=ScheduleValidation)
+def validate_schedule(
+    *,
+    db: Session = Depends(deps.get_db),
+    schedule_in: ScheduleValidateRequest,
+    fast: bool = False,
+    current_user: Principal = Depends(deps.require(Permission.MANAGE_EVENTS)),
+) -> Any:
+    """
+    Dry run of the schedule checks applied when creating or updating an event or session.
+    Returns every item already booked in the space during the requested time range.
+    With `fast=true` (e.g. while dragging an item around a calendar) the answer comes from
+    the worker's in-memory space index when it is trusted, along with free slots of the
+    same day to suggest; the database constraints still decide on the actual write.
+    """
+    if len(schedule_in.time_range) != 2:
+        raise HTTPException(status_code=400, detail="time_range must contain a start and an end")
+    start_time, end_time = schedule_in.time_range
+    validate_event_dates(start_time, end_time)
+
+    if fast:
+        index = space_index.get(db, schedule_in.space_id)
+        if index is not None:
+            return _validate_with_index(index, schedule_in, start_time, end_time)
+
+    conflicts = find_schedule_conflicts(
+        db,
+        schedule_in.space_id,
+        start_time,
+        end_time,
+        exclude_event_id=schedule_in.exclude_event_id,
+        exclude_session_id=schedule_in.exclude_session_id,
+    )
+    return {
+        "valid": not conflicts,
+        "conflicts": [conflict._asdict() for conflict in conflicts],
+    }
+
+def _validate_with_index(
+    index: space_index.SpaceIntervals, schedule_in: ScheduleValidateRequest, start_time: datetime, end_time: datetime
+) -> dict:
+    # Stored ranges are timezone-aware; naive input is taken as UTC
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    if end_time.tzinfo is None:
+        end_time = end_time.replace(tzinfo=timezone.utc)
+    exclude_ids = {schedule_in.exclude_event_id, schedule_in.exclude_session_id} - {None}
+
+    conflicts = index.overlapping(start_time, end_time, exclude_ids)
+    suggestions = []
+    if conflicts:
+        # Events and sessions must start and end on the same day
+        day_start = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_end = day_start + timedelta(days=1) - timedelta(microseconds=1)
+        slots = index.free_slots(day_start, day_end, end_time - start_time, exclude_ids)
+        suggestions = [{"start": start, "end": end} for start, end in slots[:MAX_SUGGESTIONS]]
+    return {
+        "valid": not conflicts,
+        "conflicts": [conflict._asdict() for conflict in conflicts],
+        "source": "index",
+        "suggestions": suggestions,
+    }
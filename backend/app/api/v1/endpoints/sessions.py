@@ -1,13 +1,19 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.api import deps
-from app.models.users import User
+from app.core.permissions import Permission
+from app.core.principal import Principal
 from app.models.events import Session as SessionModel, Event as EventModel
 from app.schemas.event import Session as SessionSchema, SessionCreate, SessionUpdate
-from app.core.utils import validate_event_dates, check_schedule_overlap
+from app.core.utils import validate_event_dates, overlap_as_bad_request
+from app.services import space_index
+from app.core.cache import invalidate_calendar, invalidate_event_responses
+from app.core.conditional import (
+    collection_validators, resource_validators, is_not_modified, not_modified_response, set_validators,
+)
 
 from datetime import datetime
 from dateutil import parser as date_parser
@@ -20,25 +26,18 @@ def create_session(
     *,
     db: Session = Depends(deps.get_db),
     session_in: SessionCreate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.require(Permission.MANAGE_EVENTS)),
 ) -> Any:
     """
     Create new session.
     Only organizers and admins can create sessions.
     """
-    is_admin = any(role.name == "admin" for role in current_user.roles)
-    is_organizer = any(role.name == "organizer" for role in current_user.roles)
-    
-    if not (is_admin or is_organizer):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
     # verify event exists and user has permission
     if session_in.event_id:
         event = db.query(EventModel).filter(EventModel.id == session_in.event_id).first()
         if not event:
              raise HTTPException(status_code=404, detail="Event not found")
-        if not is_admin and event.organizer_id != current_user.id:
-             raise HTTPException(status_code=403, detail="Not enough permissions for this event")
+        deps.owner_or_admin(current_user, event.organizer_id, detail="Not enough permissions for this event")
 
     # Validate dates
     start_time = session_in.time_range[0]
@@ -51,9 +50,6 @@ def create_session(
         
     validate_event_dates(start_time, end_time)
 
-    # Validate overlap
-    check_schedule_overlap(db, session_in.space_id, start_time, end_time)
-
     data = session_in.dict()
     data["time_range"] = DateTimeTZRange(start_time, end_time, '[]')
     if "status" in data and data["status"]:
@@ -65,8 +61,15 @@ def create_session(
         organizer_id=current_user.id
     )
     db.add(db_obj)
-    db.commit()
+    # Overlaps are rejected by the exclusion constraints, no pre-check query
+    with overlap_as_bad_request(db, session_in.space_id, start_time, end_time):
+        db.commit()
+    space_index.invalidate(session_in.space_id)
+    invalidate_calendar()
     db.refresh(db_obj)
+    # Sessions are embedded in cached event responses
+    if db_obj.event_id:
+        invalidate_event_responses(db_obj.event_id)
     return db_obj
 
 @router.get("/{id}", response_model=SessionSchema)
@@ -74,14 +77,24 @@ def read_session(
     *,
     db: Session = Depends(deps.get_db),
     id: UUID,
-    current_user: User = Depends(deps.get_current_user),
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get session by ID.
+    Supports conditional GET with `If-None-Match` / `If-Modified-Since`.
     """
+    validators = resource_validators(db, SessionModel, id)
+    if validators is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
     session = db.query(SessionModel).filter(SessionModel.id == id).first()
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
+    set_validators(response, validators)
     return session
 
 @router.put("/{id}", response_model=SessionSchema)
@@ -90,7 +103,7 @@ def update_session(
     db: Session = Depends(deps.get_db),
     id: UUID,
     session_in: SessionUpdate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Update a session.
@@ -99,18 +112,14 @@ def update_session(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
         
-    is_admin = any(role.name == "admin" for role in current_user.roles)
-    if not is_admin and session.organizer_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    deps.owner_or_admin(current_user, session.organizer_id)
         
     update_data = session_in.dict(exclude_unset=True)
     
     # Check validations if time/space changed
     new_start = session.time_range.lower
     new_end = session.time_range.upper
-    new_space_id = session.space_id
-    
-    checking_overlap = False
+    old_space_id = new_space_id = session.space_id
     
     if "time_range" in update_data:
         new_start = update_data["time_range"][0]
@@ -121,32 +130,29 @@ def update_session(
         if isinstance(new_end, str):
             new_end = date_parser.parse(new_end)
             
-        checking_overlap = True
         validate_event_dates(new_start, new_end)
         update_data["time_range"] = DateTimeTZRange(new_start, new_end, '[]')
         
     if "space_id" in update_data:
         new_space_id = update_data["space_id"]
-        checking_overlap = True
-        
-    if checking_overlap:
-        check_schedule_overlap(
-            db, 
-            new_space_id, 
-            new_start, 
-            new_end, 
-            exclude_session_id=id
-        )
 
     if "status" in update_data and update_data["status"]:
         update_data["status"] = update_data["status"].value if hasattr(update_data["status"], "value") else update_data["status"]
         
+    old_event_id = session.event_id
     for field, value in update_data.items():
         setattr(session, field, value)
         
     db.add(session)
-    db.commit()
+    with overlap_as_bad_request(db, new_space_id, new_start, new_end, exclude_session_id=id):
+        db.commit()
+    if update_data.keys() & {"space_id", "time_range", "status"}:
+        space_index.invalidate(old_space_id, new_space_id)
+    invalidate_calendar()
     db.refresh(session)
+    for event_id in {old_event_id, session.event_id}:
+        if event_id:
+            invalidate_event_responses(event_id)
     return session
 
 @router.delete("/{id}", response_model=SessionSchema)
@@ -154,7 +160,7 @@ def delete_session(
     *,
     db: Session = Depends(deps.get_db),
     id: UUID,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Delete a session.
@@ -163,22 +169,34 @@ def delete_session(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
         
-    is_admin = any(role.name == "admin" for role in current_user.roles)
-    if not is_admin and session.organizer_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    deps.owner_or_admin(current_user, session.organizer_id)
         
+    event_id = session.event_id
+    space_id = session.space_id
     db.delete(session)
     db.commit()
+    space_index.invalidate(space_id)
+    invalidate_calendar()
+    if event_id:
+        invalidate_event_responses(event_id)
     return session
 
 @router.get("/event/{event_id}", response_model=List[SessionSchema])
 def read_sessions_by_event(
     event_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get sessions for an event.
+    Supports conditional GET with `If-None-Match`.
     """
-    sessions = db.query(SessionModel).filter(SessionModel.event_id == event_id).all()
-    return sessions
+    query = db.query(SessionModel).filter(SessionModel.event_id == event_id)
+    validators = collection_validators(db, query)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    set_validators(response, validators)
+    return query.all()
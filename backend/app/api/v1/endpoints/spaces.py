@@ -1,21 +1,94 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.conditional import collection_validators, is_not_modified, not_modified_response, set_validators
+from app.core.permissions import Permission
+from app.core.principal import Principal
 from app.models.venues import Space
-from app.schemas.space import Space as SpaceSchema
+from app.schemas.space import Space as SpaceSchema, SpaceAvailability
+from app.services.availability import MAX_WINDOW, find_free_slots
+from app.services.calendar import as_utc
 
 router = APIRouter()
 
 @router.get("/", response_model=List[SpaceSchema])
 def read_spaces(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
     """
     Retrieve spaces.
+    Supports conditional GET with `If-None-Match`.
     """
+    validators = collection_validators(db, db.query(Space))
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    set_validators(response, validators)
     spaces = db.query(Space).offset(skip).limit(limit).all()
     return spaces
+
+def _check_window(window_start: datetime, window_end: datetime, min_duration: timedelta) -> Tuple[datetime, datetime]:
+    """
+    Validated window, both bounds in UTC (a bound without a timezone is UTC).
+    """
+    window_start, window_end = as_utc(window_start), as_utc(window_end)
+    if window_end <= window_start:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if window_end - window_start > MAX_WINDOW:
+        raise HTTPException(status_code=400, detail=f"The window cannot exceed {MAX_WINDOW.days} days")
+    if min_duration < timedelta(0):
+        raise HTTPException(status_code=400, detail="min_duration cannot be negative")
+    return window_start, window_end
+
+@router.get("/availability", response_model=List[SpaceAvailability])
+def read_spaces_availability(
+    db: Session = Depends(deps.get_db),
+    window_start: datetime = Query(..., alias="from"),
+    window_end: datetime = Query(..., alias="to"),
+    min_duration: timedelta = timedelta(0),
+    space_id: Optional[List[UUID]] = Query(None),
+    current_user: Principal = Depends(deps.require(Permission.MANAGE_EVENTS)),
+) -> Any:
+    """
+    Spaces with at least one free slot of `min_duration` (seconds or ISO 8601, e.g. `PT2H`)
+    between `from` and `to`, with their free slots. Every active space is searched in one
+    query; repeat `space_id` to restrict the candidates.
+    """
+    window_start, window_end = _check_window(window_start, window_end, min_duration)
+    spaces = {}
+    for slot in find_free_slots(db, window_start, window_end, min_duration, space_id):
+        entry = spaces.setdefault(slot.space_id, {"space_id": slot.space_id, "name": slot.space_name, "slots": []})
+        entry["slots"].append({"start": slot.start, "end": slot.end})
+    return list(spaces.values())
+
+@router.get("/{id}/availability", response_model=SpaceAvailability)
+def read_space_availability(
+    id: UUID,
+    db: Session = Depends(deps.get_db),
+    window_start: datetime = Query(..., alias="from"),
+    window_end: datetime = Query(..., alias="to"),
+    min_duration: timedelta = timedelta(0),
+    current_user: Principal = Depends(deps.require(Permission.MANAGE_EVENTS)),
+) -> Any:
+    """
+    Free slots of a space between `from` and `to` lasting at least `min_duration`
+    (seconds or ISO 8601, e.g. `PT2H`): the gaps between its events and sessions.
+    """
+    window_start, window_end = _check_window(window_start, window_end, min_duration)
+    space = db.query(Space).filter(Space.id == id).first()
+    if not space:
+        raise HTTPException(status_code=404, detail="Space not found")
+    slots = find_free_slots(db, window_start, window_end, min_duration, [id])
+    return {
+        "space_id": space.id,
+        "name": space.name,
+        "slots": [{"start": slot.start, "end": slot.end} for slot in slots],
+    }
@@ -1,9 +1,11 @@
 from typing import Any, List
 from fastapi import APIRouter, Body, Depends, HTTPException
+from jose import jwt
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.api import deps
+from app.core.principal import Principal, invalidate_user_principals
 from app.core.security import get_password_hash
 from app.models.users import User, Role
 from app.schemas import user as user_schema
@@ -15,7 +17,7 @@ def read_users(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users. (Admin only)
@@ -32,12 +34,52 @@ def read_user_me(
     """
     return current_user
 
+@router.get("/me/sessions", response_model=List[user_schema.UserSession])
+def read_user_sessions(
+    token: str = Depends(deps.reusable_oauth2),
+    current_user: Principal = Depends(deps.get_current_principal),
+) -> Any:
+    """
+    List the current user's active logins.
+    """
+    from app.core.redis import list_user_sessions
+    current_family = jwt.get_unverified_claims(token).get("fid")
+    return [
+        {**session, "current": session["id"] == current_family}
+        for session in list_user_sessions(current_user.id)
+    ]
+
+@router.delete("/me/sessions")
+def revoke_user_sessions_me(
+    current_user: Principal = Depends(deps.get_current_principal),
+) -> Any:
+    """
+    Log out everywhere, including this session.
+    """
+    from app.core.redis import revoke_user_sessions
+    revoke_user_sessions(current_user.id)
+    invalidate_user_principals(current_user.id)
+    return {"detail": "Logged out from all sessions"}
+
+@router.delete("/me/sessions/{session_id}")
+def revoke_user_session(
+    session_id: str,
+    current_user: Principal = Depends(deps.get_current_principal),
+) -> Any:
+    """
+    Log out one of the current user's logins.
+    """
+    from app.core.redis import revoke_token_family
+    if not revoke_token_family(session_id, str(current_user.id)):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"detail": "Session revoked"}
+
 @router.post("/", response_model=user_schema.User)
 def create_user(
     *,
     db: Session = Depends(deps.get_db),
     user_in: user_schema.UserCreate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Create new user by admin.
@@ -124,7 +166,7 @@ def update_user(
     db: Session = Depends(deps.get_db),
     user_id: UUID,
     user_in: user_schema.UserUpdate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Update a user. (Admin only)
@@ -137,6 +179,8 @@ def update_user(
         )
     
     update_data = user_in.dict(exclude_unset=True)
+    # Existing tokens must not outlive a password change or a deactivation
+    revoke_sessions = "password" in update_data or update_data.get("is_active") is False
     if "password" in update_data:
         password_hash = get_password_hash(update_data["password"])
         user.password_hash = password_hash
@@ -163,6 +207,11 @@ def update_user(
     db.add(user)
     db.commit()
     db.refresh(user)
+    if revoke_sessions:
+        from app.core.redis import revoke_user_sessions
+        revoke_user_sessions(user.id)
+    # Roles or status may have changed: cached principals must be rebuilt
+    invalidate_user_principals(user.id)
     return user
 
 @router.delete("/{user_id}", response_model=user_schema.User)
@@ -170,7 +219,7 @@ def delete_user(
     *,
     db: Session = Depends(deps.get_db),
     user_id: UUID,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Delete a user. (Admin only)
@@ -187,4 +236,7 @@ def delete_user(
         )
     db.delete(user)
     db.commit()
+    from app.core.redis import revoke_user_sessions
+    revoke_user_sessions(user_id)
+    invalidate_user_principals(user_id)
     return user
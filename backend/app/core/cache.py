@@ -0,0 +1,174 @@
+import time
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional, Tuple
+from redis.exceptions import RedisError
+
+from app.core.conditional import Validators
+from app.core.config import settings
+from app.core.redis import redis_client
+
+# Namespace holding cached COUNT(*) results for event listings.
+EVENTS_COUNT_KEY = "cache:events:counts"
+COUNT_TTL_SECONDS = 300
+
+# Serialized GET /events/ pages (customer view), one hash field per normalized query.
+EVENT_PAGES_KEY = "cache:events:pages"
+EVENT_PAGES_VERSION_KEY = "cache:events:pages:version"
+
+# Serialized GET /calendar/ windows, one hash field per audience, month window and space.
+CALENDAR_KEY = "cache:calendar"
+CALENDAR_VERSION_KEY = "cache:calendar:version"
+
+def get_cached_count(field: str) -> Optional[int]:
+    """
+    Return the cached row count for a listing filter key, if any.
+    Redis failures are treated as a cache miss.
+    """
+    try:
+        value = redis_client.hget(EVENTS_COUNT_KEY, field)
+    except RedisError:
+        return None
+    return int(value) if value is not None else None
+
+def set_cached_count(field: str, value: int) -> None:
+    """
+    Cache the row count for a listing filter key.
+    """
+    try:
+        pipe = redis_client.pipeline()
+        pipe.hset(EVENTS_COUNT_KEY, field, value)
+        pipe.expire(EVENTS_COUNT_KEY, COUNT_TTL_SECONDS)
+        pipe.execute()
+    except RedisError:
+        pass
+
+def invalidate_event_counts() -> None:
+    """
+    Drop every cached event count. Called whenever events are written.
+    """
+    try:
+        redis_client.delete(EVENTS_COUNT_KEY)
+    except RedisError:
+        pass
+
+# Response cache
+#
+# Entries are stored as "<version>|<fresh_until>|<etag>|<last_modified>|<body>", with the
+# conditional GET validators of the body, so a hit is answered (or 304'd) without
+# touching the database. Invalidation bumps the version
+# instead of deleting, so an entry rendered while a write was happening is stored
+# under the old version and never served. Version keys never expire: were one to reset
+# to 0, entries stored at version 0 before the last write would become valid again.
+# Entries stay readable, as stale, for RESPONSE_CACHE_STALE_SECONDS after they stop
+# being fresh (stale-while-revalidate), even inside a hash whose TTL keeps being renewed.
+
+class CachedResponse(NamedTuple):
+    body: Optional[str]
+    fresh: bool
+    version: Optional[int]
+    # Stored with the body, None if it was stored without
+    validators: Optional[Validators] = None
+
+def event_detail_keys(event_id) -> Tuple[str, str]:
+    """
+    Version key and entry key of a cached GET /events/{id} response.
+    """
+    return f"cache:event:{event_id}:version", f"cache:event:{event_id}"
+
+def _entry_ttl() -> int:
+    return settings.RESPONSE_CACHE_TTL_SECONDS + settings.RESPONSE_CACHE_STALE_SECONDS
+
+def read_response(version_key: str, entry_key: str, field: Optional[str] = None) -> CachedResponse:
+    """
+    Reads the current version and the cached entry in one round trip.
+    `body` is None on a miss; `version` must be passed back to store_response.
+    """
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(version_key)
+        if field is None:
+            pipe.get(entry_key)
+        else:
+            pipe.hget(entry_key, field)
+        version, raw = pipe.execute()
+    except RedisError:
+        return CachedResponse(None, False, None)
+
+    version = int(version or 0)
+    if raw:
+        entry_version, fresh_until, etag, last_modified, body = raw.split("|", 4)
+        now, fresh_until = time.time(), float(fresh_until)
+        if int(entry_version) == version and now < fresh_until + settings.RESPONSE_CACHE_STALE_SECONDS:
+            validators = None
+            if etag:
+                last_modified = datetime.fromtimestamp(float(last_modified), timezone.utc) if last_modified else None
+                validators = Validators(etag, last_modified)
+            return CachedResponse(body, now < fresh_until, version, validators)
+    return CachedResponse(None, False, version)
+
+def read_version(version_key: str) -> Optional[int]:
+    try:
+        return int(redis_client.get(version_key) or 0)
+    except RedisError:
+        return None
+
+def store_response(
+    entry_key: str, version: Optional[int], body: str, field: Optional[str] = None,
+    validators: Optional[Validators] = None
+) -> None:
+    """
+    Stores a rendered response under the version read before rendering it, along with
+    its validators (computed under that same version).
+    """
+    if version is None:
+        return
+    etag = last_modified = ""
+    if validators is not None:
+        etag = validators.etag
+        if validators.last_modified is not None:
+            last_modified = validators.last_modified.timestamp()
+    value = f"{version}|{time.time() + settings.RESPONSE_CACHE_TTL_SECONDS}|{etag}|{last_modified}|{body}"
+    try:
+        if field is None:
+            redis_client.set(entry_key, value, ex=_entry_ttl())
+        else:
+            pipe = redis_client.pipeline()
+            pipe.hset(entry_key, field, value)
+            pipe.expire(entry_key, _entry_ttl())
+            pipe.execute()
+    except RedisError:
+        pass
+
+def acquire_refresh_lock(entry_key: str, field: Optional[str] = None) -> bool:
+    """
+    Elects a single request to re-render a stale entry; the others keep serving it.
+    """
+    lock_key = f"{entry_key}:refreshing" if field is None else f"{entry_key}:refreshing:{field}"
+    try:
+        return bool(redis_client.set(lock_key, "1", ex=settings.RESPONSE_CACHE_LOCK_SECONDS, nx=True))
+    except RedisError:
+        return False
+
+def invalidate_event_responses(event_id=None) -> None:
+    """
+    Invalidates cached event pages and, when given, the cached detail of one event.
+    Called on event, session and registration writes.
+    """
+    try:
+        pipe = redis_client.pipeline()
+        pipe.incr(EVENT_PAGES_VERSION_KEY)
+        if event_id is not None:
+            version_key, _ = event_detail_keys(event_id)
+            pipe.incr(version_key)
+        pipe.execute()
+    except RedisError:
+        pass
+
+def invalidate_calendar() -> None:
+    """
+    Invalidates every cached calendar window. Called on event and session writes.
+    """
+    try:
+        redis_client.incr(CALENDAR_VERSION_KEY)
+    except RedisError:
+        pass
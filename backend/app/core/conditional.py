@@ -0,0 +1,91 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+
+# An embedded collection: (child updated_at column, child foreign key column)
+Related = Tuple
+
+def _validators(parts: list, last_modified: Optional[datetime] = None) -> Validators:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return Validators(f'W/"{digest}"', last_modified)
+
+def _related_state(db: Session, related: Related, condition) -> tuple:
+    updated_at, foreign_key = related
+    return db.query(func.max(updated_at), func.count()).filter(condition(foreign_key)).one()
+
+def collection_validators(db: Session, query: Query, *related: Related) -> Validators:
+    """
+    Validators of the rows matched by a filtered query, from max(updated_at) and the
+    row count, computed with an aggregate instead of loading the rows.
+    `related` collections embedded in the response are folded in the same way.
+    ETag only: deleting a row changes the count but not max(updated_at), so a
+    Last-Modified would answer If-Modified-Since with a wrong 304.
+    """
+    model = query.column_descriptions[0]["entity"]
+    last_modified, count = query.with_entities(func.max(model.updated_at), func.count(model.id)).order_by(None).one()
+    parts = [last_modified, count]
+    for item in related:
+        ids = query.with_entities(model.id).order_by(None)
+        parts += _related_state(db, item, lambda fk: fk.in_(ids))
+    return _validators(parts)
+
+def resource_validators(db: Session, model, id, *related: Related) -> Optional[Validators]:
+    """
+    Validators of a single row from its updated_at (and the max(updated_at) and row
+    count of embedded collections). Returns None if the row does not exist.
+    Last-Modified is only set without embedded collections, whose deletions it
+    would miss (see collection_validators).
+    """
+    updated_at = db.query(model.updated_at).filter(model.id == id).scalar()
+    if updated_at is None:
+        return None
+    parts = [id, updated_at]
+    for item in related:
+        parts += _related_state(db, item, lambda fk: fk == id)
+    return _validators(parts, None if related else updated_at)
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """
+    Evaluates If-None-Match (weak comparison) or, in its absence, If-Modified-Since.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [_opaque_tag(tag) for tag in if_none_match.split(",")]
+        return "*" in tags or _opaque_tag(validators.etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have a one second resolution
+        return validators.last_modified.replace(microsecond=0) <= since
+    return False
+
+def set_validators(response: Response, validators: Validators) -> None:
+    response.headers["ETag"] = validators.etag
+    if validators.last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(
+            validators.last_modified.astimezone(timezone.utc), usegmt=True
+        )
+
+def not_modified_response(validators: Validators) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, validators)
+    return response
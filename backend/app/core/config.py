@@ -31,6 +31,26 @@ class Settings(BaseSettings):
     def REDIS_URL(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/0"
 
+    # Async Redis pool (event loop side)
+    REDIS_ASYNC_MAX_CONNECTIONS: int = 64
+    REDIS_ASYNC_POOL_TIMEOUT: float = 2.0
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+
+    # Response cache for event reads: entries are fresh for TTL seconds, then served
+    # stale for up to STALE seconds while a single request re-renders them
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_STALE_SECONDS: int = 300
+    RESPONSE_CACHE_LOCK_SECONDS: int = 10
+
+    # Idempotency replies: response bytes copied at most, and stored size after compression
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 1024 * 1024
+    IDEMPOTENCY_MAX_STORED_BYTES: int = 256 * 1024
+    # Duplicates of an in-flight request wait this long for its reply (clients may ask
+    # for another value with `Prefer: wait=N`, up to the max), at most MAX_WAITERS per process
+    IDEMPOTENCY_WAIT_SECONDS: float = 5.0
+    IDEMPOTENCY_MAX_WAIT_SECONDS: float = 30.0
+    IDEMPOTENCY_MAX_WAITERS: int = 32
+
     # RabbitMQ
     RABBITMQ_HOST: str
     RABBITMQ_PORT: int = 5672
@@ -41,10 +61,50 @@ class Settings(BaseSettings):
     def RABBITMQ_URL(self) -> str:
         return f"amqp://{self.RABBITMQ_USER}:{self.RABBITMQ_PASSWORD}@{self.RABBITMQ_HOST}:{self.RABBITMQ_PORT}/"
 
+    # High-demand registration: "redis" claims seats in Redis and persists them through
+    # RabbitMQ; "local" keeps seats and the claim queue in-process (tests, single worker).
+    HIGH_DEMAND_BACKEND: str = "redis"
+    REGISTRATION_QUEUE_NAME: str = "registrations.claims"
+    REGISTRATION_BATCH_SIZE: int = 200
+    REGISTRATION_BATCH_WAIT_MS: int = 200
+
+    # Waitlist promoter: polling interval and number of flagged events handled per pass
+    WAITLIST_PROMOTION_INTERVAL_MS: int = 500
+    WAITLIST_PROMOTION_BATCH: int = 100
+
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Refresh tokens rotate on every use; a login can be extended this long without a password
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+
+    # bcrypt process pool: worker processes, jobs admitted at once, and how long a
+    # caller waits for admission before getting a 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 8
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5.0
+
+    # Authenticated principal cache (jti -> user id, status and roles).
+    # PRINCIPAL_CACHE_REDIS adds a shared tier that also propagates invalidations across workers;
+    # without it other workers may keep a stale principal for up to the TTL.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_REDIS: bool = True
+
+    # Per-worker mirror of token sessions fed by Redis pub/sub. It is trusted only while
+    # the subscription answered within MAX_STALENESS seconds; otherwise tokens are checked in Redis.
+    TOKEN_MIRROR_ENABLED: bool = True
+    TOKEN_MIRROR_MAX_STALENESS_SECONDS: float = 2.0
+    TOKEN_MIRROR_PRUNE_THRESHOLD: int = 100000
+
+    # Per-worker interval index of space bookings, for fast conflict checks and slot
+    # suggestions. Invalidated over pub/sub and trusted under the same staleness rule as
+    # the token mirror; rebuilt after TTL_SECONDS to pick up writes made outside the API.
+    SPACE_INDEX_ENABLED: bool = True
+    SPACE_INDEX_MAX_STALENESS_SECONDS: float = 2.0
+    SPACE_INDEX_TTL_SECONDS: int = 300
+    SPACE_INDEX_MAX_SPACES: int = 1000
 
     if PYDANTIC_V2:
         model_config = SettingsConfigDict(case_sensitive=True, env_file=".env", extra="ignore")
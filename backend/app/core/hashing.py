@@ -0,0 +1,106 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt runs in worker processes so it neither occupies the Starlette threadpool with
+# CPU work nor holds the GIL of the web worker. Admission is bounded: past
+# PASSWORD_HASH_MAX_PENDING jobs, callers wait up to PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS
+# for a slot and then get a 503.
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+_metrics_lock = threading.Lock()
+_metrics: Dict[str, float] = {
+    "in_flight": 0,
+    "waiting": 0,
+    "completed": 0,
+    "rejected": 0,
+    "rehashed": 0,
+    "wait_seconds_total": 0.0,
+    "run_seconds_total": 0.0,
+}
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, password_hash)
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a process that runs threads (threadpool, pub/sub listener) is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+def _count(name: str, value: float = 1) -> None:
+    with _metrics_lock:
+        _metrics[name] += value
+
+def _run(fn, *args):
+    queued_at = time.perf_counter()
+    _count("waiting")
+    acquired = _slots.acquire(timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS)
+    _count("waiting", -1)
+    if not acquired:
+        _count("rejected")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry",
+        )
+    _count("in_flight")
+    started = time.perf_counter()
+    try:
+        return _get_executor().submit(fn, *args).result()
+    finally:
+        _slots.release()
+        finished = time.perf_counter()
+        with _metrics_lock:
+            _metrics["in_flight"] -= 1
+            _metrics["completed"] += 1
+            _metrics["wait_seconds_total"] += started - queued_at
+            _metrics["run_seconds_total"] += finished - started
+
+def hash_password(password: str) -> str:
+    return _run(_hash, password)
+
+def verify_and_update(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password; the second item is a new hash when the stored one uses
+    deprecated settings and should be replaced.
+    """
+    valid, new_hash = _run(_verify_and_update, password, password_hash)
+    if new_hash:
+        _count("rehashed")
+    return valid, new_hash
+
+def verify_password(password: str, password_hash: str) -> bool:
+    return verify_and_update(password, password_hash)[0]
+
+def hashing_metrics() -> Dict[str, float]:
+    with _metrics_lock:
+        return dict(_metrics)
+
+def shutdown() -> None:
+    """
+    Stops the worker processes. Called from the app lifespan.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
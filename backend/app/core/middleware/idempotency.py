@@ -1,82 +1,257 @@
+import asyncio
+import base64
+import hashlib
 import json
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
-from app.core.redis import redis_client
-import time
+import zlib
+from typing import List, Optional
 
-from starlette.concurrency import iterate_in_threadpool
+from jose import jwt, JWTError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class IdempotencyMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Only check idempotency for modifying methods
-        if request.method not in ["POST", "PUT", "PATCH", "DELETE"]:
-            return await call_next(request)
+from app.core.config import settings
+from app.core.redis import get_async_redis
 
-        request_id = request.headers.get("X-Request-ID")
+# Lock value while the first request runs: "processing:<request fingerprint>"
+PROCESSING = "processing"
+# Replies are kept this long
+REPLY_TTL_SECONDS = 86400
+# The lock expires on its own if the worker dies mid-request
+PROCESSING_TTL_SECONDS = 60
+
+MODIFYING_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+def _principal_id(scope: Scope) -> str:
+    """
+    Subject of a valid bearer token, "anonymous" otherwise. The signature is checked
+    so that a forged token cannot write into another user's key space.
+    """
+    authorization = _header(scope, b"authorization") or ""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return "anonymous"
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return "anonymous"
+    return str(payload.get("sub") or "anonymous")
+
+def _wait_seconds(scope: Scope) -> float:
+    """
+    How long a duplicate may wait for the in-flight original: `Prefer: wait=<seconds>`
+    (RFC 7240), else IDEMPOTENCY_WAIT_SECONDS, capped at IDEMPOTENCY_MAX_WAIT_SECONDS.
+    """
+    wait = settings.IDEMPOTENCY_WAIT_SECONDS
+    for preference in (_header(scope, b"prefer") or "").replace(";", ",").split(","):
+        name, _, value = preference.strip().partition("=")
+        if name.lower() == "wait":
+            try:
+                wait = float(value)
+            except ValueError:
+                pass
+    return max(0.0, min(wait, settings.IDEMPOTENCY_MAX_WAIT_SECONDS))
+
+def _done_channel(idempotency_key: str) -> str:
+    return f"{idempotency_key}:done"
+
+def _json_response(status: int, detail: str) -> tuple:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    return status, headers, body
+
+async def _send_response(send: Send, status: int, headers: list, body: bytes) -> None:
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+def _encode_reply(status: int, headers: list, body: Optional[bytes], fingerprint: str) -> str:
+    """
+    Stored reply: status and headers in clear, body zlib-compressed (base64, since the
+    Redis clients decode responses). `body` is None when it was not kept.
+    """
+    return json.dumps({
+        "fingerprint": fingerprint,
+        "status": status,
+        "headers": [
+            [key.decode("latin-1"), value.decode("latin-1")]
+            for key, value in headers if key.lower() != b"content-length"
+        ],
+        "body": None if body is None else base64.b64encode(zlib.compress(body)).decode("ascii"),
+    })
+
+def _decode_reply(raw: str) -> tuple:
+    data = json.loads(raw)
+    body = b"" if data["body"] is None else zlib.decompress(base64.b64decode(data["body"]))
+    headers = [(key.encode("latin-1"), value.encode("latin-1")) for key, value in data["headers"]]
+    headers.append((b"content-length", str(len(body)).encode()))
+    headers.append((b"idempotent-replayed", b"true"))
+    if data["body"] is None:
+        headers.append((b"idempotent-body-omitted", b"true"))
+    return data["fingerprint"], data["status"], headers, body
+
+class IdempotencyMiddleware:
+    """
+    Replays the stored reply of a modifying request sent again with the same X-Request-ID.
+
+    Keys are scoped by user and route, and the request body is fingerprinted: reusing a
+    key with a different payload is rejected with 422. The response is forwarded as it
+    is produced (streaming responses are never held back); a copy is kept only up to
+    IDEMPOTENCY_MAX_BODY_BYTES and stored compressed if it fits IDEMPOTENCY_MAX_STORED_BYTES.
+    Replies too large to keep are recorded without their body, so the request is still
+    not executed twice.
+
+    A duplicate arriving while the original is in flight waits for its reply (see
+    _wait_seconds) through a pub/sub notification instead of getting an immediate 409.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Every waiter holds a pooled connection for its subscription: bound them
+        self._waiters = asyncio.Semaphore(settings.IDEMPOTENCY_MAX_WAITERS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in MODIFYING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _header(scope, b"x-request-id")
         if not request_id:
-            return await call_next(request)
-
-        # Unique key in Redis
-        idempotency_key = f"idempotency:{request_id}"
-        
-        # Check if we already have a response for this request_id
-        cached_response = redis_client.get(idempotency_key)
-        
-        if cached_response:
-            if cached_response == "processing":
-                # Conflict: request is still being processed
-                return JSONResponse(
-                    status_code=409,
-                    content={"detail": "Request already being processed"}
-                )
-            
-            # Found a cached response, return it
-            data = json.loads(cached_response)
-            return Response(
-                content=data["content"],
-                status_code=data["status_code"],
-                headers=data["headers"],
-                media_type=data["media_type"]
-            )
-
-        # Mark as processing (distributed lock)
-        # Using 60 seconds TTL for processing lock to avoid permanent deadlocks if app crashes
-        if not redis_client.set(idempotency_key, "processing", ex=60, nx=True):
-            return JSONResponse(
-                status_code=409,
-                content={"detail": "Request already being processed"}
-            )
+            await self.app(scope, receive, send)
+            return
 
+        scope_digest = hashlib.sha256(
+            "\n".join((_principal_id(scope), scope["method"], scope["path"], request_id)).encode("utf-8")
+        ).hexdigest()
+        idempotency_key = f"idempotency:{scope_digest}"
+
+        # Read the request body to fingerprint it, then replay it to the app
+        messages: List[Message] = []
+        fingerprint = hashlib.sha256()
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            fingerprint.update(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        fingerprint = fingerprint.hexdigest()
+
+        redis_client = get_async_redis()
+        deadline = asyncio.get_running_loop().time() + _wait_seconds(scope)
+        while True:
+            stored = await redis_client.get(idempotency_key)
+            if stored is None and await redis_client.set(
+                idempotency_key, f"{PROCESSING}:{fingerprint}", ex=PROCESSING_TTL_SECONDS, nx=True
+            ):
+                await self._run(scope, messages, receive, send, idempotency_key, fingerprint)
+                return
+            if stored is None:
+                # Lost the race for the lock: look at the winner's entry
+                stored = await redis_client.get(idempotency_key)
+                if stored is None:
+                    continue
+            if stored == f"{PROCESSING}:{fingerprint}":
+                stored = await self._wait_for_reply(idempotency_key, deadline)
+                if stored is None:
+                    # The original failed and released the key: run this one instead
+                    continue
+            await self._answer_duplicate(send, stored, fingerprint)
+            return
+
+    async def _wait_for_reply(self, idempotency_key: str, deadline: float) -> Optional[str]:
+        """
+        Waits until the in-flight original stores its reply or releases the key, or the
+        deadline passes. Returns the key's latest value.
+        """
+        redis_client = get_async_redis()
+        loop = asyncio.get_running_loop()
+        if deadline <= loop.time() or self._waiters.locked():
+            return await redis_client.get(idempotency_key)
+
+        async with self._waiters:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(_done_channel(idempotency_key))
+                while True:
+                    # Checked after subscribing, so a completion cannot slip in between
+                    stored = await redis_client.get(idempotency_key)
+                    remaining = deadline - loop.time()
+                    if stored is None or not stored.startswith(PROCESSING) or remaining <= 0:
+                        return stored
+                    await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+            finally:
+                await pubsub.unsubscribe()
+                await pubsub.aclose()
+
+    async def _answer_duplicate(self, send: Send, stored: str, fingerprint: str) -> None:
+        if stored.startswith(PROCESSING):
+            if stored != f"{PROCESSING}:{fingerprint}":
+                await _send_response(send, *_json_response(422, "Idempotency key reused with a different request payload"))
+                return
+            await _send_response(send, *_json_response(409, "Request already being processed"))
+            return
+
+        stored_fingerprint, status, headers, body = _decode_reply(stored)
+        if stored_fingerprint != fingerprint:
+            await _send_response(send, *_json_response(422, "Idempotency key reused with a different request payload"))
+            return
+        await _send_response(send, status, headers, body)
+
+    async def _run(
+        self, scope: Scope, messages: List[Message], receive: Receive, send: Send,
+        idempotency_key: str, fingerprint: str
+    ) -> None:
+        pending = list(messages)
+
+        async def replay_receive() -> Message:
+            if pending:
+                return pending.pop(0)
+            return await receive()
+
+        start: dict = {}
+        chunks: List[bytes] = []
+        seen = 0
+        complete = False
+
+        async def capture_send(message: Message) -> None:
+            nonlocal seen, complete
+            if message["type"] == "http.response.start":
+                start.update(status=message["status"], headers=list(message.get("headers", [])))
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                seen += len(body)
+                if seen <= settings.IDEMPOTENCY_MAX_BODY_BYTES:
+                    chunks.append(body)
+                else:
+                    # Too large to keep: stop copying, keep forwarding
+                    chunks.clear()
+                complete = not message.get("more_body", False)
+            await send(message)
+
+        redis_client = get_async_redis()
         try:
-            response = await call_next(request)
-            
-            # Only cache successful or client error responses, maybe not 5xx?
-            # For simplicity, we cache all except 5xx
-            if response.status_code < 500:
-                # We need to read the response body to cache it
-                response_body = [section async for section in response.body_iterator]
-                response.body_iterator = iterate_in_threadpool(iter(response_body))
-                
-                content = b"".join(response_body).decode("utf-8")
-                
-                # Prepare data for caching
-                cache_data = {
-                    "content": content,
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                    "media_type": response.media_type
-                }
-                
-                # Cache for 24 hours
-                redis_client.set(idempotency_key, json.dumps(cache_data), ex=86400)
-            else:
-                # If it failed with 5xx, remove the processing flag so it can be retried
-                redis_client.delete(idempotency_key)
-                
-            return response
-
-        except Exception as e:
-            # On exception, remove the lock so user can retry
-            redis_client.delete(idempotency_key)
-            raise e
+            await self.app(scope, replay_receive, capture_send)
+        except Exception:
+            # On exception, remove the lock so the client can retry
+            await redis_client.delete(idempotency_key)
+            await redis_client.publish(_done_channel(idempotency_key), "failed")
+            raise
+
+        status = start.get("status", 500)
+        if status >= 500 or not complete:
+            # Failed (or aborted) requests are not recorded so they can be retried
+            await redis_client.delete(idempotency_key)
+            await redis_client.publish(_done_channel(idempotency_key), "failed")
+            return
+
+        body = b"".join(chunks) if seen <= settings.IDEMPOTENCY_MAX_BODY_BYTES else None
+        reply = _encode_reply(status, start["headers"], body, fingerprint)
+        if len(reply) > settings.IDEMPOTENCY_MAX_STORED_BYTES:
+            reply = _encode_reply(status, start["headers"], None, fingerprint)
+        await redis_client.set(idempotency_key, reply, ex=REPLY_TTL_SECONDS)
+        # Wake up duplicates waiting for this reply
+        await redis_client.publish(_done_channel(idempotency_key), "done")
@@ -0,0 +1,33 @@
+from enum import IntFlag
+from typing import Dict, Iterable
+
+class Permission(IntFlag):
+    """
+    Capabilities granted by roles. A principal's permissions are the union of its roles',
+    so a check is a single bitwise AND.
+    """
+    NONE = 0
+    VIEW_PUBLISHED_EVENTS = 1 << 0
+    REGISTER = 1 << 1
+    MANAGE_EVENTS = 1 << 2
+    # Act on events and sessions of any organizer, see unpublished events of everyone
+    MANAGE_ANY_EVENT = 1 << 3
+    MANAGE_USERS = 1 << 4
+
+ROLE_PERMISSIONS: Dict[str, Permission] = {
+    "customer": Permission.VIEW_PUBLISHED_EVENTS | Permission.REGISTER,
+    "organizer": Permission.VIEW_PUBLISHED_EVENTS | Permission.REGISTER | Permission.MANAGE_EVENTS,
+    "admin": (
+        Permission.VIEW_PUBLISHED_EVENTS | Permission.REGISTER | Permission.MANAGE_EVENTS
+        | Permission.MANAGE_ANY_EVENT | Permission.MANAGE_USERS
+    ),
+}
+
+def permissions_for(roles: Iterable[str]) -> Permission:
+    """
+    Union of the permissions of the given role names; unknown roles grant nothing.
+    """
+    permissions = Permission.NONE
+    for role in roles:
+        permissions |= ROLE_PERMISSIONS.get(role, Permission.NONE)
+    return permissions
@@ -0,0 +1,221 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet, Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.core import pubsub, token_mirror
+from app.core.config import settings
+from app.core.permissions import Permission, permissions_for
+from app.core.redis import redis_client
+
+# Principal invalidations ("jti <jti>" / "user <user id>"), applied by every worker
+PRINCIPAL_EVENTS_CHANNEL = "auth:principals"
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Immutable snapshot of the authenticated user, enough for authorization checks
+    without touching the users/roles tables.
+    """
+    id: UUID
+    is_active: bool
+    roles: FrozenSet[str]
+    permissions: Permission = field(init=False, compare=False)
+
+    def __post_init__(self):
+        # Resolved once per snapshot; every check afterwards is a bitwise AND
+        object.__setattr__(self, "permissions", permissions_for(self.roles))
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=user.id, is_active=user.is_active, roles=frozenset(role.name for role in user.roles))
+
+    def can(self, permission: Permission) -> bool:
+        return self.permissions & permission == permission
+
+    def dumps(self) -> str:
+        return json.dumps({"id": str(self.id), "is_active": self.is_active, "roles": sorted(self.roles)})
+
+    @classmethod
+    def loads(cls, raw: str) -> "Principal":
+        data = json.loads(raw)
+        return cls(id=UUID(data["id"]), is_active=data["is_active"], roles=frozenset(data["roles"]))
+
+class _TTLCache:
+    """
+    Thread-safe LRU of jti -> (expires_at, Principal).
+    """
+    def __init__(self, maxsize: int):
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+
+    def get(self, jti: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[jti]
+                return None
+            self._entries.move_to_end(jti)
+            return entry[1]
+
+    def set(self, jti: str, principal: Principal, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[jti] = (time.monotonic() + ttl, principal)
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, jti: str) -> None:
+        with self._lock:
+            self._entries.pop(jti, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def pop_user(self, user_id: UUID) -> None:
+        with self._lock:
+            for jti in [jti for jti, (_, principal) in self._entries.items() if principal.id == user_id]:
+                del self._entries[jti]
+
+_local = _TTLCache(settings.PRINCIPAL_CACHE_SIZE)
+
+def _principal_key(jti: str) -> str:
+    return f"principal:{jti}"
+
+def _user_key(user_id) -> str:
+    return f"principal:user:{user_id}"
+
+def _session_state(jti: str, user_id: str, token_generation: int) -> tuple:
+    """
+    Token validity and the shared principal snapshot, in one round trip.
+    """
+    if not settings.PRINCIPAL_CACHE_REDIS:
+        from app.core.redis import is_token_valid
+        return is_token_valid(jti, user_id, token_generation), None
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.exists(f"token:{jti}")
+    pipe.get(f"sessions:{user_id}:generation")
+    pipe.get(_principal_key(jti))
+    exists, current_generation, raw = pipe.execute()
+    return bool(exists) and token_generation >= int(current_generation or 0), raw
+
+def _store(jti: str, principal: Principal) -> None:
+    _local.set(jti, principal, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    if not settings.PRINCIPAL_CACHE_REDIS:
+        return
+    try:
+        pipe = redis_client.pipeline()
+        pipe.set(_principal_key(jti), principal.dumps(), ex=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+        pipe.sadd(_user_key(principal.id), jti)
+        pipe.expire(_user_key(principal.id), settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        pipe.execute()
+    except RedisError:
+        pass
+
+def _shared_principal(jti: str) -> Optional[str]:
+    if not settings.PRINCIPAL_CACHE_REDIS:
+        return None
+    try:
+        return redis_client.get(_principal_key(jti))
+    except RedisError:
+        return None
+
+def resolve_principal(
+    jti: str, user_id: str, token_generation: int, expires_at: float, loader: Callable[[], Principal]
+) -> Optional[Principal]:
+    """
+    Returns the principal of a token session, or None if the session was revoked.
+    Lookup order: in-process LRU, Redis tier, then `loader` (database).
+    While the token mirror is trusted, a known session with a local principal is
+    resolved without any Redis call; invalidations arrive over pub/sub.
+    Otherwise the session check and the Redis tier share one round trip, and the
+    shared snapshot doubles as an invalidation marker: once another worker drops it,
+    local copies are ignored and the user is reloaded.
+    """
+    state = token_mirror.token_state(jti, user_id, token_generation)
+    if state is False:
+        _local.pop(jti)
+        return None
+
+    if state is True:
+        principal = _local.get(jti)
+        if principal is not None:
+            return principal
+        raw = _shared_principal(jti)
+    else:
+        generation = token_mirror.generation()
+        valid, raw = _session_state(jti, user_id, token_generation)
+        token_mirror.remember(jti, valid, expires_at, generation)
+        if not valid:
+            _local.pop(jti)
+            return None
+        principal = _local.get(jti)
+        if settings.PRINCIPAL_CACHE_REDIS and raw is None:
+            principal = None
+        if principal is not None:
+            return principal
+
+    if raw is not None:
+        principal = Principal.loads(raw)
+        _local.set(jti, principal, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+        return principal
+
+    principal = loader()
+    _store(jti, principal)
+    return principal
+
+def _on_invalidation(data: str) -> None:
+    kind, value = data.split(" ", 1)
+    if kind == "jti":
+        _local.pop(value)
+    elif kind == "user":
+        _local.pop_user(UUID(value))
+
+# Invalidations made by other workers; on resubscription some may have been missed
+pubsub.subscribe(PRINCIPAL_EVENTS_CHANNEL, _on_invalidation, on_reset=lambda: _local.clear())
+
+def _broadcast(message: str) -> None:
+    if settings.TOKEN_MIRROR_ENABLED:
+        pubsub.publish(PRINCIPAL_EVENTS_CHANNEL, message)
+
+def invalidate_principal(jti: str) -> None:
+    """
+    Drops the cached principal of one token session (logout).
+    """
+    _local.pop(jti)
+    _broadcast(f"jti {jti}")
+    if settings.PRINCIPAL_CACHE_REDIS:
+        try:
+            redis_client.delete(_principal_key(jti))
+        except RedisError:
+            pass
+
+def invalidate_user_principals(user_id: UUID) -> None:
+    """
+    Drops the cached principals of every session of a user, after their roles
+    or status changed or the user was deleted.
+    """
+    _local.pop_user(user_id)
+    _broadcast(f"user {user_id}")
+    if not settings.PRINCIPAL_CACHE_REDIS:
+        return
+    try:
+        jtis = redis_client.smembers(_user_key(user_id))
+        pipe = redis_client.pipeline()
+        for jti in jtis:
+            pipe.delete(_principal_key(jti))
+        pipe.delete(_user_key(user_id))
+        pipe.execute()
+    except RedisError:
+        pass
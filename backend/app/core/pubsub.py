@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from redis.exceptions import RedisError
+
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# One listener thread and one subscribed connection per process, shared by every
+# in-process mirror of Redis state. Handlers run on the listener thread and must be quick.
+_handlers: Dict[str, List[Callable[[str], None]]] = {}
+_reset_callbacks: List[Callable[[], None]] = []
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+_state_lock = threading.Lock()
+_connected = False
+_last_seen = 0.0
+
+def subscribe(channel: str, handler: Callable[[str], None], on_reset: Optional[Callable[[], None]] = None) -> None:
+    """
+    Registers a handler for messages on `channel`. `on_reset` is called whenever the
+    listener (re)subscribes, since messages published while disconnected are lost.
+    Must be called before start().
+    """
+    _handlers.setdefault(channel, []).append(handler)
+    if on_reset is not None:
+        _reset_callbacks.append(on_reset)
+
+def publish(channel: str, message: str) -> None:
+    try:
+        redis_client.publish(channel, message)
+    except RedisError:
+        logger.warning("Could not publish on %s", channel)
+
+def is_healthy(max_staleness: float) -> bool:
+    """
+    True while the subscription is up and was heard from within `max_staleness` seconds:
+    any change published earlier than that has been delivered to the handlers.
+    """
+    with _state_lock:
+        return _connected and time.monotonic() - _last_seen <= max_staleness
+
+def _mark(connected: bool) -> None:
+    global _connected, _last_seen
+    with _state_lock:
+        _connected = connected
+        _last_seen = time.monotonic()
+
+def _dispatch(channel: str, data: str) -> None:
+    for handler in _handlers.get(channel, ()):
+        try:
+            handler(data)
+        except Exception:
+            logger.exception("Pub/sub handler failed for %s", channel)
+
+def _listen(ping_interval: float) -> None:
+    while not _stop.is_set():
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(*_handlers)
+            # Whatever was published while we were not subscribed is lost
+            for callback in _reset_callbacks:
+                callback()
+            _mark(True)
+            next_ping = 0.0
+            while not _stop.is_set():
+                now = time.monotonic()
+                if now >= next_ping:
+                    # The pong proves the subscribed connection is still delivering
+                    pubsub.ping()
+                    next_ping = now + ping_interval
+                message = pubsub.get_message(timeout=ping_interval)
+                if message is None:
+                    continue
+                _mark(True)
+                if message["type"] in ("message", "pmessage"):
+                    _dispatch(message["channel"], message["data"])
+        except RedisError:
+            _mark(False)
+            logger.warning("Pub/sub listener lost its Redis connection, reconnecting")
+            _stop.wait(1)
+        finally:
+            _mark(False)
+            try:
+                pubsub.close()
+            except RedisError:
+                pass
+
+def start(ping_interval: float) -> None:
+    """
+    Starts the listener thread. Called from the app lifespan.
+    """
+    global _thread
+    if _thread is not None or not _handlers:
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_listen, args=(ping_interval,), name="redis-pubsub", daemon=True)
+    _thread.start()
+
+def stop() -> None:
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
+        _thread = None
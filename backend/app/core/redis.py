@@ -1,22 +1,286 @@
+import hashlib
+import json
+import secrets
+import time
+from typing import List, Optional
 from redis import Redis
+from redis import asyncio as aioredis
 from app.core.config import settings
 
+# Sync client: used from threadpool code (sync endpoints and dependencies, workers, scripts)
 redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
 
+# Async client for code running on the event loop (middleware, async endpoints).
+# Created and closed by the app lifespan; the blocking pool makes bursts wait for a
+# free connection (up to REDIS_ASYNC_POOL_TIMEOUT) instead of opening unbounded ones.
+async_redis_client: Optional[aioredis.Redis] = None
+
+async def init_async_redis() -> None:
+    global async_redis_client
+    pool = aioredis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        max_connections=settings.REDIS_ASYNC_MAX_CONNECTIONS,
+        timeout=settings.REDIS_ASYNC_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_keepalive=True,
+        health_check_interval=30,
+    )
+    async_redis_client = aioredis.Redis(connection_pool=pool)
+
+async def close_async_redis() -> None:
+    global async_redis_client
+    if async_redis_client is not None:
+        await async_redis_client.aclose()
+        await async_redis_client.connection_pool.disconnect()
+        async_redis_client = None
+
+def get_async_redis() -> aioredis.Redis:
+    if async_redis_client is None:
+        raise RuntimeError("Async Redis client is not initialized")
+    return async_redis_client
+
+# Change stream of token sessions, mirrored in memory by every worker (app.core.token_mirror)
+TOKEN_EVENTS_CHANNEL = "auth:tokens"
+
 def set_token_session(jti: str, user_id: str, expires_in_seconds: int):
     """
-    Store JTI in Redis with user identity and TTL
+    Store JTI in Redis with user identity and TTL, and announce it to the workers
     """
-    redis_client.setex(f"token:{jti}", expires_in_seconds, user_id)
+    pipe = redis_client.pipeline()
+    pipe.setex(f"token:{jti}", expires_in_seconds, user_id)
+    pipe.publish(TOKEN_EVENTS_CHANNEL, f"login {jti} {time.time() + expires_in_seconds}")
+    pipe.execute()
+
+def _generation_key(user_id) -> str:
+    return f"sessions:{user_id}:generation"
+
+def _sessions_key(user_id) -> str:
+    return f"sessions:{user_id}"
 
-def is_token_valid(jti: str) -> bool:
+def session_generation(user_id) -> int:
     """
-    Check if JTI exists in Redis
+    Current session generation of a user, embedded in the tokens issued to them
     """
-    return redis_client.exists(f"token:{jti}") > 0
+    return int(redis_client.get(_generation_key(user_id)) or 0)
+
+def _is_current(exists: int, current_generation: Optional[str], generation: int) -> bool:
+    return exists > 0 and generation >= int(current_generation or 0)
+
+def is_token_valid(jti: str, user_id: str, generation: int = 0) -> bool:
+    """
+    Check if JTI exists in Redis and was issued after the user's last "log out everywhere"
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.exists(f"token:{jti}")
+    pipe.get(_generation_key(user_id))
+    return _is_current(*pipe.execute(), generation)
 
 def remove_token_session(jti: str):
     """
-    Remove JTI from Redis (Logout)
+    Remove JTI from Redis (Logout), and announce the revocation to the workers
+    """
+    pipe = redis_client.pipeline()
+    pipe.delete(f"token:{jti}")
+    pipe.publish(TOKEN_EVENTS_CHANNEL, f"logout {jti}")
+    pipe.execute()
+
+async def set_token_session_async(jti: str, user_id: str, expires_in_seconds: int):
+    """
+    Async variant of set_token_session
+    """
+    async with get_async_redis().pipeline() as pipe:
+        pipe.setex(f"token:{jti}", expires_in_seconds, user_id)
+        pipe.publish(TOKEN_EVENTS_CHANNEL, f"login {jti} {time.time() + expires_in_seconds}")
+        await pipe.execute()
+
+async def is_token_valid_async(jti: str, user_id: str, generation: int = 0) -> bool:
+    """
+    Async variant of is_token_valid
+    """
+    async with get_async_redis().pipeline(transaction=False) as pipe:
+        pipe.exists(f"token:{jti}")
+        pipe.get(_generation_key(user_id))
+        return _is_current(*await pipe.execute(), generation)
+
+async def remove_token_session_async(jti: str):
+    """
+    Async variant of remove_token_session
+    """
+    async with get_async_redis().pipeline() as pipe:
+        pipe.delete(f"token:{jti}")
+        pipe.publish(TOKEN_EVENTS_CHANNEL, f"logout {jti}")
+        await pipe.execute()
+
+# Refresh tokens. Each login starts a token family: the set refresh_family:<id> lists the
+# keys of every refresh token and access token session issued from it, and expires with
+# the family (REFRESH_TOKEN_EXPIRE_DAYS after login; rotation does not extend it).
+# A refresh token is stored as refresh:<sha256> -> {"user_id", "family", "generation", "used"};
+# using it marks it used and issues the next one. Presenting a used token again means it
+# leaked, so the whole family is revoked.
+#
+# Per user, sessions:<user id> maps each live family to {"created_at", "expires_at"} for
+# listing, and sessions:<user id>:generation counts "log out everywhere" requests. Tokens
+# carry the generation they were issued in (the "gen" claim); bumping the counter revokes
+# all of them at once, without visiting their keys.
+
+# KEYS[1] refresh token; returns false, {"reused", family, user id} or
+# {"rotated", family, user id, generation}
+_CLAIM_REFRESH_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then return false end
+local token = cjson.decode(raw)
+if redis.call('EXISTS', 'refresh_family:' .. token['family']) == 0 then return false end
+local generation = tonumber(redis.call('GET', 'sessions:' .. token['user_id'] .. ':generation') or '0')
+if (token['generation'] or 0) < generation then return false end
+if token['used'] then return {'reused', token['family'], token['user_id']} end
+token['used'] = true
+redis.call('SET', KEYS[1], cjson.encode(token), 'KEEPTTL')
+return {'rotated', token['family'], token['user_id'], generation}
+"""
+
+# KEYS[1] family, KEYS[2] refresh token, KEYS[3] access token session, KEYS[4] user sessions;
+# ARGV[1] refresh token entry, ARGV[2] user id, ARGV[3] access token TTL,
+# ARGV[4] family TTL when starting a family (0 to extend an existing one),
+# ARGV[5] channel, ARGV[6] login message, ARGV[7] family id, ARGV[8] session entry
+_ATTACH_SCRIPT = """
+local ttl = tonumber(ARGV[4])
+if ttl == 0 then
+  ttl = redis.call('TTL', KEYS[1])
+  if ttl <= 0 then return 0 end
+else
+  redis.call('HSET', KEYS[4], ARGV[7], ARGV[8])
+  if redis.call('TTL', KEYS[4]) < ttl then redis.call('EXPIRE', KEYS[4], ttl) end
+end
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ttl)
+redis.call('SET', KEYS[3], ARGV[2], 'EX', ARGV[3])
+redis.call('SADD', KEYS[1], KEYS[2], KEYS[3])
+redis.call('EXPIRE', KEYS[1], ttl)
+redis.call('PUBLISH', ARGV[5], ARGV[6])
+return 1
+"""
+
+# KEYS[1] family, KEYS[2] user sessions; ARGV[1] channel, ARGV[2] family id.
+# Deletes every member and announces the access token logouts. Families not listed
+# for the user (someone else's, or already revoked) are left alone.
+_REVOKE_FAMILY_SCRIPT = """
+if redis.call('HEXISTS', KEYS[2], ARGV[2]) == 0 then return 0 end
+local members = redis.call('SMEMBERS', KEYS[1])
+for _, key in ipairs(members) do
+  redis.call('DEL', key)
+  if string.sub(key, 1, 6) == 'token:' then
+    redis.call('PUBLISH', ARGV[1], 'logout ' .. string.sub(key, 7))
+  end
+end
+redis.call('DEL', KEYS[1])
+redis.call('HDEL', KEYS[2], ARGV[2])
+return #members
+"""
+
+# KEYS[1] generation, KEYS[2] user sessions; ARGV[1] channel, ARGV[2] user id
+_REVOKE_USER_SCRIPT = """
+local generation = redis.call('INCR', KEYS[1])
+redis.call('DEL', KEYS[2])
+redis.call('PUBLISH', ARGV[1], 'revoke ' .. ARGV[2] .. ' ' .. generation)
+return generation
+"""
+
+def _refresh_key(refresh_token: str) -> str:
+    # Only a digest is stored: a Redis dump does not hand out usable tokens
+    return f"refresh:{hashlib.sha256(refresh_token.encode('utf-8')).hexdigest()}"
+
+def _family_key(family_id: str) -> str:
+    return f"refresh_family:{family_id}"
+
+def _attach_args(
+    family_id: str, jti: str, user_id: str, generation: int, access_expires_in: int, family_ttl: int
+) -> tuple:
+    refresh_token = secrets.token_urlsafe(32)
+    now = time.time()
+    keys = [_family_key(family_id), _refresh_key(refresh_token), f"token:{jti}", _sessions_key(user_id)]
+    args = [
+        json.dumps({"user_id": user_id, "family": family_id, "generation": generation, "used": False}),
+        user_id,
+        access_expires_in,
+        family_ttl,
+        TOKEN_EVENTS_CHANNEL,
+        f"login {jti} {now + access_expires_in}",
+        family_id,
+        json.dumps({"created_at": now, "expires_at": now + family_ttl}),
+    ]
+    return refresh_token, keys, args
+
+def start_token_family(family_id: str, jti: str, user_id: str, generation: int, access_expires_in: int) -> str:
+    """
+    Stores the session of a freshly logged-in access token together with a new token
+    family, and returns the family's first refresh token
+    """
+    refresh_token, keys, args = _attach_args(
+        family_id, jti, user_id, generation, access_expires_in, settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    )
+    redis_client.register_script(_ATTACH_SCRIPT)(keys=keys, args=args)
+    return refresh_token
+
+async def claim_refresh_token_async(refresh_token: str) -> Optional[tuple]:
+    """
+    Atomically marks a refresh token used. Returns ("rotated", family, user id, generation)
+    when it was current, ("reused", family, user id) when it had already been used, None
+    when unknown, expired or revoked
+    """
+    result = await get_async_redis().register_script(_CLAIM_REFRESH_SCRIPT)(keys=[_refresh_key(refresh_token)])
+    if not result:
+        return None
+    if result[0] == "rotated":
+        return result[0], result[1], result[2], int(result[3])
+    return tuple(result)
+
+async def extend_token_family_async(
+    family_id: str, jti: str, user_id: str, generation: int, access_expires_in: int
+) -> Optional[str]:
+    """
+    Stores the session of a refreshed access token in its family and returns the next
+    refresh token, or None if the family was revoked or expired meanwhile
+    """
+    refresh_token, keys, args = _attach_args(family_id, jti, user_id, generation, access_expires_in, 0)
+    attached = await get_async_redis().register_script(_ATTACH_SCRIPT)(keys=keys, args=args)
+    return refresh_token if attached else None
+
+async def revoke_token_family_async(family_id: str, user_id: str) -> int:
+    """
+    Revokes every refresh token and access token session of a user's family.
+    Returns 0 if the family is not one of the user's live sessions
+    """
+    return await get_async_redis().register_script(_REVOKE_FAMILY_SCRIPT)(
+        keys=[_family_key(family_id), _sessions_key(user_id)], args=[TOKEN_EVENTS_CHANNEL, family_id]
+    )
+
+def revoke_token_family(family_id: str, user_id: str) -> int:
+    """
+    Sync variant of revoke_token_family_async
+    """
+    return redis_client.register_script(_REVOKE_FAMILY_SCRIPT)(
+        keys=[_family_key(family_id), _sessions_key(user_id)], args=[TOKEN_EVENTS_CHANNEL, family_id]
+    )
+
+def revoke_user_sessions(user_id) -> int:
+    """
+    Logs a user out everywhere in one round trip: bumps their generation, which
+    invalidates every access and refresh token issued so far, and drops the session list.
+    Returns the new generation
+    """
+    return int(redis_client.register_script(_REVOKE_USER_SCRIPT)(
+        keys=[_generation_key(user_id), _sessions_key(user_id)], args=[TOKEN_EVENTS_CHANNEL, str(user_id)]
+    ))
+
+def list_user_sessions(user_id) -> List[dict]:
+    """
+    Live logins of a user (one per token family), oldest first
     """
-    redis_client.delete(f"token:{jti}")
+    now = time.time()
+    sessions = []
+    for family_id, raw in redis_client.hgetall(_sessions_key(user_id)).items():
+        entry = json.loads(raw)
+        if entry["expires_at"] > now:
+            sessions.append({"id": family_id, **entry})
+    return sorted(sessions, key=lambda session: session["created_at"])
@@ -1,28 +1,29 @@
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Union, Tuple, Optional
+from typing import Any, Dict, Union, Tuple, Optional
 from jose import jwt
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from app.core.config import settings
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.hashing import pwd_context, hash_password, verify_and_update
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
 
-def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> Tuple[str, str]:
+def create_access_token(
+    subject: Union[str, Any], expires_delta: Optional[timedelta] = None, claims: Optional[Dict[str, Any]] = None
+) -> Tuple[str, str]:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     jti = str(uuid.uuid4())
-    to_encode = {"exp": expire, "sub": str(subject), "jti": jti}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject), "jti": jti}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt, jti
 
+# bcrypt runs in the hashing process pool (app.core.hashing)
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return verify_and_update(plain_password, hashed_password)[0]
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hash_password(password)
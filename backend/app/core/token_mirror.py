@@ -0,0 +1,95 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core import pubsub
+from app.core.config import settings
+from app.core.redis import TOKEN_EVENTS_CHANNEL
+
+# Local mirror of token sessions: jti -> unix time until which the answer holds.
+# Revocations win over validations, so a late EXISTS answer cannot resurrect a
+# token whose logout was already received.
+_valid: Dict[str, float] = {}
+_revoked: Dict[str, float] = {}
+_lock = threading.Lock()
+# "Log out everywhere": user id -> (generation, unix time until which it matters).
+# Tokens of that user issued in an older generation are revoked.
+_generations: Dict[str, Tuple[int, float]] = {}
+# Bumped on every resubscription: answers fetched before it may predate a lost message
+_generation = 0
+
+def _prune(entries: Dict[str, float], now: float) -> None:
+    for jti in [jti for jti, until in entries.items() if until <= now]:
+        del entries[jti]
+
+def _on_message(data: str) -> None:
+    parts = data.split()
+    now = time.time()
+    with _lock:
+        if parts[0] == "login":
+            if parts[1] not in _revoked:
+                _valid[parts[1]] = float(parts[2])
+        elif parts[0] == "logout":
+            _valid.pop(parts[1], None)
+            # Long enough to outlive any token that could still be presented
+            _revoked[parts[1]] = now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        elif parts[0] == "revoke":
+            revoked_below = int(parts[2])
+            if revoked_below > _generations.get(parts[1], (0, 0))[0]:
+                _generations[parts[1]] = (revoked_below, now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        # Expired entries are dropped as changes come in, keeping the mirror bounded
+        if len(_valid) + len(_revoked) > settings.TOKEN_MIRROR_PRUNE_THRESHOLD:
+            _prune(_valid, now)
+            _prune(_revoked, now)
+            for user_id in [user_id for user_id, (_, until) in _generations.items() if until <= now]:
+                del _generations[user_id]
+
+def _on_reset() -> None:
+    global _generation
+    with _lock:
+        # Logouts may have been missed; revocations already known stay valid
+        _valid.clear()
+        _generation += 1
+
+pubsub.subscribe(TOKEN_EVENTS_CHANNEL, _on_message, on_reset=_on_reset)
+
+def is_trusted() -> bool:
+    return settings.TOKEN_MIRROR_ENABLED and pubsub.is_healthy(settings.TOKEN_MIRROR_MAX_STALENESS_SECONDS)
+
+def token_state(jti: str, user_id: str, token_generation: int = 0) -> Optional[bool]:
+    """
+    True/False when the mirror knows the session, None when Redis must be asked
+    (unknown token, or change stream not heard from within the staleness bound).
+    """
+    if not is_trusted():
+        return None
+    now = time.time()
+    with _lock:
+        if _revoked.get(jti, 0) > now:
+            return False
+        revoked_below, until = _generations.get(user_id, (0, 0))
+        if token_generation < revoked_below and until > now:
+            return False
+        if _valid.get(jti, 0) > now:
+            return True
+    return None
+
+def generation() -> int:
+    """
+    Snapshot to pass to remember() along with the answer fetched from Redis.
+    """
+    return _generation
+
+def remember(jti: str, valid: bool, until: float, fetched_at_generation: int) -> None:
+    """
+    Records the answer of a Redis lookup, unless the listener resubscribed meanwhile.
+    """
+    with _lock:
+        if fetched_at_generation != _generation:
+            return
+        if valid:
+            if jti not in _revoked:
+                _valid[jti] = until
+        else:
+            _valid.pop(jti, None)
+            _revoked[jti] = until
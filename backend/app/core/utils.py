@@ -1,10 +1,15 @@
+import json
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Iterator, NamedTuple, Optional, List
 from uuid import UUID
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, cast
+from sqlalchemy import String, and_, or_, cast, func, literal, select, union_all
 from sqlalchemy.dialects.postgresql import TSTZRANGE
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from psycopg2.extras import DateTimeTZRange
 
 from app.models.events import Event, Session as SessionModel
@@ -48,53 +53,137 @@ def validate_event_dates(start_time: datetime, end_time: datetime) -> None:
             detail="Events must start and end on the same day"
         )
 
-def check_schedule_overlap(
+class ScheduleConflict(NamedTuple):
+    id: UUID
+    kind: str  # "event" or "session"
+    title: str
+    start: datetime
+    end: datetime
+
+def find_schedule_conflicts(
     db: Session,
     space_id: UUID,
     start_time: datetime,
     end_time: datetime,
     exclude_event_id: Optional[UUID] = None,
     exclude_session_id: Optional[UUID] = None
-) -> None:
+) -> List[ScheduleConflict]:
     """
-    Checks if the given time range overlaps with any existing Event or Session in the same Space.
-    Raises HTTPException if overlap is found.
+    Returns every Event and Session of the Space whose time range overlaps the given one,
+    in start order. Both tables are searched in a single UNION ALL query.
     """
-    # Create Postgres Range for comparison
-    # bounds='[]' means inclusive, but [) is clearer for time ranges. 
-    # psycopg2 DateTimeTZRange usually defaults to '[)'
+    # Same inclusive bounds as the ranges stored by the endpoints
     new_range = DateTimeTZRange(start_time, end_time, '[]')
 
-    # 1. Check overlaps with Events
-    event_query = db.query(Event).filter(
+    events = select(
+        Event.id, literal("event", String).label("kind"), Event.title, Event.time_range
+    ).where(
         Event.space_id == space_id,
         Event.time_range.op("&&")(new_range),
         Event.status != "cancelled" # Ignore cancelled events
     )
-    
     if exclude_event_id:
-        event_query = event_query.filter(Event.id != exclude_event_id)
+        events = events.where(Event.id != exclude_event_id)
 
-    overlapping_event = event_query.first()
-    if overlapping_event:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Time overlaps with existing event: {overlapping_event.title}"
-        )
-
-    # 2. Check overlaps with Sessions
-    session_query = db.query(SessionModel).filter(
+    sessions = select(
+        SessionModel.id, literal("session", String).label("kind"), SessionModel.title, SessionModel.time_range
+    ).where(
         SessionModel.space_id == space_id,
         SessionModel.time_range.op("&&")(new_range),
         SessionModel.status != "cancelled"
     )
-
     if exclude_session_id:
-        session_query = session_query.filter(SessionModel.id != exclude_session_id)
+        sessions = sessions.where(SessionModel.id != exclude_session_id)
 
-    overlapping_session = session_query.first()
-    if overlapping_session:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Time overlaps with existing session: {overlapping_session.title}"
-        )
+    conflicts = union_all(events, sessions).subquery()
+    rows = db.execute(
+        select(conflicts).order_by(func.lower(conflicts.c.time_range), conflicts.c.id)
+    ).all()
+    return [
+        ScheduleConflict(row.id, row.kind, row.title, row.time_range.lower, row.time_range.upper)
+        for row in rows
+    ]
+
+def _overlap_error(conflicts: List[ScheduleConflict]) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="; ".join(f"Time overlaps with existing {c.kind}: {c.title}" for c in conflicts)
+    )
+
+def check_schedule_overlap(
+    db: Session,
+    space_id: UUID,
+    start_time: datetime,
+    end_time: datetime,
+    exclude_event_id: Optional[UUID] = None,
+    exclude_session_id: Optional[UUID] = None
+) -> None:
+    """
+    Checks if the given time range overlaps with any existing Event or Session in the same Space.
+    Raises HTTPException listing every overlapping item if overlap is found.
+    """
+    conflicts = find_schedule_conflicts(
+        db, space_id, start_time, end_time, exclude_event_id, exclude_session_id
+    )
+    if conflicts:
+        raise _overlap_error(conflicts)
+
+# Exclusion constraints rejecting two bookings of a space at the same time
+OVERLAP_CONSTRAINTS = frozenset({"ex_events_no_overlap", "ex_sessions_no_overlap", "ex_space_bookings_no_overlap"})
+
+def is_overlap_violation(error: IntegrityError) -> bool:
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None) in OVERLAP_CONSTRAINTS
+
+@contextmanager
+def overlap_as_bad_request(
+    db: Session,
+    space_id: Optional[UUID],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    exclude_event_id: Optional[UUID] = None,
+    exclude_session_id: Optional[UUID] = None
+) -> Iterator[None]:
+    """
+    Optimistic scheduling: wrap the flush/commit of an event or session and let the
+    exclusion constraints detect double bookings. A violation is rolled back and
+    turned into the same 400 as check_schedule_overlap, listing the conflicts.
+    """
+    try:
+        yield
+    except IntegrityError as error:
+        if not is_overlap_violation(error):
+            raise
+        db.rollback()
+        conflicts = []
+        if space_id and start_time and end_time:
+            conflicts = find_schedule_conflicts(
+                db, space_id, start_time, end_time, exclude_event_id, exclude_session_id
+            )
+        if not conflicts:
+            # The conflicting item is cancelled (still held by the per-table constraint)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Time overlaps with an existing event or session in this space"
+            ) from None
+        raise _overlap_error(conflicts) from None
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+def estimate_row_count(db: Session, query) -> int:
+    """
+    Returns the planner's row estimate for a query without executing it.
+    Much cheaper than COUNT(*) on large tables, accuracy depends on ANALYZE statistics.
+    """
+    plan = db.execute(_Explain(query.statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
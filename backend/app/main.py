@@ -1,8 +1,47 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import logging
+from starlette.concurrency import run_in_threadpool
+from app.core import hashing, pubsub
+from app.core.redis import init_async_redis, close_async_redis
 from app.core.config import settings
+from app.services import registration_worker, waitlist
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Async Redis pool used by the middleware and async endpoints
+    await init_async_redis()
+    # Shared Redis pub/sub listener feeding the token and principal mirrors and the space index
+    max_staleness = [
+        seconds for enabled, seconds in (
+            (settings.TOKEN_MIRROR_ENABLED, settings.TOKEN_MIRROR_MAX_STALENESS_SECONDS),
+            (settings.SPACE_INDEX_ENABLED, settings.SPACE_INDEX_MAX_STALENESS_SECONDS),
+        ) if enabled
+    ]
+    if max_staleness:
+        pubsub.start(ping_interval=min(max_staleness) / 2)
+    # Persists high-demand seat claims in batches
+    await registration_worker.start()
+    # Confirms waitlisted registrations when seats free up
+    await waitlist.start()
+    # Pre-render the most requested event pages; a cold cache must not block startup
+    from app.api.v1.endpoints.events import warm_event_cache
+    try:
+        await run_in_threadpool(warm_event_cache)
+    except Exception:
+        logger.warning("Could not warm the event response cache", exc_info=True)
+    yield
+    await waitlist.stop()
+    await registration_worker.stop()
+    pubsub.stop()
+    await close_async_redis()
+    await run_in_threadpool(hashing.shutdown)
 
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     description="Backend API for TusTados Project, integrated with Postgres, Redis, and RabbitMQ.",
     version="1.0.0",
@@ -32,7 +71,7 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok", "project": settings.PROJECT_NAME}
+    return {"status": "ok", "project": settings.PROJECT_NAME, "password_hashing": hashing.hashing_metrics()}
 
 @app.get("/")
 def root():
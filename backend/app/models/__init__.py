@@ -1,4 +1,4 @@
 from app.models.users import User, Role, UserRole
 from app.models.venues import Venue, Space
-from app.models.events import Event, Session, Registration, EventStatus, RegistrationStatus
+from app.models.events import Event, Session, Registration, SpaceBooking, EventStatus, RegistrationStatus
 from app.models.activity import ActivityLog, LogEntity
@@ -3,8 +3,9 @@ from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
-from sqlalchemy import String, Boolean, ForeignKey, Integer, Text, DateTime, CheckConstraint, Index
-from sqlalchemy.dialects.postgresql import UUID, TSTZRANGE, ENUM
+from sqlalchemy import String, Boolean, ForeignKey, Integer, Text, DateTime, CheckConstraint, Index, Computed, DDL, text, literal_column
+from sqlalchemy import event as sa_event
+from sqlalchemy.dialects.postgresql import UUID, TSTZRANGE, ENUM, TSVECTOR
 from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -12,6 +13,15 @@ from app.core.database import Base
 from app.models.users import User
 from app.models.venues import Space
 
+# Listing sort key: start of the event's time_range, unscheduled events last.
+# Kept in sync with the composite indexes declared on Event so keyset pagination
+# (ORDER BY start, id / WHERE (start, id) > cursor) is served by an index scan.
+EVENT_START_SQL = "coalesce(lower(time_range), 'infinity'::timestamptz)"
+
+# Text search configuration used both for the generated search_vector and for queries.
+# 'simple' avoids language-specific stemming since titles mix Spanish and English.
+SEARCH_CONFIG = "simple"
+
 class EventStatus(str, Enum):
     DRAFT = "draft"
     PUBLISHED = "published"
@@ -24,6 +34,9 @@ class RegistrationStatus(str, Enum):
     CANCELLED = "cancelled"
     WAITLIST = "waitlist"
 
+# Registration statuses that occupy a seat and are tracked by registered_count
+SEAT_HOLDING_STATUSES = (RegistrationStatus.PENDING.value, RegistrationStatus.CONFIRMED.value)
+
 class Event(Base):
     __tablename__ = "events"
 
@@ -51,6 +64,20 @@ class Event(Base):
     )
     time_range: Mapped[Optional[object]] = mapped_column(TSTZRANGE) # Python type for Range is tricky, usually handled as object or specialized type
     capacity: Mapped[Optional[int]] = mapped_column(Integer)
+    # Denormalized count of seat-holding registrations, see app.services.registrations
+    registered_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # Flash-sale mode: seats are claimed in Redis and persisted asynchronously
+    high_demand: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
+    # Title weighted above description; maintained by Postgres, never written by the app
+    search_vector: Mapped[Optional[object]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True
+        ),
+        deferred=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
         server_default=func.now(), 
@@ -74,6 +101,7 @@ class Event(Base):
             "(time_range IS NULL AND space_id IS NULL) OR (time_range IS NOT NULL AND space_id IS NOT NULL)",
             name="chk_event_space_time"
         ),
+        CheckConstraint("registered_count >= 0", name="chk_event_registered_count"),
         ExcludeConstraint(
             ("space_id", "="),
             ("time_range", "&&"),
@@ -83,8 +111,26 @@ class Event(Base):
         Index("idx_events_organizer_id", "organizer_id"),
         Index("idx_events_status", "status"),
         Index("idx_events_time_range", "time_range", postgresql_using="gist"),
+        Index("idx_events_start_id", text(EVENT_START_SQL), "id"),
+        Index("idx_events_organizer_start_id", "organizer_id", text(EVENT_START_SQL), "id"),
+        Index("idx_events_status_start_id", "status", text(EVENT_START_SQL), "id"),
+        Index("idx_events_search", "search_vector", postgresql_using="gin"),
+        Index("idx_events_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
     )
 
+# gin_trgm_ops (typo-tolerant title search) requires pg_trgm
+sa_event.listen(
+    Event.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
+
+def event_start_key():
+    """
+    SQL expression matching EVENT_START_SQL, usable in ORDER BY and keyset filters.
+    """
+    return func.coalesce(func.lower(Event.time_range), literal_column("'infinity'::timestamptz"))
+
 class Session(Base):
     __tablename__ = "sessions"
 
@@ -117,6 +163,7 @@ class Session(Base):
     )
     time_range: Mapped[object] = mapped_column(TSTZRANGE, nullable=False)
     capacity: Mapped[Optional[int]] = mapped_column(Integer)
+    registered_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
         server_default=func.now(), 
@@ -141,8 +188,11 @@ class Session(Base):
             ("time_range", "&&"),
             name="ex_sessions_no_overlap"
         ),
+        CheckConstraint("registered_count >= 0", name="chk_session_registered_count"),
         Index("idx_sessions_event_id", "event_id"),
         Index("idx_sessions_space_time", "space_id", "time_range", postgresql_using="gist"),
+        # Calendar windows across every space
+        Index("idx_sessions_time_range", "time_range", postgresql_using="gist"),
         Index("idx_sessions_status", "status"),
     )
 
@@ -198,4 +248,105 @@ class Registration(Base):
         Index("ux_reg_user_event", "user_id", "event_id", unique=True, postgresql_where=(event_id != None)),
         Index("ux_reg_user_session", "user_id", "session_id", unique=True, postgresql_where=(session_id != None)),
         Index("idx_reg_status", "status"),
+        # FIFO scan of an event's waitlist by the promoter
+        Index(
+            "idx_reg_event_waitlist", "event_id", "created_at", "id",
+            postgresql_where=text("status = 'waitlist'")
+        ),
+    )
+
+class SpaceBooking(Base):
+    """
+    Occupancy of a space by a non-cancelled event or session, maintained by triggers
+    on both tables. Its exclusion constraint rejects an event overlapping a session
+    (and vice versa) at insert time, so writes need no conflict pre-check.
+    """
+    __tablename__ = "space_bookings"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), 
+        primary_key=True, 
+        default=uuid.uuid4,
+        server_default=func.uuid_generate_v4()
+    )
+    space_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), 
+        ForeignKey("spaces.id", ondelete="RESTRICT"), 
+        nullable=False
+    )
+    time_range: Mapped[object] = mapped_column(TSTZRANGE, nullable=False)
+    event_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), 
+        ForeignKey("events.id", ondelete="CASCADE")
+    )
+    session_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), 
+        ForeignKey("sessions.id", ondelete="CASCADE")
     )
+
+    __table_args__ = (
+        CheckConstraint(
+            "(event_id IS NOT NULL AND session_id IS NULL) OR (event_id IS NULL AND session_id IS NOT NULL)",
+            name="chk_space_booking_target"
+        ),
+        ExcludeConstraint(
+            ("space_id", "="),
+            ("time_range", "&&"),
+            name="ex_space_bookings_no_overlap"
+        ),
+        Index("ux_space_bookings_event", "event_id", unique=True, postgresql_where=(event_id != None)),
+        Index("ux_space_bookings_session", "session_id", unique=True, postgresql_where=(session_id != None)),
+    )
+
+# Bookings follow the space, time range and status of events and sessions. The triggers
+# only fire when one of those columns changes (not on registered_count updates).
+# Rows already in the tables are backfilled when space_bookings is created.
+SPACE_BOOKING_TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION sync_event_space_booking() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM space_bookings WHERE event_id = NEW.id;
+    IF NEW.space_id IS NOT NULL AND NEW.time_range IS NOT NULL AND NEW.status <> 'cancelled' THEN
+        INSERT INTO space_bookings (space_id, time_range, event_id) VALUES (NEW.space_id, NEW.time_range, NEW.id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_session_space_booking() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM space_bookings WHERE session_id = NEW.id;
+    IF NEW.status <> 'cancelled' THEN
+        INSERT INTO space_bookings (space_id, time_range, session_id) VALUES (NEW.space_id, NEW.time_range, NEW.id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_events_space_booking ON events;
+CREATE TRIGGER trg_events_space_booking
+    AFTER INSERT OR UPDATE OF space_id, time_range, status ON events
+    FOR EACH ROW EXECUTE FUNCTION sync_event_space_booking();
+
+DROP TRIGGER IF EXISTS trg_sessions_space_booking ON sessions;
+CREATE TRIGGER trg_sessions_space_booking
+    AFTER INSERT OR UPDATE OF space_id, time_range, status ON sessions
+    FOR EACH ROW EXECUTE FUNCTION sync_session_space_booking();
+
+INSERT INTO space_bookings (space_id, time_range, event_id)
+    SELECT space_id, time_range, id FROM events
+    WHERE space_id IS NOT NULL AND time_range IS NOT NULL AND status <> 'cancelled';
+INSERT INTO space_bookings (space_id, time_range, session_id)
+    SELECT space_id, time_range, id FROM sessions WHERE status <> 'cancelled';
+"""
+
+# `space_id =` in a GiST exclusion constraint needs btree_gist
+sa_event.listen(
+    SpaceBooking.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist")
+)
+sa_event.listen(
+    SpaceBooking.__table__,
+    "after_create",
+    DDL(SPACE_BOOKING_TRIGGERS_SQL)
+)
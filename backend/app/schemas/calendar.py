@@ -0,0 +1,22 @@
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from pydantic import BaseModel
+
+class CalendarItem(BaseModel):
+    id: UUID
+    # "event" or "session"
+    kind: str
+    title: str
+    start: datetime
+    end: datetime
+    status: str
+    space_id: Optional[UUID] = None
+    # Parent event of a session
+    event_id: Optional[UUID] = None
+
+class CalendarFeed(BaseModel):
+    # Window actually covered: the requested one widened to whole months
+    start: datetime
+    end: datetime
+    items: List[CalendarItem] = []
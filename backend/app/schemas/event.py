@@ -57,6 +57,7 @@ class Session(SessionBase):
     id: UUID
     event_id: Optional[UUID] = None
     organizer_id: UUID
+    registered_count: int = 0
     created_at: datetime
     updated_at: datetime
     if PYDANTIC_V2:
@@ -93,6 +94,7 @@ class EventBase(BaseModel):
     space_id: Optional[UUID] = None
     time_range: Optional[Any] = None
     capacity: Optional[int] = None
+    high_demand: bool = False
 
     if PYDANTIC_V2:
         @field_validator("time_range", mode="before")
@@ -126,10 +128,12 @@ class EventUpdate(BaseModel):
     space_id: Optional[UUID] = None
     time_range: Optional[Any] = None
     capacity: Optional[int] = None
+    high_demand: Optional[bool] = None
 
 class Event(EventBase):
     id: UUID
     organizer_id: UUID
+    registered_count: int = 0
     created_at: datetime
     updated_at: datetime
     sessions: List[Session] = []
@@ -140,9 +144,28 @@ class Event(EventBase):
         class Config:
             orm_mode = True
 
+class EventSummary(EventBase):
+    """
+    Listing projection: registrations are summarized as a count and the nested
+    collections are only present when requested through `include`.
+    Every field but `id` is optional so sparse fieldsets can omit it.
+    """
+    id: UUID
+    title: Optional[str] = None
+    status: Optional[EventStatus] = None
+    high_demand: Optional[bool] = None
+    organizer_id: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    registration_count: Optional[int] = None
+    sessions: Optional[List[Session]] = None
+    registrations: Optional[List[Registration]] = None
+
 class EventPagination(BaseModel):
-    items: List[Event]
-    total: int
+    items: List[EventSummary]
+    total: Optional[int] = None
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
@@ -0,0 +1,30 @@
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from pydantic import BaseModel
+
+class ScheduleValidateRequest(BaseModel):
+    space_id: UUID
+    time_range: List[datetime]
+    # Set when validating an update, so the item does not conflict with itself
+    exclude_event_id: Optional[UUID] = None
+    exclude_session_id: Optional[UUID] = None
+
+class ScheduleConflict(BaseModel):
+    id: UUID
+    kind: str
+    title: str
+    start: datetime
+    end: datetime
+
+class FreeSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+class ScheduleValidation(BaseModel):
+    valid: bool
+    conflicts: List[ScheduleConflict] = []
+    # "index" when answered from the in-process space index, "database" otherwise
+    source: str = "database"
+    # Free slots of the same space and day long enough for the requested duration (index only)
+    suggestions: List[FreeSlot] = []
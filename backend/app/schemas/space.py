@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 import pydantic
 PYDANTIC_V2 = pydantic.VERSION.startswith("2.")
@@ -24,3 +25,12 @@ class Space(SpaceBase):
     else:
         class Config:
             orm_mode = True
+
+class FreeSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+class SpaceAvailability(BaseModel):
+    space_id: UUID
+    name: str
+    slots: List[FreeSlot] = []
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
 from pydantic import BaseModel, EmailStr
@@ -37,3 +38,12 @@ class User(UserBase):
 
     class Config:
         orm_mode = True
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+class UserSession(BaseModel):
+    id: str
+    created_at: datetime
+    expires_at: datetime
+    current: bool = False
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Longest window a single availability request may cover
+MAX_WINDOW = timedelta(days=31)
+
+class FreeSlot(NamedTuple):
+    space_id: UUID
+    space_name: str
+    start: datetime
+    end: datetime
+
+# Free time of each space = the window minus the union of its bookings (PostgreSQL 14+
+# multiranges). Bookings come from space_bookings, which holds every non-cancelled event
+# and session, through the GiST index of its exclusion constraint (space_id, time_range):
+# one range scan per space instead of a query per table.
+# Bookings are inclusive, so a gap has exclusive bounds where it meets one: slots are
+# returned inclusive, one microsecond inside those bounds, and can be booked as-is.
+_FREE_SLOTS_SQL = """
+    SELECT free.space_id, free.space_name, slot.start, slot."end"
+    FROM (
+        SELECT s.id AS space_id, s.name AS space_name,
+               tstzmultirange(tstzrange(:window_start, :window_end))
+                   - coalesce(range_agg(b.time_range), '{{}}'::tstzmultirange) AS free
+        FROM spaces AS s
+        LEFT JOIN space_bookings AS b
+            ON b.space_id = s.id AND b.time_range && tstzrange(:window_start, :window_end)
+        WHERE s.is_active {space_filter}
+        GROUP BY s.id, s.name
+    ) AS free
+    CROSS JOIN LATERAL unnest(free.free) AS gap
+    CROSS JOIN LATERAL (
+        SELECT lower(gap) + CASE WHEN lower_inc(gap) THEN interval '0' ELSE interval '1 microsecond' END AS start,
+               upper(gap) - CASE WHEN upper_inc(gap) THEN interval '0' ELSE interval '1 microsecond' END AS "end"
+    ) AS slot
+    WHERE slot."end" - slot.start >= :min_duration
+    ORDER BY free.space_name, free.space_id, slot.start
+"""
+
+def find_free_slots(
+    db: Session,
+    window_start: datetime,
+    window_end: datetime,
+    min_duration: timedelta = timedelta(0),
+    space_ids: Optional[Iterable[UUID]] = None,
+) -> List[FreeSlot]:
+    """
+    Gaps of at least `min_duration` between the bookings of active spaces within
+    [window_start, window_end), as inclusive slots, in one query for any number of spaces.
+    `space_ids` restricts the search; by default every active space is considered.
+    """
+    params = {"window_start": window_start, "window_end": window_end, "min_duration": min_duration}
+    space_filter = ""
+    if space_ids is not None:
+        space_filter = "AND s.id = ANY(CAST(:space_ids AS uuid[]))"
+        params["space_ids"] = [str(space_id) for space_id in space_ids]
+    rows = db.execute(text(_FREE_SLOTS_SQL.format(space_filter=space_filter)), params)
+    return [FreeSlot(row.space_id, row.space_name, row.start, row.end) for row in rows]
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.events import SEARCH_CONFIG, SEAT_HOLDING_STATUSES
+
+# Longest window a single calendar request may cover, before rounding to whole months
+MAX_WINDOW = timedelta(days=62)
+
+AUDIENCES = ("admin", "organizer", "customer")
+
+class CalendarItem(NamedTuple):
+    id: UUID
+    kind: str
+    title: str
+    start: datetime
+    end: datetime
+    status: str
+    space_id: Optional[UUID]
+    # Parent event of a session
+    event_id: Optional[UUID]
+
+# Visibility per audience, as (events filter, sessions filter), the same rule as the
+# event listing: everything for admins, their own events (and sessions of them) for
+# organizers, published items for customers. Sessions are joined to their parent event
+# `p`: a customer only sees published sessions of published events.
+_VISIBILITY = {
+    "admin": ("TRUE", "TRUE"),
+    "organizer": (
+        "e.organizer_id = :user_id",
+        "(s.organizer_id = :user_id OR p.organizer_id = :user_id)",
+    ),
+    "customer": (
+        "e.status = 'published'",
+        "(s.status = 'published' AND coalesce(p.status = 'published', TRUE))",
+    ),
+}
+
+# `mine`: what the user organizes or holds a seat in (the registration unique indexes
+# start with user_id)
+_MINE = (
+    """(e.organizer_id = :user_id OR EXISTS (
+        SELECT 1 FROM registrations AS r
+        WHERE r.user_id = :user_id AND r.event_id = e.id
+          AND CAST(r.status AS text) = ANY(:holding_statuses)))""",
+    """(s.organizer_id = :user_id OR p.organizer_id = :user_id OR EXISTS (
+        SELECT 1 FROM registrations AS r
+        WHERE r.user_id = :user_id AND (r.session_id = s.id OR r.event_id = s.event_id)
+          AND CAST(r.status AS text) = ANY(:holding_statuses)))""",
+)
+
+# Listing filters: the status of the item; the search matches events like GET /events/?q=
+# and sessions by their own title or their parent event
+_STATUS = ("e.status = CAST(:status AS event_status)", "s.status = CAST(:status AS event_status)")
+_SEARCH = (
+    f"e.search_vector @@ websearch_to_tsquery('{SEARCH_CONFIG}', :q)",
+    f"""(to_tsvector('{SEARCH_CONFIG}', s.title) @@ websearch_to_tsquery('{SEARCH_CONFIG}', :q)
+        OR p.search_vector @@ websearch_to_tsquery('{SEARCH_CONFIG}', :q))""",
+)
+
+# Both branches are range scans on a GiST index of time_range (idx_events_time_range,
+# idx_sessions_time_range), or of (space_id, time_range) when a space is given.
+_CALENDAR_SQL = """
+    SELECT e.id, 'event' AS kind, e.title, lower(e.time_range) AS start, upper(e.time_range) AS "end",
+           CAST(e.status AS text) AS status, e.space_id, NULL::uuid AS event_id
+    FROM events AS e
+    WHERE e.time_range && tstzrange(:window_start, :window_end) AND {event_filter}
+    UNION ALL
+    SELECT s.id, 'session', s.title, lower(s.time_range), upper(s.time_range),
+           CAST(s.status AS text), s.space_id, s.event_id
+    FROM sessions AS s
+    LEFT JOIN events AS p ON p.id = s.event_id
+    WHERE s.time_range && tstzrange(:window_start, :window_end) AND {session_filter}
+    ORDER BY start, id
+"""
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Aware UTC datetime; naive input is taken as UTC.
+    """
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def month_window(window_start: datetime, window_end: datetime) -> Tuple[datetime, datetime]:
+    """
+    [window_start, window_end) widened to whole UTC months, so that every view of a
+    month (day grid, weeks, neighbouring days) maps to the same cacheable window.
+    """
+    start = as_utc(window_start).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end_utc = as_utc(window_end)
+    end = end_utc.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if end < end_utc:
+        end = (end + timedelta(days=32)).replace(day=1)
+    return start, end
+
+def find_calendar_items(
+    db: Session,
+    window_start: datetime,
+    window_end: datetime,
+    audience: str,
+    user_id: Optional[UUID] = None,
+    space_id: Optional[UUID] = None,
+    mine: bool = False,
+    status: Optional[str] = None,
+    q: Optional[str] = None,
+) -> List[CalendarItem]:
+    """
+    Events and sessions overlapping [window_start, window_end) visible to `audience`
+    (one of AUDIENCES), ordered by start, in one query. `status` and `q` filter them
+    like the event listing does.
+    """
+    event_filter, session_filter = _VISIBILITY[audience]
+    params = {"window_start": window_start, "window_end": window_end, "user_id": user_id}
+    if mine:
+        event_filter = f"{event_filter} AND {_MINE[0]}"
+        session_filter = f"{session_filter} AND {_MINE[1]}"
+        params["holding_statuses"] = list(SEAT_HOLDING_STATUSES)
+    if status:
+        event_filter = f"{event_filter} AND {_STATUS[0]}"
+        session_filter = f"{session_filter} AND {_STATUS[1]}"
+        params["status"] = status
+    if q:
+        event_filter = f"{event_filter} AND {_SEARCH[0]}"
+        session_filter = f"{session_filter} AND {_SEARCH[1]}"
+        params["q"] = q
+    if space_id is not None:
+        event_filter = f"{event_filter} AND e.space_id = :space_id"
+        session_filter = f"{session_filter} AND s.space_id = :space_id"
+        params["space_id"] = space_id
+    sql = _CALENDAR_SQL.format(event_filter=event_filter, session_filter=session_filter)
+    return [CalendarItem(*row) for row in db.execute(text(sql), params)]
@@ -0,0 +1,125 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from typing import Any, List
+
+import aio_pika
+
+from app.core.config import settings
+
+class ClaimQueue(ABC):
+    """
+    Queue of accepted high-demand seat claims waiting to be persisted.
+    Subclasses feed received items into self._buffer; batching is shared.
+    """
+    def __init__(self):
+        self._buffer: asyncio.Queue = asyncio.Queue()
+
+    async def connect(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def publish(self, claim: dict) -> None:
+        ...
+
+    def decode(self, item: Any) -> dict:
+        return item
+
+    @abstractmethod
+    async def ack(self, items: List[Any]) -> None:
+        ...
+
+    @abstractmethod
+    async def requeue(self, items: List[Any]) -> None:
+        ...
+
+    async def get_batch(self, max_size: int, max_wait: float) -> List[Any]:
+        """
+        Waits for at least one item, then keeps collecting until the batch is
+        full or max_wait seconds have passed since the first item.
+        """
+        batch = [await self._buffer.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        while len(batch) < max_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._buffer.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+class LocalClaimQueue(ClaimQueue):
+    """
+    In-process stand-in for RabbitClaimQueue, used in tests and single-worker setups.
+    Claims are lost if the process stops before they are persisted.
+    """
+    async def publish(self, claim: dict) -> None:
+        await self._buffer.put(claim)
+
+    async def ack(self, items: List[Any]) -> None:
+        # Nothing to acknowledge: items left the buffer when they were taken
+        pass
+
+    async def requeue(self, items: List[Any]) -> None:
+        for item in items:
+            await self._buffer.put(item)
+
+class RabbitClaimQueue(ClaimQueue):
+    """
+    Durable claim queue on RabbitMQ. Every app process publishes and consumes;
+    messages are acknowledged only once their batch is committed.
+    """
+    def __init__(self, url: str, queue_name: str, prefetch: int):
+        super().__init__()
+        self._url = url
+        self._queue_name = queue_name
+        self._prefetch = prefetch
+        self._connection = None
+        self._channel = None
+
+    async def connect(self) -> None:
+        self._connection = await aio_pika.connect_robust(self._url)
+        self._channel = await self._connection.channel()
+        await self._channel.set_qos(prefetch_count=self._prefetch)
+        queue = await self._channel.declare_queue(self._queue_name, durable=True)
+        await queue.consume(self._buffer.put)
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+
+    async def publish(self, claim: dict) -> None:
+        if self._channel is None:
+            raise ConnectionError("Claim queue is not connected")
+        await self._channel.default_exchange.publish(
+            aio_pika.Message(
+                body=json.dumps(claim).encode("utf-8"),
+                content_type="application/json",
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            ),
+            routing_key=self._queue_name,
+        )
+
+    def decode(self, item: Any) -> dict:
+        return json.loads(item.body)
+
+    async def ack(self, items: List[Any]) -> None:
+        await items[-1].ack(multiple=True)
+
+    async def requeue(self, items: List[Any]) -> None:
+        await items[-1].nack(multiple=True, requeue=True)
+
+def create_claim_queue() -> ClaimQueue:
+    if settings.HIGH_DEMAND_BACKEND == "local":
+        return LocalClaimQueue()
+    return RabbitClaimQueue(
+        settings.RABBITMQ_URL,
+        settings.REGISTRATION_QUEUE_NAME,
+        prefetch=settings.REGISTRATION_BATCH_SIZE,
+    )
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import invalidate_event_responses
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.claim_queue import ClaimQueue, create_claim_queue
+from app.services.registrations import persist_claims
+from app.services.seats import get_seat_store
+
+logger = logging.getLogger(__name__)
+
+_queue: Optional[ClaimQueue] = None
+_task: Optional[asyncio.Task] = None
+
+# Delay between attempts to reach the broker, doubled up to the maximum
+CONNECT_RETRY_SECONDS = 1
+CONNECT_RETRY_MAX_SECONDS = 30
+
+def get_claim_queue() -> ClaimQueue:
+    if _queue is None:
+        raise RuntimeError("Registration worker is not running")
+    return _queue
+
+def _invalidate_events(claims: List[dict]) -> None:
+    for event_id in {claim["event_id"] for claim in claims}:
+        invalidate_event_responses(event_id)
+
+def _persist(claims: List[dict]) -> int:
+    """
+    Persists a batch in one transaction. If a claim breaks it (e.g. the event was
+    deleted meanwhile) the batch is retried claim by claim and bad claims are dropped,
+    giving their seat back in the seat store.
+    """
+    db = SessionLocal()
+    try:
+        try:
+            inserted = persist_claims(db, claims)
+            db.commit()
+            _invalidate_events(claims)
+            return inserted
+        except IntegrityError:
+            db.rollback()
+
+        inserted = 0
+        for claim in claims:
+            try:
+                inserted += persist_claims(db, [claim])
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                logger.warning("Dropping unpersistable seat claim %s", claim)
+                get_seat_store().release(UUID(claim["event_id"]), UUID(claim["user_id"]))
+        _invalidate_events(claims)
+        return inserted
+    finally:
+        db.close()
+
+async def _connect(queue: ClaimQueue) -> None:
+    """
+    Connects the queue, retrying with backoff while the broker is unreachable.
+    """
+    delay = CONNECT_RETRY_SECONDS
+    while True:
+        try:
+            await queue.connect()
+            return
+        except Exception:
+            logger.warning("Claim queue unavailable, retrying in %ds", delay, exc_info=True)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CONNECT_RETRY_MAX_SECONDS)
+
+async def _run(queue: ClaimQueue) -> None:
+    await _connect(queue)
+    max_wait = settings.REGISTRATION_BATCH_WAIT_MS / 1000
+    while True:
+        items = await queue.get_batch(settings.REGISTRATION_BATCH_SIZE, max_wait)
+        try:
+            inserted = await run_in_threadpool(_persist, [queue.decode(item) for item in items])
+        except asyncio.CancelledError:
+            await queue.requeue(items)
+            raise
+        except Exception:
+            logger.exception("Failed to persist %d seat claims, requeueing", len(items))
+            await queue.requeue(items)
+            await asyncio.sleep(1)
+            continue
+        await queue.ack(items)
+        logger.debug("Persisted %d of %d seat claims", inserted, len(items))
+
+async def start() -> None:
+    """
+    Starts consuming the claim queue. Called from the app lifespan; the connection is
+    made in the background so the app boots without the broker (high-demand events
+    are opt-in), and claims are refused with a 503 until it is up.
+    """
+    global _queue, _task
+    _queue = create_claim_queue()
+    _task = asyncio.create_task(_run(_queue))
+
+async def stop() -> None:
+    global _queue, _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+    if _queue is not None:
+        await _queue.close()
+        _queue = None
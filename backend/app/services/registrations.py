@@ -0,0 +1,96 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List
+from uuid import UUID
+
+from sqlalchemy import update, or_, func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.events import Event, Session as SessionModel, Registration, RegistrationStatus, SEAT_HOLDING_STATUSES
+
+def reserve_event_seat(db: Session, event_id: UUID) -> bool:
+    """
+    Atomically takes one seat of an event.
+    Single conditional UPDATE ... RETURNING: the row lock serializes concurrent
+    signups, so two requests can never both take the last seat.
+    Returns False if the event is full (or does not exist).
+    """
+    stmt = (
+        update(Event)
+        .where(
+            Event.id == event_id,
+            or_(Event.capacity.is_(None), Event.registered_count < Event.capacity)
+        )
+        .values(registered_count=Event.registered_count + 1)
+        .returning(Event.registered_count)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).first() is not None
+
+def release_event_seat(db: Session, event_id: UUID, seats: int = 1) -> None:
+    """
+    Gives seats of an event back, never going below zero.
+    """
+    stmt = (
+        update(Event)
+        .where(Event.id == event_id)
+        .values(registered_count=func.greatest(Event.registered_count - seats, 0))
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(stmt)
+
+_RECONCILE_SQL = """
+    UPDATE {table} AS t
+    SET registered_count = c.n
+    FROM (
+        SELECT p.id, count(r.id) AS n
+        FROM {table} AS p
+        LEFT JOIN registrations AS r
+            ON r.{fk} = p.id AND r.status = ANY(CAST(:statuses AS registration_status[]))
+        GROUP BY p.id
+    ) AS c
+    WHERE t.id = c.id AND t.registered_count <> c.n
+"""
+
+def reconcile_registration_counters(db: Session) -> Dict[str, int]:
+    """
+    Recomputes registered_count of events and sessions from the registrations table.
+    Returns the number of corrected rows per table. Caller commits.
+    """
+    fixed = {}
+    for table, fk in ((Event.__tablename__, "event_id"), (SessionModel.__tablename__, "session_id")):
+        result = db.execute(
+            text(_RECONCILE_SQL.format(table=table, fk=fk)),
+            {"statuses": list(SEAT_HOLDING_STATUSES)}
+        )
+        fixed[table] = result.rowcount
+    return fixed
+
+def persist_claims(db: Session, claims: List[dict]) -> int:
+    """
+    Inserts confirmed registrations for high-demand seat claims and bumps the
+    event counters, without capacity checks (seats were already granted in Redis).
+    Redelivered or duplicate claims are skipped. Caller commits.
+    Returns the number of registrations inserted.
+    """
+    rows = [
+        {
+            "id": UUID(claim["registration_id"]),
+            "user_id": UUID(claim["user_id"]),
+            "event_id": UUID(claim["event_id"]),
+            "status": RegistrationStatus.CONFIRMED.value,
+            "created_at": datetime.fromisoformat(claim["claimed_at"]),
+        }
+        for claim in claims
+    ]
+    stmt = insert(Registration).values(rows).on_conflict_do_nothing().returning(Registration.event_id)
+    inserted = Counter(db.execute(stmt).scalars().all())
+    for event_id, seats in inserted.items():
+        db.execute(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(registered_count=Event.registered_count + seats)
+            .execution_options(synchronize_session=False)
+        )
+    return sum(inserted.values())
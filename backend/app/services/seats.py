@@ -0,0 +1,157 @@
+import threading
+from enum import IntEnum
+from typing import Dict, Iterable, Optional, Set
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+# Stored instead of a seat count for events without capacity
+UNLIMITED = -1
+
+class ClaimResult(IntEnum):
+    ACCEPTED = 1
+    SOLD_OUT = 0
+    DUPLICATE = -1
+    NOT_LOADED = -2
+
+# KEYS[1] remaining seats, KEYS[2] set of claimant user ids; ARGV[1] user id
+_CLAIM_SCRIPT = """
+local remaining = redis.call('GET', KEYS[1])
+if not remaining then return -2 end
+if redis.call('SISMEMBER', KEYS[2], ARGV[1]) == 1 then return -1 end
+remaining = tonumber(remaining)
+if remaining == 0 then return 0 end
+if remaining > 0 then redis.call('DECR', KEYS[1]) end
+redis.call('SADD', KEYS[2], ARGV[1])
+return 1
+"""
+
+# KEYS as above; ARGV[1] seats, ARGV[2..n] users already registered in the database
+_PRELOAD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then return 0 end
+redis.call('SET', KEYS[1], ARGV[1])
+for i = 2, #ARGV do redis.call('SADD', KEYS[2], ARGV[i]) end
+return 1
+"""
+
+# KEYS as above; ARGV[1] user id
+_RELEASE_SCRIPT = """
+if redis.call('SREM', KEYS[2], ARGV[1]) == 0 then return 0 end
+local remaining = tonumber(redis.call('GET', KEYS[1]))
+if remaining and remaining >= 0 then redis.call('INCR', KEYS[1]) end
+return 1
+"""
+
+# KEYS[1] remaining seats; ARGV[1] capacity delta (only for events with a capacity)
+_ADJUST_SCRIPT = """
+local remaining = tonumber(redis.call('GET', KEYS[1]))
+if not remaining or remaining < 0 then return 0 end
+redis.call('SET', KEYS[1], math.max(remaining + tonumber(ARGV[1]), 0))
+return 1
+"""
+
+def _seats_key(event_id) -> str:
+    return f"seats:{event_id}"
+
+def _claimants_key(event_id) -> str:
+    return f"seats:{event_id}:claimants"
+
+class RedisSeatStore:
+    """
+    Seat tokens for high-demand events, claimed atomically with Lua scripts.
+    """
+    def __init__(self, client):
+        self._client = client
+        self._claim = client.register_script(_CLAIM_SCRIPT)
+        self._preload = client.register_script(_PRELOAD_SCRIPT)
+        self._release = client.register_script(_RELEASE_SCRIPT)
+        self._adjust = client.register_script(_ADJUST_SCRIPT)
+
+    def claim(self, event_id: UUID, user_id: UUID) -> ClaimResult:
+        keys = [_seats_key(event_id), _claimants_key(event_id)]
+        return ClaimResult(int(self._claim(keys=keys, args=[str(user_id)])))
+
+    def preload(self, event_id: UUID, seats: Optional[int], user_ids: Iterable[UUID]) -> bool:
+        keys = [_seats_key(event_id), _claimants_key(event_id)]
+        args = [UNLIMITED if seats is None else max(seats, 0)] + [str(u) for u in user_ids]
+        return bool(self._preload(keys=keys, args=args))
+
+    def release(self, event_id: UUID, user_id: UUID) -> bool:
+        keys = [_seats_key(event_id), _claimants_key(event_id)]
+        return bool(self._release(keys=keys, args=[str(user_id)]))
+
+    def adjust(self, event_id: UUID, delta: int) -> None:
+        self._adjust(keys=[_seats_key(event_id)], args=[delta])
+
+    def drop(self, event_id: UUID) -> None:
+        self._client.delete(_seats_key(event_id), _claimants_key(event_id))
+
+class LocalSeatStore:
+    """
+    In-process stand-in for RedisSeatStore with the same semantics.
+    Only consistent within a single worker process.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seats: Dict[str, int] = {}
+        self._claimants: Dict[str, Set[str]] = {}
+
+    def claim(self, event_id: UUID, user_id: UUID) -> ClaimResult:
+        key = str(event_id)
+        with self._lock:
+            if key not in self._seats:
+                return ClaimResult.NOT_LOADED
+            if str(user_id) in self._claimants[key]:
+                return ClaimResult.DUPLICATE
+            if self._seats[key] == 0:
+                return ClaimResult.SOLD_OUT
+            if self._seats[key] > 0:
+                self._seats[key] -= 1
+            self._claimants[key].add(str(user_id))
+            return ClaimResult.ACCEPTED
+
+    def preload(self, event_id: UUID, seats: Optional[int], user_ids: Iterable[UUID]) -> bool:
+        key = str(event_id)
+        with self._lock:
+            if key in self._seats:
+                return False
+            self._seats[key] = UNLIMITED if seats is None else max(seats, 0)
+            self._claimants[key] = {str(u) for u in user_ids}
+            return True
+
+    def release(self, event_id: UUID, user_id: UUID) -> bool:
+        key = str(event_id)
+        with self._lock:
+            claimants = self._claimants.get(key)
+            if not claimants or str(user_id) not in claimants:
+                return False
+            claimants.discard(str(user_id))
+            if self._seats[key] >= 0:
+                self._seats[key] += 1
+            return True
+
+    def adjust(self, event_id: UUID, delta: int) -> None:
+        key = str(event_id)
+        with self._lock:
+            if self._seats.get(key, UNLIMITED) >= 0:
+                self._seats[key] = max(self._seats[key] + delta, 0)
+
+    def drop(self, event_id: UUID) -> None:
+        with self._lock:
+            self._seats.pop(str(event_id), None)
+            self._claimants.pop(str(event_id), None)
+
+_seat_store = None
+
+def get_seat_store():
+    """
+    Returns the process-wide seat store for the configured HIGH_DEMAND_BACKEND.
+    """
+    global _seat_store
+    if _seat_store is None:
+        if settings.HIGH_DEMAND_BACKEND == "local":
+            _seat_store = LocalSeatStore()
+        else:
+            _seat_store = RedisSeatStore(redis_client)
+    return _seat_store
@@ -0,0 +1,137 @@
+import bisect
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Collection, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core import pubsub
+from app.core.config import settings
+from app.core.utils import ScheduleConflict, find_schedule_conflicts
+
+# Booking changes ("<space id>"), applied by every worker
+SPACE_EVENTS_CHANNEL = "schedule:spaces"
+
+# Upper bound of the range loaded into an index: everything from now on
+_FAR_FUTURE = datetime.max.replace(tzinfo=timezone.utc)
+
+# Smallest step of a timestamptz: free slots stop this short of the inclusive bookings
+RESOLUTION = timedelta(microseconds=1)
+
+class SpaceIntervals:
+    """
+    Immutable interval index of one space: its bookings sorted by start, and the running
+    maximum of their ends, so an overlap query is two bisections plus the hits.
+    Bounds are inclusive, like the ranges stored by the endpoints.
+    """
+    __slots__ = ("bookings", "built_at", "_starts", "_max_ends")
+
+    def __init__(self, bookings: List[ScheduleConflict]):
+        self.bookings = sorted(bookings, key=lambda booking: (booking.start, booking.end))
+        self.built_at = time.monotonic()
+        self._starts = [booking.start for booking in self.bookings]
+        self._max_ends = list(itertools.accumulate((booking.end for booking in self.bookings), max))
+
+    def overlapping(
+        self, start: datetime, end: datetime, exclude_ids: Collection[UUID] = ()
+    ) -> List[ScheduleConflict]:
+        # Bookings starting at or before `end`...
+        hi = bisect.bisect_right(self._starts, end)
+        # ...from the first one whose running max end reaches `start`
+        lo = bisect.bisect_left(self._max_ends, start, 0, hi)
+        return [
+            booking for booking in self.bookings[lo:hi]
+            if booking.end >= start and booking.id not in exclude_ids
+        ]
+
+    def free_slots(
+        self, start: datetime, end: datetime, min_duration: timedelta = timedelta(0),
+        exclude_ids: Collection[UUID] = ()
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Gaps of at least `min_duration` between the bookings within [start, end], as
+        inclusive ranges sharing no instant with a booking: bookings are inclusive too,
+        so a slot ending exactly where one starts would be rejected by the constraints.
+        """
+        slots = []
+        cursor = start
+        for booking in self.overlapping(start, end, exclude_ids):
+            gap_end = booking.start - RESOLUTION
+            if gap_end > cursor and gap_end - cursor >= min_duration:
+                slots.append((cursor, gap_end))
+            cursor = max(cursor, booking.end + RESOLUTION)
+        if end > cursor and end - cursor >= min_duration:
+            slots.append((cursor, end))
+        return slots
+
+# space id -> index, least recently used first
+_spaces: "OrderedDict[UUID, SpaceIntervals]" = OrderedDict()
+# Bumped on every invalidation of a space: an index built meanwhile may miss the change
+_versions: Dict[UUID, int] = {}
+# Bumped on every resubscription, when invalidations may have been missed
+_epoch = 0
+_lock = threading.Lock()
+
+def _drop(space_id: UUID) -> None:
+    with _lock:
+        _spaces.pop(space_id, None)
+        _versions[space_id] = _versions.get(space_id, 0) + 1
+
+def _on_message(data: str) -> None:
+    _drop(UUID(data))
+
+def _on_reset() -> None:
+    global _epoch
+    with _lock:
+        _spaces.clear()
+        _epoch += 1
+
+pubsub.subscribe(SPACE_EVENTS_CHANNEL, _on_message, on_reset=_on_reset)
+
+def is_trusted() -> bool:
+    return settings.SPACE_INDEX_ENABLED and pubsub.is_healthy(settings.SPACE_INDEX_MAX_STALENESS_SECONDS)
+
+def get(db: Session, space_id: UUID) -> Optional[SpaceIntervals]:
+    """
+    Index of a space's current and future bookings, built from the database on first use
+    and kept until a change is announced (or SPACE_INDEX_TTL_SECONDS, for writes made
+    outside the API). None when the index cannot be trusted: the caller asks the database.
+    """
+    if not is_trusted():
+        return None
+    with _lock:
+        index = _spaces.get(space_id)
+        if index is not None and time.monotonic() - index.built_at < settings.SPACE_INDEX_TTL_SECONDS:
+            _spaces.move_to_end(space_id)
+            return index
+        version = (_epoch, _versions.get(space_id, 0))
+
+    # Past bookings cannot conflict: new events and sessions must start in the future
+    index = SpaceIntervals(
+        find_schedule_conflicts(db, space_id, datetime.now(timezone.utc), _FAR_FUTURE)
+    )
+    with _lock:
+        if (_epoch, _versions.get(space_id, 0)) != version:
+            # Changed while loading: this copy may already be stale
+            return None
+        _spaces[space_id] = index
+        _spaces.move_to_end(space_id)
+        while len(_spaces) > settings.SPACE_INDEX_MAX_SPACES:
+            _spaces.popitem(last=False)
+    return index
+
+def invalidate(*space_ids: Optional[UUID]) -> None:
+    """
+    Drops the index of spaces whose bookings changed, in this worker and, through
+    pub/sub, in every other one. Called after the change is committed.
+    """
+    for space_id in set(space_ids):
+        if space_id is None:
+            continue
+        _drop(space_id)
+        if settings.SPACE_INDEX_ENABLED:
+            pubsub.publish(SPACE_EVENTS_CHANNEL, str(space_id))
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from typing import Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import invalidate_event_responses
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.redis import redis_client
+from app.models.events import Event, Registration, RegistrationStatus
+
+logger = logging.getLogger(__name__)
+
+# Set of event ids that may have seats for waitlisted users
+PENDING_PROMOTIONS_KEY = "waitlist:pending"
+
+_task: Optional[asyncio.Task] = None
+
+def request_promotion(event_id: UUID) -> None:
+    """
+    Flags an event for the promoter after seats were freed or capacity was raised.
+    Flags are coalesced, so many cancellations cost a single promotion pass.
+    """
+    try:
+        redis_client.sadd(PENDING_PROMOTIONS_KEY, str(event_id))
+    except RedisError:
+        logger.warning("Could not flag event %s for waitlist promotion", event_id)
+
+def promote_waitlist(db: Session, event_id: UUID) -> int:
+    """
+    Confirms as many waitlisted registrations as there are free seats, oldest first,
+    and moves the event counter by the same amount. Caller commits: the event row
+    stays locked until then, so concurrent promoters of one event serialize.
+    Returns the number of promoted registrations.
+    """
+    event = db.query(Event).filter(Event.id == event_id).with_for_update().first()
+    if not event:
+        return 0
+    free = None if event.capacity is None else event.capacity - event.registered_count
+    if free is not None and free <= 0:
+        return 0
+
+    waiting = (
+        select(Registration.id)
+        .where(
+            Registration.event_id == event_id,
+            Registration.status == RegistrationStatus.WAITLIST.value
+        )
+        .order_by(Registration.created_at, Registration.id)
+        .limit(free)
+        .with_for_update(skip_locked=True)
+    )
+    promoted = db.execute(
+        update(Registration)
+        .where(Registration.id.in_(waiting))
+        .values(status=RegistrationStatus.CONFIRMED.value)
+        .returning(Registration.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    if promoted:
+        db.execute(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(registered_count=Event.registered_count + len(promoted))
+            .execution_options(synchronize_session=False)
+        )
+    return len(promoted)
+
+def _promote_pending() -> int:
+    """
+    Takes a batch of flagged events and promotes each one in its own transaction.
+    Returns the number of events processed successfully; failed ones are flagged again.
+    """
+    try:
+        event_ids = redis_client.spop(PENDING_PROMOTIONS_KEY, settings.WAITLIST_PROMOTION_BATCH)
+    except RedisError:
+        logger.warning("Waitlist promoter cannot reach Redis")
+        return 0
+    if not event_ids:
+        return 0
+
+    db = SessionLocal()
+    processed = 0
+    try:
+        for event_id in event_ids:
+            try:
+                promoted = promote_waitlist(db, UUID(event_id))
+                db.commit()
+                processed += 1
+                if promoted:
+                    invalidate_event_responses(event_id)
+                logger.debug("Promoted %d waitlisted registrations of event %s", promoted, event_id)
+            except Exception:
+                db.rollback()
+                request_promotion(event_id)
+                logger.exception("Waitlist promotion failed for event %s", event_id)
+        return processed
+    finally:
+        db.close()
+
+async def _run() -> None:
+    interval = settings.WAITLIST_PROMOTION_INTERVAL_MS / 1000
+    while True:
+        # Drain flagged events back to back, poll at the configured interval when idle
+        if not await run_in_threadpool(_promote_pending):
+            await asyncio.sleep(interval)
+
+async def start() -> None:
+    global _task
+    _task = asyncio.create_task(_run())
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
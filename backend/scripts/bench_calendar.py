@@ -0,0 +1,152 @@
+"""
+Loading a month of the calendar: event listing with embedded sessions vs. the calendar feed.
+
+Before: the events page read GET /events/?include=sessions: events through the ORM,
+then the sessions of those events in a second SELECT (selectinload). Here both are
+restricted to the month, without paging, so the two variants load the same items.
+After: find_calendar_items, one UNION ALL of events and sessions overlapping the month
+on the GiST indexes of time_range, as served (uncached) by GET /calendar/.
+
+Usage (inside the backend container, needs Postgres):
+    BENCH_ITERATIONS=500 python scripts/bench_calendar.py
+Set BENCH_DATABASE_URL to point to a different database (default: <POSTGRES_DB>_bench).
+"""
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from psycopg2.extras import DateTimeTZRange
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import *  # noqa: F401,F403 - register every table
+from app.models.events import Event, Session as SessionModel, event_start_key
+from app.models.users import User
+from app.models.venues import Venue, Space
+from app.services.calendar import find_calendar_items, month_window
+
+DATABASE_URL = os.getenv(
+    "BENCH_DATABASE_URL",
+    settings.SQLALCHEMY_DATABASE_URI.replace(f"/{settings.POSTGRES_DB}", f"/{settings.POSTGRES_DB}_bench")
+)
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "500"))
+# Events seeded over a year, each with SESSIONS_PER_EVENT sessions
+SEED_EVENTS = int(os.getenv("BENCH_SEED_EVENTS", "3000"))
+SESSIONS_PER_EVENT = int(os.getenv("BENCH_SESSIONS_PER_EVENT", "3"))
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+BASE_TIME = datetime(2031, 1, 1, 9, tzinfo=timezone.utc)
+PERIOD = timedelta(days=365)
+
+def setup() -> list:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "bench-calendar@example.com").first()
+        if not user:
+            user = User(email="bench-calendar@example.com", full_name="Bench", password_hash="x")
+            db.add(user)
+        venue = Venue(name=f"Bench venue {uuid.uuid4().hex[:8]}", city="Bench")
+        # Events in one space, the n-th session of every event in another, so nothing overlaps
+        spaces = [Space(venue=venue, name=f"Room {index}", capacity=100) for index in range(SESSIONS_PER_EVENT + 1)]
+        db.add_all(spaces)
+        db.flush()
+        step = PERIOD / SEED_EVENTS
+        for index in range(SEED_EVENTS):
+            start = BASE_TIME + step * index
+            event = Event(
+                title=f"Seed {index}", organizer_id=user.id, space_id=spaces[0].id,
+                time_range=DateTimeTZRange(start, start + step / 2, '[)'), status="published",
+            )
+            db.add(event)
+            for number in range(SESSIONS_PER_EVENT):
+                session_start = start + step / 2 * number / SESSIONS_PER_EVENT
+                db.add(SessionModel(
+                    title=f"Seed {index}.{number}", organizer_id=user.id, space_id=spaces[number + 1].id,
+                    event=event, status="published",
+                    time_range=DateTimeTZRange(session_start, session_start + step / 8, '[)'),
+                ))
+        db.commit()
+        return [space.id for space in spaces]
+    finally:
+        db.close()
+
+def listing(db, window_start, window_end) -> None:
+    events = (
+        db.query(Event)
+        .filter(Event.status == "published")
+        .filter(Event.time_range.op("&&")(func.tstzrange(window_start, window_end, "[)")))
+        .order_by(event_start_key(), Event.id)
+        .options(selectinload(Event.sessions))
+        .all()
+    )
+    for event in events:
+        event.sessions
+
+def feed(db, window_start, window_end) -> None:
+    find_calendar_items(db, window_start, window_end, "customer")
+
+def measure(name: str, fn, windows) -> None:
+    samples = []
+    db = SessionLocal()
+    try:
+        for window_start, window_end in windows:
+            started = time.perf_counter()
+            fn(db, window_start, window_end)
+            samples.append((time.perf_counter() - started) * 1000)
+            db.expunge_all()
+    finally:
+        db.close()
+    samples.sort()
+    print(
+        f"{name:<8} median {statistics.median(samples):7.3f} ms  "
+        f"p95 {samples[int(len(samples) * 0.95)]:7.3f} ms  "
+        f"p99 {samples[int(len(samples) * 0.99)]:7.3f} ms"
+    )
+
+def cleanup(space_ids) -> None:
+    db = SessionLocal()
+    try:
+        db.query(SessionModel).filter(SessionModel.space_id.in_(space_ids)).delete(synchronize_session=False)
+        db.query(Event).filter(Event.space_id.in_(space_ids)).delete(synchronize_session=False)
+        venue_id = db.query(Space.venue_id).filter(Space.id == space_ids[0]).scalar()
+        db.query(Space).filter(Space.id.in_(space_ids)).delete(synchronize_session=False)
+        db.query(Venue).filter(Venue.id == venue_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def main() -> None:
+    space_ids = setup()
+    try:
+        # Month views: six weeks starting on a random day, widened like GET /calendar/ does
+        windows = []
+        for _ in range(ITERATIONS):
+            start = BASE_TIME + timedelta(days=random.randrange(PERIOD.days - 42))
+            windows.append(month_window(start, start + timedelta(days=42)))
+
+        db = SessionLocal()
+        try:
+            items = find_calendar_items(db, *windows[0], "customer")
+            print(f"First window: {len(items)} events and sessions")
+        finally:
+            db.close()
+
+        print(f"{ITERATIONS} month windows per variant, {SEED_EVENTS} events x {SESSIONS_PER_EVENT} sessions")
+        measure("listing", listing, windows)
+        measure("feed", feed, windows)
+    finally:
+        cleanup(space_ids)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: ILIKE '%q%' search vs. full-text search (GIN on events.search_vector).
+
+Seeds a scratch database with BENCH_ROWS events (default 1,000,000), then times the
+old ILIKE filter and the websearch_to_tsquery filter for a handful of queries.
+
+Usage (inside the backend container):
+    BENCH_ROWS=1000000 python scripts/bench_event_search.py
+Set BENCH_DATABASE_URL to point to a different database (default: <POSTGRES_DB>_bench).
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import *  # noqa: F401,F403 - register every table
+from app.models.events import SEARCH_CONFIG
+
+DATABASE_URL = os.getenv(
+    "BENCH_DATABASE_URL",
+    settings.SQLALCHEMY_DATABASE_URI.replace(f"/{settings.POSTGRES_DB}", f"/{settings.POSTGRES_DB}_bench")
+)
+ROWS = int(os.getenv("BENCH_ROWS", "1000000"))
+REPEAT = int(os.getenv("BENCH_REPEAT", "5"))
+
+WORDS = [
+    "concierto", "taller", "python", "conferencia", "arte", "musica", "datos", "festival",
+    "cine", "teatro", "startup", "networking", "yoga", "cocina", "fotografia", "robotica",
+    "jazz", "rock", "ciencia", "historia", "diseño", "marketing", "finanzas", "salud",
+    "workshop", "meetup", "hackathon", "gaming", "literatura", "poesia", "danza", "vino",
+]
+QUERIES = ["python", "hackathon robotica", "\"festival jazz\"", "cocina -vino"]
+
+ILIKE_WHERE = "title ILIKE :pattern OR description ILIKE :pattern"
+FTS_WHERE = f"search_vector @@ websearch_to_tsquery('{SEARCH_CONFIG}', :q)"
+
+# read_events runs a COUNT over the filtered set plus the page fetch; time both
+ILIKE_COUNT_SQL = f"SELECT count(*) FROM events WHERE {ILIKE_WHERE}"
+ILIKE_PAGE_SQL = f"SELECT id FROM events WHERE {ILIKE_WHERE} LIMIT 10"
+FTS_COUNT_SQL = f"SELECT count(*) FROM events WHERE {FTS_WHERE}"
+FTS_PAGE_SQL = f"""
+    SELECT id FROM events
+    WHERE {FTS_WHERE}
+    ORDER BY ts_rank_cd(search_vector, websearch_to_tsquery('{SEARCH_CONFIG}', :q)) DESC
+    LIMIT 10
+"""
+
+def seed(conn) -> None:
+    existing = conn.execute(text("SELECT count(*) FROM events")).scalar()
+    if existing >= ROWS:
+        print(f"Reusing {existing} existing events")
+        return
+
+    organizer_id = conn.execute(text(
+        "INSERT INTO users (email, full_name, password_hash) "
+        "VALUES ('bench@example.com', 'Bench', 'x') "
+        "ON CONFLICT (email) DO UPDATE SET full_name = EXCLUDED.full_name RETURNING id"
+    )).scalar()
+
+    print(f"Seeding {ROWS - existing} events...")
+    started = time.perf_counter()
+    # Correlate the word pickers with g so random() is evaluated per row
+    conn.execute(text("""
+        INSERT INTO events (organizer_id, title, description, status)
+        SELECT
+            :organizer_id,
+            (SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+               FROM generate_series(1, 3 + (g % 2))),
+            (SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+               FROM generate_series(1, 20 + (g % 5))),
+            'published'
+        FROM generate_series(1, :rows) AS g, (SELECT CAST(:words AS text[]) AS w) AS vocabulary
+    """), {"organizer_id": organizer_id, "rows": ROWS - existing, "words": WORDS})
+    conn.execute(text("ANALYZE events"))
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+def timed(conn, sql: str, params: dict) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def main() -> None:
+    engine = create_engine(DATABASE_URL)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        seed(conn)
+
+    with engine.connect() as conn:
+        print(f"\n{'query':<24}{'ILIKE count+page (ms)':>24}{'FTS count+page (ms)':>22}{'speedup':>10}")
+        for q in QUERIES:
+            # ILIKE has no boolean syntax; approximate with the first bare word
+            word = q.strip('"').split()[0]
+            ilike_ms = (
+                timed(conn, ILIKE_COUNT_SQL, {"pattern": f"%{word}%"})
+                + timed(conn, ILIKE_PAGE_SQL, {"pattern": f"%{word}%"})
+            )
+            fts_ms = timed(conn, FTS_COUNT_SQL, {"q": q}) + timed(conn, FTS_PAGE_SQL, {"q": q})
+            print(f"{q:<24}{ilike_ms:>24.2f}{fts_ms:>22.2f}{ilike_ms / fts_ms:>9.1f}x")
+
+        plan = conn.execute(text("EXPLAIN " + FTS_PAGE_SQL), {"q": QUERIES[1]}).fetchall()
+        print("\nFTS plan:")
+        for row in plan:
+            print(f"  {row[0]}")
+
+if __name__ == "__main__":
+    main()
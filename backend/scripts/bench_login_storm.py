@@ -0,0 +1,78 @@
+"""
+Benchmark: login storm with bcrypt inline vs. in the hashing process pool.
+
+STORM_LOGINS password verifications are issued from STORM_THREADS threads (the size of
+Starlette's threadpool) while a probe thread measures how late a tiny task runs, i.e.
+how much the storm stalls every other request of the worker.
+
+Usage (inside the backend container, no database needed):
+    STORM_LOGINS=200 python scripts/bench_login_storm.py
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import hashing
+from app.core.config import settings
+
+LOGINS = int(os.getenv("STORM_LOGINS", "200"))
+THREADS = int(os.getenv("STORM_THREADS", "40"))
+PROBE_INTERVAL = 0.01
+
+def inline_verify(password: str, password_hash: str) -> bool:
+    return hashing.pwd_context.verify(password, password_hash)
+
+def pooled_verify(password: str, password_hash: str) -> bool:
+    return hashing.verify_password(password, password_hash)
+
+def probe(stop: threading.Event, delays: list) -> None:
+    # Sleeps PROBE_INTERVAL and records how late it wakes up and runs a little Python
+    while not stop.is_set():
+        started = time.perf_counter()
+        time.sleep(PROBE_INTERVAL)
+        sum(range(1000))
+        delays.append((time.perf_counter() - started - PROBE_INTERVAL) * 1000)
+
+def storm(name: str, verify, password_hash: str) -> None:
+    stop = threading.Event()
+    delays: list = []
+    prober = threading.Thread(target=probe, args=(stop, delays))
+    prober.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(lambda _: verify("storm-password", password_hash), range(LOGINS)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    prober.join()
+
+    assert all(results)
+    delays.sort()
+    print(
+        f"{name:<7} {LOGINS / elapsed:7.1f} logins/s  "
+        f"probe delay median {statistics.median(delays):7.2f} ms  "
+        f"p99 {delays[int(len(delays) * 0.99)]:7.2f} ms  max {delays[-1]:7.2f} ms"
+    )
+
+def main() -> None:
+    # Measure throughput and stalls, not admission control: let every login wait its turn
+    settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS = 3600
+    password_hash = hashing.pwd_context.hash("storm-password")
+    print(
+        f"{LOGINS} logins from {THREADS} threads; pool: {settings.PASSWORD_HASH_WORKERS} processes, "
+        f"{settings.PASSWORD_HASH_MAX_PENDING} admitted jobs"
+    )
+    storm("inline", inline_verify, password_hash)
+    hashing.verify_password("storm-password", password_hash)  # start the worker processes
+    try:
+        storm("pool", pooled_verify, password_hash)
+        print("pool metrics:", hashing.hashing_metrics())
+    finally:
+        hashing.shutdown()
+
+if __name__ == "__main__":
+    main()
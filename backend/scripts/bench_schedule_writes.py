@@ -0,0 +1,145 @@
+"""
+Write latency of event scheduling, with and without the conflict pre-check.
+
+Before: check_schedule_overlap (SELECT on events and sessions) then INSERT + COMMIT,
+as create_event used to do.
+After: INSERT + COMMIT only, double bookings being rejected by the exclusion
+constraints (events, sessions and the shared space_bookings table).
+
+Both variants are measured on free slots (the common case) and on slots that clash
+with an existing session (the error path, where "after" pays for the rollback and
+the conflict listing instead).
+
+Usage (inside the backend container, needs Postgres):
+    BENCH_ITERATIONS=2000 python scripts/bench_schedule_writes.py
+Set BENCH_DATABASE_URL to point to a different database (default: <POSTGRES_DB>_bench).
+"""
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from psycopg2.extras import DateTimeTZRange
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.utils import check_schedule_overlap, overlap_as_bad_request
+from app.models import *  # noqa: F401,F403 - register every table
+from app.models.events import Event, Session as SessionModel
+from app.models.users import User
+from app.models.venues import Venue, Space
+
+DATABASE_URL = os.getenv(
+    "BENCH_DATABASE_URL",
+    settings.SQLALCHEMY_DATABASE_URI.replace(f"/{settings.POSTGRES_DB}", f"/{settings.POSTGRES_DB}_bench")
+)
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "2000"))
+# Existing bookings per space, so the pre-check has an index to search
+SEED_BOOKINGS = int(os.getenv("BENCH_SEED_BOOKINGS", "2000"))
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+BASE_TIME = datetime(2031, 1, 1, 9, tzinfo=timezone.utc)
+
+def slot(index: int) -> tuple:
+    # One-hour slots two hours apart: consecutive slots never touch
+    start = BASE_TIME + timedelta(hours=2 * index)
+    return start, start + timedelta(hours=1)
+
+def setup() -> tuple:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "bench-schedule@example.com").first()
+        if not user:
+            user = User(email="bench-schedule@example.com", full_name="Bench", password_hash="x")
+            db.add(user)
+        venue = Venue(name=f"Bench venue {uuid.uuid4().hex[:8]}", city="Bench")
+        space = Space(venue=venue, name="Main hall", capacity=100)
+        db.add(space)
+        db.flush()
+        # Seeded as sessions so that event writes are checked across tables
+        for index in range(SEED_BOOKINGS):
+            start, end = slot(index)
+            db.add(SessionModel(
+                title=f"Seed {index}", organizer_id=user.id, space_id=space.id,
+                time_range=DateTimeTZRange(start, end, '[]'), status="published",
+            ))
+        db.commit()
+        return user.id, space.id
+    finally:
+        db.close()
+
+def before(db, organizer_id, space_id, start, end) -> None:
+    check_schedule_overlap(db, space_id, start, end)
+    db.add(Event(
+        title="Bench", organizer_id=organizer_id, space_id=space_id,
+        time_range=DateTimeTZRange(start, end, '[]'), status="draft",
+    ))
+    db.commit()
+
+def after(db, organizer_id, space_id, start, end) -> None:
+    db.add(Event(
+        title="Bench", organizer_id=organizer_id, space_id=space_id,
+        time_range=DateTimeTZRange(start, end, '[]'), status="draft",
+    ))
+    with overlap_as_bad_request(db, space_id, start, end):
+        db.commit()
+
+def measure(name: str, fn, organizer_id, space_id, first_slot: int, clash: bool) -> None:
+    samples = []
+    db = SessionLocal()
+    try:
+        for i in range(ITERATIONS):
+            # Clashing writes reuse a seeded slot, free ones take slots past the seed
+            index = i % SEED_BOOKINGS if clash else first_slot + i
+            start, end = slot(index)
+            started = time.perf_counter()
+            try:
+                fn(db, organizer_id, space_id, start, end)
+            except HTTPException:
+                assert clash
+                db.rollback()
+            samples.append((time.perf_counter() - started) * 1000)
+    finally:
+        db.close()
+    samples.sort()
+    print(
+        f"{name:<16} median {statistics.median(samples):7.3f} ms  "
+        f"p95 {samples[int(len(samples) * 0.95)]:7.3f} ms  "
+        f"p99 {samples[int(len(samples) * 0.99)]:7.3f} ms"
+    )
+
+def cleanup(space_id) -> None:
+    db = SessionLocal()
+    try:
+        db.query(Event).filter(Event.space_id == space_id).delete(synchronize_session=False)
+        db.query(SessionModel).filter(SessionModel.space_id == space_id).delete(synchronize_session=False)
+        venue_id = db.query(Space.venue_id).filter(Space.id == space_id).scalar()
+        db.query(Space).filter(Space.id == space_id).delete(synchronize_session=False)
+        db.query(Venue).filter(Venue.id == venue_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def main() -> None:
+    organizer_id, space_id = setup()
+    try:
+        print(f"{ITERATIONS} event writes per variant, {SEED_BOOKINGS} existing sessions in the space")
+        measure("before free", before, organizer_id, space_id, SEED_BOOKINGS, clash=False)
+        measure("after free", after, organizer_id, space_id, SEED_BOOKINGS + ITERATIONS, clash=False)
+        measure("before clash", before, organizer_id, space_id, 0, clash=True)
+        measure("after clash", after, organizer_id, space_id, 0, clash=True)
+    finally:
+        cleanup(space_id)
+
+if __name__ == "__main__":
+    main()
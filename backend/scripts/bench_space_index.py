@@ -0,0 +1,136 @@
+"""
+Conflict checks against the database vs. the in-process space index.
+
+Database: check_schedule_overlap (one UNION ALL query over events and sessions).
+Index: SpaceIntervals.overlapping on the index built once from the same bookings,
+as used by POST /schedule/validate?fast=true.
+
+Queries are random one-hour slots over the seeded period, about half of them clashing.
+
+Usage (inside the backend container, needs Postgres):
+    BENCH_ITERATIONS=5000 python scripts/bench_space_index.py
+Set BENCH_DATABASE_URL to point to a different database (default: <POSTGRES_DB>_bench).
+"""
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from psycopg2.extras import DateTimeTZRange
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.utils import check_schedule_overlap, find_schedule_conflicts
+from app.models import *  # noqa: F401,F403 - register every table
+from app.models.events import Event, Session as SessionModel
+from app.models.users import User
+from app.models.venues import Venue, Space
+from app.services.space_index import SpaceIntervals
+
+DATABASE_URL = os.getenv(
+    "BENCH_DATABASE_URL",
+    settings.SQLALCHEMY_DATABASE_URI.replace(f"/{settings.POSTGRES_DB}", f"/{settings.POSTGRES_DB}_bench")
+)
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "5000"))
+SEED_BOOKINGS = int(os.getenv("BENCH_SEED_BOOKINGS", "5000"))
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+BASE_TIME = datetime(2031, 1, 1, 9, tzinfo=timezone.utc)
+
+def setup() -> uuid.UUID:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "bench-schedule@example.com").first()
+        if not user:
+            user = User(email="bench-schedule@example.com", full_name="Bench", password_hash="x")
+            db.add(user)
+        venue = Venue(name=f"Bench venue {uuid.uuid4().hex[:8]}", city="Bench")
+        space = Space(venue=venue, name="Main hall", capacity=100)
+        db.add(space)
+        db.flush()
+        # One-hour bookings every two hours, alternating events and sessions
+        for index in range(SEED_BOOKINGS):
+            start = BASE_TIME + timedelta(hours=2 * index)
+            kwargs = dict(
+                title=f"Seed {index}", organizer_id=user.id, space_id=space.id,
+                time_range=DateTimeTZRange(start, start + timedelta(hours=1), '[]'), status="published",
+            )
+            db.add(Event(**kwargs) if index % 2 else SessionModel(**kwargs))
+        db.commit()
+        return space.id
+    finally:
+        db.close()
+
+def measure(name: str, fn, slots) -> None:
+    samples = []
+    for start, end in slots:
+        started = time.perf_counter()
+        fn(start, end)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    samples.sort()
+    print(
+        f"{name:<9} median {statistics.median(samples):9.1f} us  "
+        f"p95 {samples[int(len(samples) * 0.95)]:9.1f} us  "
+        f"p99 {samples[int(len(samples) * 0.99)]:9.1f} us"
+    )
+
+def cleanup(space_id) -> None:
+    db = SessionLocal()
+    try:
+        db.query(Event).filter(Event.space_id == space_id).delete(synchronize_session=False)
+        db.query(SessionModel).filter(SessionModel.space_id == space_id).delete(synchronize_session=False)
+        venue_id = db.query(Space.venue_id).filter(Space.id == space_id).scalar()
+        db.query(Space).filter(Space.id == space_id).delete(synchronize_session=False)
+        db.query(Venue).filter(Venue.id == venue_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def main() -> None:
+    space_id = setup()
+    db = SessionLocal()
+    try:
+        period = timedelta(hours=2 * SEED_BOOKINGS)
+        slots = []
+        for _ in range(ITERATIONS):
+            start = BASE_TIME + timedelta(minutes=random.randrange(int(period.total_seconds() // 60)))
+            slots.append((start, start + timedelta(hours=1)))
+
+        started = time.perf_counter()
+        index = SpaceIntervals(find_schedule_conflicts(db, space_id, BASE_TIME, BASE_TIME + period))
+        print(f"Index of {len(index.bookings)} bookings built in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        def database(start, end):
+            try:
+                check_schedule_overlap(db, space_id, start, end)
+            except HTTPException:
+                pass
+
+        def in_process(start, end):
+            index.overlapping(start, end)
+
+        # Both must agree before timing them
+        for start, end in slots[:200]:
+            expected = {c.id for c in find_schedule_conflicts(db, space_id, start, end)}
+            assert {c.id for c in index.overlapping(start, end)} == expected
+
+        print(f"{ITERATIONS} conflict checks per variant")
+        measure("database", database, slots)
+        measure("index", in_process, slots)
+    finally:
+        db.close()
+        cleanup(space_id)
+
+if __name__ == "__main__":
+    main()
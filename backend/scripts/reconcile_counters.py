@@ -0,0 +1,26 @@
+"""
+Recompute events.registered_count and sessions.registered_count from registrations.
+
+Usage (inside the backend container):
+    python scripts/reconcile_counters.py
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.registrations import reconcile_registration_counters
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        fixed = reconcile_registration_counters(db)
+        db.commit()
+        for table, rows in fixed.items():
+            print(f"{table}: {rows} counter(s) corrected")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Stress test for waitlist promotion.
+
+Creates an event with STRESS_CAPACITY seats, fills it, puts STRESS_WAITLIST users on
+its waitlist, then frees seats in random bursts while STRESS_PROMOTERS threads run
+promote_waitlist concurrently. Afterwards it checks that:
+- registered_count matches the confirmed registrations and never exceeds capacity,
+- promotions happened strictly in arrival (FIFO) order.
+
+Usage (inside the backend container):
+    STRESS_WAITLIST=5000 python scripts/stress_waitlist.py
+Set STRESS_DATABASE_URL to point to a different database (default: <POSTGRES_DB>_bench).
+"""
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import *  # noqa: F401,F403 - register every table
+from app.services.registrations import release_event_seat
+from app.services.waitlist import promote_waitlist
+
+DATABASE_URL = os.getenv(
+    "STRESS_DATABASE_URL",
+    settings.SQLALCHEMY_DATABASE_URI.replace(f"/{settings.POSTGRES_DB}", f"/{settings.POSTGRES_DB}_bench")
+)
+CAPACITY = int(os.getenv("STRESS_CAPACITY", "500"))
+WAITLIST = int(os.getenv("STRESS_WAITLIST", "5000"))
+PROMOTERS = int(os.getenv("STRESS_PROMOTERS", "8"))
+ROUNDS = int(os.getenv("STRESS_ROUNDS", "50"))
+
+engine = create_engine(DATABASE_URL, pool_size=PROMOTERS + 2)
+SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+def setup() -> uuid.UUID:
+    Base.metadata.create_all(bind=engine)
+    event_id = uuid.uuid4()
+    base = datetime.now(timezone.utc) - timedelta(hours=1)
+    with engine.begin() as conn:
+        organizer_id = conn.execute(text(
+            "INSERT INTO users (email, full_name, password_hash) "
+            "VALUES ('stress-organizer@example.com', 'Stress', 'x') "
+            "ON CONFLICT (email) DO UPDATE SET full_name = EXCLUDED.full_name RETURNING id"
+        )).scalar()
+        conn.execute(text(
+            "INSERT INTO events (id, organizer_id, title, status, capacity, registered_count) "
+            "VALUES (:id, :organizer_id, 'Waitlist stress', 'published', :capacity, :capacity)"
+        ), {"id": event_id, "organizer_id": organizer_id, "capacity": CAPACITY})
+
+        total = CAPACITY + WAITLIST
+        conn.execute(text(
+            "INSERT INTO users (email, full_name, password_hash) "
+            "SELECT 'stress-' || :run || '-' || g || '@example.com', 'Stress ' || g, 'x' "
+            "FROM generate_series(1, :total) AS g"
+        ), {"run": event_id.hex[:8], "total": total})
+        # Distinct, increasing created_at gives a well-defined FIFO order
+        conn.execute(text(
+            "INSERT INTO registrations (user_id, event_id, status, created_at) "
+            "SELECT u.id, :event_id, "
+            "  CAST(CASE WHEN u.n <= :capacity THEN 'confirmed' ELSE 'waitlist' END AS registration_status), "
+            "  :base + u.n * interval '1 millisecond' "
+            "FROM (SELECT id, row_number() OVER (ORDER BY email) AS n FROM users "
+            "      WHERE email LIKE 'stress-' || :run || '-%') AS u"
+        ), {"event_id": event_id, "capacity": CAPACITY, "base": base, "run": event_id.hex[:8]})
+    return event_id
+
+def free_seats(event_id: uuid.UUID, count: int) -> None:
+    db = SessionLocal()
+    try:
+        ids = db.execute(text(
+            "SELECT id FROM registrations WHERE event_id = :event_id AND status = 'confirmed' "
+            "ORDER BY random() LIMIT :count FOR UPDATE SKIP LOCKED"
+        ), {"event_id": event_id, "count": count}).scalars().all()
+        if ids:
+            db.execute(text("DELETE FROM registrations WHERE id = ANY(:ids)"), {"ids": ids})
+            release_event_seat(db, event_id, len(ids))
+        db.commit()
+    finally:
+        db.close()
+
+stats_lock = threading.Lock()
+
+def promoter(event_id: uuid.UUID, stop: threading.Event, stats: dict) -> None:
+    db = SessionLocal()
+    try:
+        while not stop.is_set():
+            promoted = promote_waitlist(db, event_id)
+            db.commit()
+            with stats_lock:
+                stats["promoted"] += promoted
+                stats["passes"] += 1
+    finally:
+        db.close()
+
+def verify(event_id: uuid.UUID) -> None:
+    with engine.connect() as conn:
+        capacity, counter = conn.execute(text(
+            "SELECT capacity, registered_count FROM events WHERE id = :id"
+        ), {"id": event_id}).one()
+        confirmed = conn.execute(text(
+            "SELECT count(*) FROM registrations WHERE event_id = :id AND status = 'confirmed'"
+        ), {"id": event_id}).scalar()
+        # Every confirmed registration must be older than every waitlisted one
+        fifo_violations = conn.execute(text(
+            "SELECT count(*) FROM registrations c JOIN registrations w ON w.event_id = c.event_id "
+            "WHERE c.event_id = :id AND c.status = 'confirmed' AND w.status = 'waitlist' "
+            "AND w.created_at < c.created_at"
+        ), {"id": event_id}).scalar()
+
+    print(f"capacity={capacity} registered_count={counter} confirmed={confirmed}")
+    assert counter == confirmed, "registered_count drifted from confirmed registrations"
+    assert confirmed <= capacity, "capacity exceeded"
+    assert fifo_violations == 0, f"{fifo_violations} promotions out of FIFO order"
+
+def main() -> None:
+    event_id = setup()
+    print(f"Event {event_id}: {CAPACITY} confirmed, {WAITLIST} waitlisted, {PROMOTERS} promoters")
+
+    stop = threading.Event()
+    stats = {"promoted": 0, "passes": 0}
+    threads = [threading.Thread(target=promoter, args=(event_id, stop, stats)) for _ in range(PROMOTERS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    freed = 0
+    for _ in range(ROUNDS):
+        burst = random.randint(1, max(CAPACITY // 10, 1))
+        free_seats(event_id, burst)
+        freed += burst
+        time.sleep(random.uniform(0, 0.02))
+
+    # Let the promoters drain the last freed seats
+    time.sleep(1)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"freed~{freed} seats, promoted {stats['promoted']} in {stats['passes']} passes, {elapsed:.2f}s")
+    verify(event_id)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
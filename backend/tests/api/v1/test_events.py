@@ -0,0 +1,191 @@
+import itertools
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from psycopg2.extras import DateTimeTZRange
+from sqlalchemy import event as sa_event
+
+from app.api import deps
+from app.core.config import settings
+from app.core.principal import Principal
+from app.main import app
+from app.models.events import Event, Registration, Session as SessionModel
+from app.models.users import User
+from app.models.venues import Space, Venue
+
+# Statements per request, whatever the number of events, sessions and registrations:
+# the collections embedded in Event responses are loaded with one SELECT each.
+LIST_QUERIES = 7    # validators (event aggregate + 2 collections), count, page, sessions, registrations
+DETAIL_QUERIES = 6  # validators (event + 2 collections), event, sessions, registrations
+CREATE_QUERIES = 4  # insert, event, sessions, registrations
+UPDATE_QUERIES = 6  # event, update, reload after commit, event, sessions, registrations
+
+# Every seeded or created event gets a day of its own, so nothing overlaps
+_days = itertools.count(30)
+
+@contextmanager
+def count_queries(db):
+    """
+    Collects the statements sent to the database. The session is expired first, so
+    relationships are loaded by the request instead of coming from the identity map.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    db.expire_all()
+    sa_event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def day_at(day: int, hour: int, minute: int = 0) -> datetime:
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today + timedelta(days=day, hours=hour, minutes=minute)
+
+@pytest.fixture(scope="module")
+def spaces(db):
+    venue = Venue(name="Query count venue", city="Test")
+    event_space = Space(venue=venue, name="Main hall", capacity=500)
+    session_space = Space(venue=venue, name="Room A", capacity=100)
+    db.add_all([event_space, session_space])
+    db.commit()
+    return event_space.id, session_space.id
+
+@pytest.fixture(scope="module")
+def as_admin(client, admin_user):
+    """
+    Resolves the admin principal without the database, so counts only cover the endpoint.
+    """
+    principal = Principal.from_user(admin_user)
+    app.dependency_overrides[deps.get_current_principal] = lambda: principal
+    yield principal
+    app.dependency_overrides.pop(deps.get_current_principal, None)
+
+def seed(db, organizer_id, spaces, events: int, children: int) -> list:
+    """
+    Published events with `children` sessions and `children` registrations each.
+    """
+    event_space, session_space = spaces
+    users = [
+        User(email=f"attendee-{uuid.uuid4().hex[:12]}@example.com", full_name="Attendee", password_hash="x")
+        for _ in range(children)
+    ]
+    db.add_all(users)
+    created = []
+    for _ in range(events):
+        day = next(_days)
+        event = Event(
+            title=f"Event {day}", organizer_id=organizer_id, space_id=event_space, status="published",
+            time_range=DateTimeTZRange(day_at(day, 9), day_at(day, 18), '[]'),
+        )
+        for number in range(children):
+            event.sessions.append(SessionModel(
+                title=f"Session {day}.{number}", organizer_id=organizer_id, space_id=session_space,
+                status="published", time_range=DateTimeTZRange(day_at(day, 9, number * 10), day_at(day, 9, number * 10 + 5), '[]'),
+            ))
+            event.registrations.append(Registration(user=users[number], status="confirmed"))
+        db.add(event)
+        created.append(event)
+    db.commit()
+    return [event.id for event in created]
+
+def test_list_events_query_count(client, db, spaces, as_admin):
+    url = f"{settings.API_V1_STR}/events/?include=sessions,registrations"
+    seed(db, as_admin.id, spaces, events=3, children=2)
+    with count_queries(db) as statements:
+        r = client.get(url)
+    assert r.status_code == 200
+    assert all(len(item["sessions"]) == 2 for item in r.json()["items"])
+    assert len(statements) == LIST_QUERIES
+
+    seed(db, as_admin.id, spaces, events=10, children=5)
+    with count_queries(db) as statements:
+        r = client.get(url)
+    assert r.status_code == 200
+    assert len(r.json()["items"]) == 10
+    assert len(statements) == LIST_QUERIES
+
+@pytest.mark.parametrize("children", [1, 6])
+def test_read_event_query_count(client, db, spaces, as_admin, children):
+    [event_id] = seed(db, as_admin.id, spaces, events=1, children=children)
+    with count_queries(db) as statements:
+        r = client.get(f"{settings.API_V1_STR}/events/{event_id}")
+    assert r.status_code == 200
+    assert len(r.json()["sessions"]) == children
+    assert len(r.json()["registrations"]) == children
+    assert len(statements) == DETAIL_QUERIES
+
+@pytest.mark.parametrize("existing", [0, 10])
+def test_create_event_query_count(client, db, spaces, as_admin, existing):
+    seed(db, as_admin.id, spaces, events=existing, children=3)
+    day = next(_days)
+    payload = {
+        "title": "New event",
+        "status": "published",
+        "space_id": str(spaces[0]),
+        "time_range": [day_at(day, 9).isoformat(), day_at(day, 12).isoformat()],
+    }
+    with count_queries(db) as statements:
+        r = client.post(f"{settings.API_V1_STR}/events/", json=payload)
+    assert r.status_code == 200, r.text
+    assert len(statements) == CREATE_QUERIES
+
+@pytest.mark.parametrize("children", [1, 6])
+def test_update_event_query_count(client, db, spaces, as_admin, children):
+    [event_id] = seed(db, as_admin.id, spaces, events=1, children=children)
+    with count_queries(db) as statements:
+        r = client.put(f"{settings.API_V1_STR}/events/{event_id}", json={"title": "Renamed"})
+    assert r.status_code == 200, r.text
+    assert r.json()["title"] == "Renamed"
+    assert len(r.json()["sessions"]) == children
+    assert len(statements) == UPDATE_QUERIES
+
+def test_search_cursor_pages_through_tied_ranks(client, db, spaces, as_admin):
+    # Same title, so every match has the same (non binary-exact) relevance rank
+    expected = set()
+    for _ in range(7):
+        day = next(_days)
+        event = Event(
+            title="Zanzibar quartet", organizer_id=as_admin.id, space_id=spaces[0], status="published",
+            time_range=DateTimeTZRange(day_at(day, 9), day_at(day, 12), '[]'),
+        )
+        db.add(event)
+        db.flush()
+        expected.add(str(event.id))
+    db.commit()
+
+    seen = []
+    params = {"q": "zanzibar", "size": 3, "total_mode": "none"}
+    while True:
+        r = client.get(f"{settings.API_V1_STR}/events/", params=params)
+        assert r.status_code == 200, r.text
+        seen.extend(item["id"] for item in r.json()["items"])
+        if not r.json()["next_cursor"]:
+            break
+        params["cursor"] = r.json()["next_cursor"]
+    assert len(seen) == len(set(seen))
+    assert set(seen) == expected
+
+def test_date_window_accepts_mixed_timezone_bounds(client, db, spaces, as_admin):
+    [event_id] = seed(db, as_admin.id, spaces, events=1, children=0)
+    day = db.get(Event, event_id).time_range.lower.astimezone(timezone.utc).replace(hour=0)
+    naive_start = day.replace(tzinfo=None).isoformat()
+    aware_end = (day + timedelta(days=1)).isoformat()
+    r = client.get(
+        f"{settings.API_V1_STR}/events/",
+        params={"start_date": naive_start, "end_date": aware_end, "total_mode": "none"},
+    )
+    assert r.status_code == 200, r.text
+    assert str(event_id) in [item["id"] for item in r.json()["items"]]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/events/",
+        params={"start_date": aware_end, "end_date": naive_start, "total_mode": "none"},
+    )
+    assert r.status_code == 400
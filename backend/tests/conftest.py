@@ -13,7 +13,7 @@ from app.models.users import User
 from unittest.mock import patch
 
 # Mock Redis at the module level for all tests
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 mock_redis = MagicMock()
 # Mock get/set to behave like a dict
 redis_dict = {}
@@ -25,17 +25,46 @@ def redis_set(key, value, **kwargs):
 mock_redis.get = MagicMock(side_effect=redis_get)
 mock_redis.set = MagicMock(side_effect=redis_set)
 mock_redis.delete = MagicMock(side_effect=lambda key: redis_dict.pop(key, None))
+mock_redis.hget = MagicMock(return_value=None)
+mock_redis.spop = MagicMock(return_value=[])
+# Response cache reads pipeline (version, entry): always a miss
+mock_redis.pipeline.return_value.execute.return_value = [None, None]
 
 patch("app.core.redis.redis_client", mock_redis).start()
-patch("app.core.middleware.idempotency.redis_client", mock_redis).start()
+# Async client (middleware, async endpoints) shares the same dict
+mock_async_redis = MagicMock()
+async def async_redis_get(key): return redis_get(key)
+async def async_redis_set(key, value, **kwargs): return redis_set(key, value, **kwargs)
+async def async_redis_delete(key): return redis_dict.pop(key, None)
+mock_async_redis.get = AsyncMock(side_effect=async_redis_get)
+mock_async_redis.set = AsyncMock(side_effect=async_redis_set)
+mock_async_redis.delete = AsyncMock(side_effect=async_redis_delete)
+mock_async_redis.publish = AsyncMock(return_value=0)
+# Refresh token scripts: every refresh token is unknown
+mock_async_redis.register_script.return_value = AsyncMock(return_value=None)
+patch("app.core.redis.get_async_redis", return_value=mock_async_redis).start()
+patch("app.core.middleware.idempotency.get_async_redis", return_value=mock_async_redis).start()
+patch("app.core.cache.redis_client", mock_redis).start()
+patch("app.services.seats.redis_client", mock_redis).start()
+patch("app.services.waitlist.redis_client", mock_redis).start()
 
 mock_redis_is_valid = patch("app.core.redis.is_token_valid", return_value=True)
 mock_redis_set_session = patch("app.core.redis.set_token_session", return_value=True)
 mock_redis_remove_session = patch("app.core.redis.remove_token_session", return_value=True)
+mock_redis_remove_session_async = patch("app.core.redis.remove_token_session_async", new_callable=AsyncMock)
 
 mock_redis_is_valid.start()
 mock_redis_set_session.start()
 mock_redis_remove_session.start()
+mock_redis_remove_session_async.start()
+
+# Keep high-demand seats and the claim queue in-process
+settings.HIGH_DEMAND_BACKEND = "local"
+# Tests change users directly in the database: always resolve principals from it
+settings.PRINCIPAL_CACHE_REDIS = False
+settings.PRINCIPAL_CACHE_TTL_SECONDS = 0
+settings.TOKEN_MIRROR_ENABLED = False
+settings.SPACE_INDEX_ENABLED = False
 
 # Use a separate PostgreSQL database for tests to support specialized types (CITEXT, UUID)
 SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URI.replace(f"/{settings.POSTGRES_DB}", "/app_test")
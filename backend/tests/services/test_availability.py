@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from psycopg2.extras import DateTimeTZRange
+
+from app.models.events import Event
+from app.models.venues import Space, Venue
+from app.services.availability import find_free_slots
+
+DAY = datetime(2031, 3, 3, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+def at(hour: float) -> datetime:
+    return DAY + timedelta(hours=hour)
+
+def book(db, organizer_id, space_id, start: datetime, end: datetime) -> Event:
+    event = Event(
+        title="Booking", organizer_id=organizer_id, space_id=space_id, status="published",
+        time_range=DateTimeTZRange(start, end, '[]'),
+    )
+    db.add(event)
+    db.commit()
+    return event
+
+@pytest.fixture
+def space_id(db):
+    space = Space(venue=Venue(name="Availability venue", city="Test"), name="Hall", capacity=50)
+    db.add(space)
+    db.commit()
+    return space.id
+
+def test_free_slots_stop_short_of_adjacent_bookings(db, test_user, space_id):
+    book(db, test_user.id, space_id, at(9), at(10))
+    book(db, test_user.id, space_id, at(12), at(13))
+    slots = [(slot.start, slot.end) for slot in find_free_slots(db, at(8), at(14), space_ids=[space_id])]
+    assert slots == [
+        (at(8), at(9) - MICROSECOND),
+        (at(10) + MICROSECOND, at(12) - MICROSECOND),
+        (at(13) + MICROSECOND, at(14) - MICROSECOND),
+    ]
+
+    # A slot is bookable exactly as returned, and then nothing is left between the bookings
+    book(db, test_user.id, space_id, *slots[1])
+    slots = [(slot.start, slot.end) for slot in find_free_slots(db, at(8), at(14), space_ids=[space_id])]
+    assert slots == [(at(8), at(9) - MICROSECOND), (at(13) + MICROSECOND, at(14) - MICROSECOND)]
+
+def test_min_duration_applies_to_the_slot_bounds(db, test_user, space_id):
+    book(db, test_user.id, space_id, at(9), at(10))
+    book(db, test_user.id, space_id, at(12), at(13))
+    # The two hours between the bookings lose an instant at each end
+    slots = find_free_slots(db, at(9), at(14), timedelta(hours=1), [space_id])
+    assert [(slot.start, slot.end) for slot in slots] == [(at(10) + MICROSECOND, at(12) - MICROSECOND)]
+    assert find_free_slots(db, at(10), at(12), timedelta(hours=2), [space_id]) == []
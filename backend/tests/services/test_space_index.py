@@ -0,0 +1,59 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.utils import ScheduleConflict
+from app.services.space_index import RESOLUTION, SpaceIntervals
+
+DAY = datetime(2031, 1, 1, tzinfo=timezone.utc)
+
+def booking(start_hour: float, end_hour: float, kind: str = "event") -> ScheduleConflict:
+    return ScheduleConflict(
+        uuid.uuid4(), kind, f"{kind} {start_hour}-{end_hour}",
+        DAY + timedelta(hours=start_hour), DAY + timedelta(hours=end_hour),
+    )
+
+def at(hour: float) -> datetime:
+    return DAY + timedelta(hours=hour)
+
+def test_overlapping_is_inclusive():
+    first, second = booking(9, 10), booking(12, 13)
+    index = SpaceIntervals([second, first])
+    assert index.overlapping(at(10), at(11)) == [first]
+    assert index.overlapping(at(11), at(12)) == [second]
+    assert index.overlapping(at(10) + RESOLUTION, at(12) - RESOLUTION) == []
+    assert index.overlapping(at(8), at(14)) == [first, second]
+
+def test_overlapping_finds_long_bookings_starting_earlier():
+    long, short = booking(8, 18), booking(9, 10, "session")
+    index = SpaceIntervals([long, short])
+    assert index.overlapping(at(15), at(16)) == [long]
+
+def test_overlapping_excludes_ids():
+    first, second = booking(9, 10), booking(9.5, 11, "session")
+    index = SpaceIntervals([first, second])
+    assert index.overlapping(at(9), at(12), exclude_ids={first.id}) == [second]
+
+def test_free_slots_share_no_instant_with_bookings():
+    first, second = booking(9, 10), booking(12, 13)
+    index = SpaceIntervals([first, second])
+    slots = index.free_slots(at(8), at(14))
+    assert slots == [
+        (at(8), at(9) - RESOLUTION),
+        (at(10) + RESOLUTION, at(12) - RESOLUTION),
+        (at(13) + RESOLUTION, at(14)),
+    ]
+    for start, end in slots:
+        assert index.overlapping(start, end) == []
+
+def test_free_slots_respect_min_duration_and_exclusions():
+    first, second = booking(9, 10), booking(11, 13)
+    index = SpaceIntervals([first, second])
+    # The gap between them is an hour minus the two instants bordering the bookings
+    assert index.free_slots(at(9), at(15), timedelta(hours=1)) == [(at(13) + RESOLUTION, at(15))]
+    assert index.free_slots(at(9), at(14), timedelta(hours=2), exclude_ids={second.id}) == [
+        (at(10) + RESOLUTION, at(14)),
+    ]
+
+def test_free_slots_of_a_fully_booked_window():
+    index = SpaceIntervals([booking(8, 12), booking(12, 14)])
+    assert index.free_slots(at(9), at(13)) == []
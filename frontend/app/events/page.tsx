@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import {
     Container,
     Typography,
@@ -31,7 +31,7 @@ import FullCalendar from '@fullcalendar/react';
 import dayGridPlugin from '@fullcalendar/daygrid';
 import timeGridPlugin from '@fullcalendar/timegrid';
 import interactionPlugin from '@fullcalendar/interaction';
-import { eventsApi, EventFilters, EventPagination } from '@/lib/api/events';
+import { eventsApi, CalendarItem, EventFilters, EventPagination } from '@/lib/api/events';
 import EventDetailDrawer from '@/components/events/EventDetailDrawer';
 import EventDetailContent from '@/components/events/EventDetailContent';
 import EventListSidebar from '@/components/events/EventListSidebar';
@@ -66,6 +66,8 @@ export default function EventsManagementPage() {
     const [isSidebarVisible, setIsSidebarVisible] = useState(true); // Desktop sidebar
     const [isModalOpen, setIsModalOpen] = useState(false); // Event creation modal
 
+    const calendarRef = useRef<FullCalendar>(null);
+
     const theme = useTheme();
     const isMobile = useMediaQuery(theme.breakpoints.down('md'));
 
@@ -122,6 +124,20 @@ export default function EventsManagementPage() {
         }
     };
 
+    // Calendar items are compact: load the full event or session when one is opened
+    const handleCalendarItemClick = async (item: CalendarItem) => {
+        try {
+            if (item.kind === 'session') {
+                const session = await eventsApi.getSession(item.id);
+                handleEventClick({ ...session, type: 'session', parentEventId: item.event_id });
+            } else {
+                handleEventClick({ ...(await eventsApi.getEvent(item.id)), type: 'event' });
+            }
+        } catch (err) {
+            setError('Error al cargar el detalle. Por favor, intenta de nuevo.');
+        }
+    };
+
     const handleCloseDetail = () => {
         setSelectedEvent(null);
         if (isMobile) {
@@ -166,37 +182,33 @@ export default function EventsManagementPage() {
         return userRegistrations.some(reg => reg.event_id === eventId);
     };
 
-    // Format events for calendar
-    const formattedEvents = eventsData?.items.map(event => ({
-        id: event.id,
-        title: event.title,
-        start: event.time_range ? event.time_range[0] : new Date(),
-        end: event.time_range ? event.time_range[1] : new Date(),
-        extendedProps: { ...event, type: 'event' },
-        backgroundColor: isUserRegistered(event.id) ? '#4caf50' : '#ff9800',
-        borderColor: isUserRegistered(event.id) ? '#2e7d32' : '#f57c00',
-    })) || [];
-
-    // Format sessions for calendar
-    const formattedSessions = eventsData?.items.flatMap(event =>
-        (event.sessions || []).map((session: any) => ({
-            id: `session-${session.id}`,
-            title: `[S] ${session.title}`,
-            start: session.time_range ? session.time_range[0] : new Date(),
-            end: session.time_range ? session.time_range[1] : new Date(),
-            extendedProps: {
-                ...session,
-                type: 'session',
-                parentEventId: event.id,
-                parentEventTitle: event.title
-            },
-            backgroundColor: '#1976d2', // Blue for sessions
-            borderColor: '#0d47a1',
-        }))
-    ) || [];
-
-    // Combine events and sessions
-    const calendarEvents = [...formattedEvents, ...formattedSessions];
+    // The calendar asks for its visible range: events and sessions come from one /calendar request
+    const fetchCalendarItems = useCallback(async (info: { startStr: string; endStr: string }) => {
+        try {
+            // The sidebar's search and status apply to the calendar too; its range is the view's
+            const feed = await eventsApi.getCalendar(info.startStr, info.endStr, {
+                q: filters.q || undefined,
+                status: filters.status || undefined,
+            });
+            return feed.items.map(item => {
+                const isSession = item.kind === 'session';
+                const registered = !isSession && userRegistrations.some(reg => reg.event_id === item.id);
+                return {
+                    id: isSession ? `session-${item.id}` : item.id,
+                    title: isSession ? `[S] ${item.title}` : item.title,
+                    start: item.start,
+                    end: item.end,
+                    extendedProps: item,
+                    // Blue for sessions, green for registered events
+                    backgroundColor: isSession ? '#1976d2' : registered ? '#4caf50' : '#ff9800',
+                    borderColor: isSession ? '#0d47a1' : registered ? '#2e7d32' : '#f57c00',
+                };
+            });
+        } catch (err) {
+            setError('Error al cargar el calendario. Por favor, intenta de nuevo.');
+            return [];
+        }
+    }, [userRegistrations, filters.q, filters.status]);
 
     return (
         <Box sx={{ flexGrow: 1, backgroundColor: 'background.default', minHeight: '100vh' }}>
@@ -375,6 +387,7 @@ export default function EventsManagementPage() {
                                     <CalendarMonthIcon sx={{ color: 'white' }} /> Próximos Eventos
                                 </Typography>
                                 <FullCalendar
+                                    ref={calendarRef}
                                     plugins={[dayGridPlugin, timeGridPlugin, interactionPlugin]}
                                     initialView="dayGridMonth"
                                     headerToolbar={{
@@ -382,14 +395,14 @@ export default function EventsManagementPage() {
                                         center: 'title',
                                         right: 'dayGridMonth,timeGridWeek'
                                     }}
-                                    events={calendarEvents}
+                                    events={fetchCalendarItems}
                                     locale="es"
                                     buttonText={{
                                         today: 'Hoy',
                                         month: 'Mes',
                                         week: 'Semana'
                                     }}
-                                    eventClick={(info) => handleEventClick(info.event.extendedProps)}
+                                    eventClick={(info) => handleCalendarItemClick(info.event.extendedProps as CalendarItem)}
                                     height="auto"
                                     eventColor="#ff9800"
                                     eventTextColor="#000000"
@@ -484,6 +497,7 @@ export default function EventsManagementPage() {
                 onSuccess={() => {
                     setIsModalOpen(false);
                     fetchEvents();
+                    calendarRef.current?.getApi().refetchEvents();
                 }}
             />
         </Box>
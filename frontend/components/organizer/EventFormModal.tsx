@@ -36,6 +36,19 @@ interface EventSummary {
     title: string;
 }
 
+interface ScheduleConflict {
+    id: string;
+    kind: 'event' | 'session';
+    title: string;
+    start: string;
+    end: string;
+}
+
+interface FreeSlot {
+    start: string;
+    end: string;
+}
+
 export default function EventFormModal({ open, onClose, onSuccess }: EventFormModalProps) {
     const [type, setType] = useState<'event' | 'session'>('event');
     const [title, setTitle] = useState('');
@@ -49,13 +62,14 @@ export default function EventFormModal({ open, onClose, onSuccess }: EventFormMo
 
     const [spaces, setSpaces] = useState<Space[]>([]);
     const [parentEvents, setParentEvents] = useState<EventSummary[]>([]);
+    const [conflicts, setConflicts] = useState<ScheduleConflict[]>([]);
+    const [suggestions, setSuggestions] = useState<FreeSlot[]>([]);
     const [error, setError] = useState<string | null>(null);
     const [loading, setLoading] = useState(false);
 
     useEffect(() => {
         if (open) {
             fetchSpaces();
-            fetchParentEvents();
             // Reset form
             setType('event');
             setTitle('');
@@ -66,10 +80,52 @@ export default function EventFormModal({ open, onClose, onSuccess }: EventFormMo
             setEndTime('');
             setCapacity('');
             setStatus('draft');
+            setConflicts([]);
+            setSuggestions([]);
             setError(null);
         }
     }, [open]);
 
+    // Parent events are only needed to create a session
+    useEffect(() => {
+        if (open && type === 'session' && parentEvents.length === 0) {
+            fetchParentEvents();
+        }
+    }, [open, type]);
+
+    // Ask the backend for clashes in the chosen space as soon as the slot is complete
+    useEffect(() => {
+        if (!open || !spaceId || !startTime || !endTime) {
+            setConflicts([]);
+            setSuggestions([]);
+            return;
+        }
+        let cancelled = false;
+        const timer = setTimeout(async () => {
+            try {
+                // fast: answered from the server's in-memory space index when possible
+                const response = await api.post('/schedule/validate', {
+                    space_id: spaceId,
+                    time_range: [new Date(startTime).toISOString(), new Date(endTime).toISOString()]
+                }, { params: { fast: true } });
+                if (!cancelled) {
+                    setConflicts(response.data.conflicts);
+                    setSuggestions(response.data.suggestions || []);
+                }
+            } catch (err) {
+                // Invalid dates are reported on submit
+                if (!cancelled) {
+                    setConflicts([]);
+                    setSuggestions([]);
+                }
+            }
+        }, 300);
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [open, spaceId, startTime, endTime]);
+
     const fetchSpaces = async () => {
         try {
             const response = await api.get('/spaces/');
@@ -138,6 +194,30 @@ export default function EventFormModal({ open, onClose, onSuccess }: EventFormMo
             <form onSubmit={handleSubmit}>
                 <DialogContent>
                     {error && <Alert severity="error" sx={{ mb: 2 }}>{error}</Alert>}
+                    {conflicts.length > 0 && (
+                        <Alert severity="warning" sx={{ mb: 2 }}>
+                            El espacio ya está ocupado en ese horario:
+                            <ul style={{ margin: 0, paddingLeft: 20 }}>
+                                {conflicts.map((conflict) => (
+                                    <li key={conflict.id}>
+                                        {conflict.kind === 'event' ? 'Evento' : 'Sesión'} "{conflict.title}" ({new Date(conflict.start).toLocaleString()} - {new Date(conflict.end).toLocaleTimeString()})
+                                    </li>
+                                ))}
+                            </ul>
+                            {suggestions.length > 0 && (
+                                <>
+                                    Horarios libres ese día:
+                                    <ul style={{ margin: 0, paddingLeft: 20 }}>
+                                        {suggestions.map((slot) => (
+                                            <li key={slot.start}>
+                                                {new Date(slot.start).toLocaleTimeString()} - {new Date(slot.end).toLocaleTimeString()}
+                                            </li>
+                                        ))}
+                                    </ul>
+                                </>
+                            )}
+                        </Alert>
+                    )}
 
                     <Box sx={{ display: 'flex', flexDirection: 'column', gap: 2 }}>
                         <Box sx={{ display: 'flex', justifyContent: 'center', mb: 1 }}>
@@ -246,7 +326,7 @@ export default function EventFormModal({ open, onClose, onSuccess }: EventFormMo
                 </DialogContent>
                 <DialogActions>
                     <Button onClick={onClose} disabled={loading}>Cancelar</Button>
-                    <Button type="submit" variant="contained" disabled={loading}>
+                    <Button type="submit" variant="contained" disabled={loading || conflicts.length > 0}>
                         {loading ? 'Guardando...' : `Crear ${type === 'event' ? 'Evento' : 'Sesión'}`}
                     </Button>
                 </DialogActions>
@@ -27,6 +27,7 @@ export const authApi = {
             await api.post('/logout');
         } finally {
             localStorage.removeItem('token');
+            localStorage.removeItem('refreshToken');
         }
     }
 };
@@ -17,12 +17,54 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// One refresh at a time: refresh tokens are single-use, so concurrent 401s share it
+let refreshing: Promise<string | null> | null = null;
+
+const refreshAccessToken = (): Promise<string | null> => {
+  const refreshToken = localStorage.getItem('refreshToken');
+  if (!refreshToken) {
+    return Promise.resolve(null);
+  }
+  if (!refreshing) {
+    refreshing = axios
+      .post(`${API_URL}/login/refresh-token`, { refresh_token: refreshToken })
+      .then((response) => {
+        const { access_token, refresh_token } = response.data;
+        localStorage.setItem('token', access_token);
+        localStorage.setItem('refreshToken', refresh_token);
+        document.cookie = `auth-token=${access_token}; path=/; max-age=604800; SameSite=Lax`;
+        return access_token as string;
+      })
+      .catch(() => null)
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+};
+
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const original = error.config;
+    if (
+      error.response?.status === 401 &&
+      original &&
+      !original._retried &&
+      !original.url?.startsWith('/login')
+    ) {
+      original._retried = true;
+      const token = await refreshAccessToken();
+      if (token) {
+        original.headers.Authorization = `Bearer ${token}`;
+        return api(original);
+      }
+    }
+
     if (error.response?.status === 401) {
       // Clear token and redirect if unauthorized (session expired)
       localStorage.removeItem('token');
+      localStorage.removeItem('refreshToken');
       document.cookie = 'auth-token=; path=/; expires=Thu, 01 Jan 1970 00:00:01 GMT;';
 
       if (typeof window !== 'undefined' && !window.location.pathname.startsWith('/login')) {
@@ -3,21 +3,51 @@ import { UUID } from 'crypto';
 
 export interface EventPagination {
     items: any[];
-    total: number;
+    total: number | null;
     page: number;
     size: number;
-    pages: number;
+    pages: number | null;
+    has_more: boolean;
+    next_cursor?: string | null;
 }
 
 export interface EventFilters {
     page?: number;
     size?: number;
+    cursor?: string;
+    total_mode?: 'exact' | 'estimated' | 'none';
+    fields?: string;
+    include?: string;
     q?: string;
     status?: string;
     start_date?: string;
     end_date?: string;
 }
 
+export interface CalendarItem {
+    id: string;
+    kind: 'event' | 'session';
+    title: string;
+    start: string;
+    end: string;
+    status: string;
+    space_id?: string;
+    event_id?: string;
+}
+
+export interface CalendarFeed {
+    start: string;
+    end: string;
+    items: CalendarItem[];
+}
+
+export interface CalendarFilters {
+    space_id?: string;
+    mine?: boolean;
+    q?: string;
+    status?: string;
+}
+
 export const eventsApi = {
     getEvents: async (filters: EventFilters = {}) => {
         // Remove empty strings to avoid 422 errors with Enums in backend
@@ -31,6 +61,15 @@ export const eventsApi = {
         const response = await api.get(`/events/${id}`);
         return response.data;
     },
+    getCalendar: async (from: string, to: string, filters: CalendarFilters = {}) => {
+        // One request per visible range: events and sessions merged by the backend
+        const response = await api.get<CalendarFeed>('/calendar/', { params: { from, to, ...filters } });
+        return response.data;
+    },
+    getSession: async (id: string) => {
+        const response = await api.get(`/sessions/${id}`);
+        return response.data;
+    },
     createEvent: async (eventData: any) => {
         const response = await api.post('/events/', eventData);
         return response.data;
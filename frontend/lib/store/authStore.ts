@@ -36,10 +36,11 @@ export const useAuthStore = create<AuthState>()(
                 set({ isLoading: true, error: null });
                 try {
                     const data = await authApi.login({ email, password });
-                    const { access_token } = data;
+                    const { access_token, refresh_token } = data;
 
                     set({ token: access_token, isAuthenticated: true });
                     localStorage.setItem('token', access_token);
+                    localStorage.setItem('refreshToken', refresh_token);
 
                     // Set cookie for middleware
                     document.cookie = `auth-token=${access_token}; path=/; max-age=604800; SameSite=Lax`;
@@ -65,6 +66,7 @@ export const useAuthStore = create<AuthState>()(
                 } finally {
                     set({ user: null, token: null, isAuthenticated: false, isLoading: false });
                     localStorage.removeItem('token');
+                    localStorage.removeItem('refreshToken');
                     document.cookie = 'auth-token=; path=/; expires=Thu, 01 Jan 1970 00:00:01 GMT;';
                 }
             },
@@ -106,6 +108,7 @@ export const useAuthStore = create<AuthState>()(
                 } catch (error: any) {
                     set({ user: null, token: null, isAuthenticated: false, isLoading: false });
                     localStorage.removeItem('token');
+                    localStorage.removeItem('refreshToken');
                     document.cookie = 'auth-token=; path=/; expires=Thu, 01 Jan 1970 00:00:01 GMT;';
                 }
             },